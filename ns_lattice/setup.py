@@ -33,7 +33,7 @@ setup(
     license='MIT',
     package_dir={'ns_lattice': 'src/ns_lattice', 'tests':'src/tests'},
     packages=['ns_lattice', 'tests'],
-    package_data={'ns_lattice': ['ns_tools.sobj', 'reducible_conics.sobj']},
+    package_data={'ns_lattice': ['ns_tools.db', 'ns_tools.sobj', 'reducible_conics.sobj']},
     include_package_data=True,
     install_requires=['linear_series'],
     setup_requires=['pytest-runner'],
@@ -16,9 +16,13 @@ from ns_lattice.sage_interface import sage_factor
 
 from ns_lattice.class_ns_tools import NSTools
 from ns_lattice.class_div import Div
-from ns_lattice.div_in_lattice import get_divs
+from ns_lattice.div_in_lattice import iter_divs
 from ns_lattice.div_in_lattice import get_ak
+from ns_lattice.div_tables import get_lines
 from ns_lattice.class_dp_lattice import DPLattice
+from ns_lattice.class_work_queue import TODO
+from ns_lattice.class_work_queue import CLAIMED
+from ns_lattice.class_work_queue import SQLiteWorkQueue
 from ns_lattice.ns_basis import get_bases_lst
 
 from linear_series.class_poly_ring import PolyRing
@@ -67,6 +71,39 @@ def usecase__get_cls( max_rank ):
     NSTools.p( 80 * '#' )
 
 
+def usecase__get_cls_queue( rank, file_name ):
+    '''
+    Classification of rank "rank" by means of a work queue.
+    Further workers can be started on other machines that share 
+    the file system, by calling:
+        DPLattice.run_cls_worker( SQLiteWorkQueue( file_name ) )
+    
+    Parameters
+    ----------
+    rank : int
+        An integer in [3,...,9].
+    
+    file_name : str
+        Name of the database file of the work queue without extension.
+    '''
+    # the units are added in a single transaction
+    queue = SQLiteWorkQueue( file_name )
+    if queue.get_num() == 0:
+        DPLattice.put_cls_units( rank, queue, 100 )
+
+    # units that are claimed for more than a day are processed again
+    DPLattice.run_cls_worker( queue, 24 * 3600 )
+
+    num_todo = queue.get_num( TODO ) + queue.get_num( CLAIMED )
+    if num_todo != 0:
+        NSTools.p( 'Waiting for other workers: ', num_todo )
+        return
+
+    dpl_lst = DPLattice.reduce_cls( rank, queue )
+    queue.clear()
+    NSTools.p( 'rank =', rank, ', len =', len( dpl_lst ) )
+
+
 def usecase__get_classes_dp1( rank ):
     '''
     Computes classes in the Neron-Severi lattice with
@@ -84,7 +121,7 @@ def usecase__get_classes_dp1( rank ):
     # basis change
     a_lst = [ 'e0-e1', 'e0-e2']
     a_lst = [ Div.new( a, rank ) for a in a_lst ]
-    m1_lst = get_divs( d, 1, -1, True )
+    m1_lst = get_lines( rank )
     print( d )
     M = sage_identity_matrix( rank )
     d_lst = []
@@ -94,8 +131,7 @@ def usecase__get_classes_dp1( rank ):
     # list the classes
     for ( dc, cc ) in [( 2, 0 ), ( 1, -1 ), ( 0, -2 ), ( 2, 2 ), ( 2, 4 ), ( 3, 1 )]:
         NSTools.p( '(dc, cc) =', ( dc, cc ) )
-        c_lst = get_divs( d, dc, cc, False )
-        for c in c_lst:
+        for c in iter_divs( d, dc, cc, False ):
             NSTools.p( '\t\t', c, '\t\t', c.get_basis_change( B ) )
 
 
@@ -111,6 +147,7 @@ def usecase__graphs( max_rank ):
     row_format = '{:<6}{:<5}{:<8}{:<16}{:<7}{:<10}{:<95}{:<30}{:<15}{:<15}{:<15}{:<15}'
 
     already_in_cache = True
+    uncached_rank_set = set()
     dpl_lst = []
     rownr = 0
     row_lst = [['rownr', 'deg', 'Mtype', 'type', '#vert', '#edges', 'degrees', 'labels', 'complete', 'connected', 'vert-xfer', 'edge-xfer']]
@@ -120,7 +157,9 @@ def usecase__graphs( max_rank ):
 
         for dpl in DPLattice.get_cls( rank ):
 
-            already_in_cache = already_in_cache and ( dpl.SG != None )
+            if dpl.SG == None:
+                already_in_cache = False
+                uncached_rank_set.add( rank )
 
             dpl_lst += [dpl]
             SG, SG_data = dpl.get_SG()
@@ -139,7 +178,8 @@ def usecase__graphs( max_rank ):
 
     if not already_in_cache:
         NSTools.p( 'Saving data for simple family graphs...' )
-        NSTools.save_tool_dct()
+        for rank in sorted( uncached_rank_set ):
+            NSTools.save_tool_dct( key = NSTools.get_key( 'get_cls', rank ) )  # the DPLattice objects were modified in place
 
     # example for how to plot a simple family graph
     #
@@ -402,7 +442,7 @@ def usecase__roman_circles():
     # we compute candidate classes of circles
     #
     h = Div.new( '4e0-e1-e2-e3-e4-e5-e6-e7-e8' )
-    div_lst = get_divs( h, 2, -2, False ) + get_divs( h, 2, -1, False )
+    div_lst = list( iter_divs( h, 2, -2, False, 'backtrack' ) ) + list( iter_divs( h, 2, -1, False, 'backtrack' ) )
     NSTools.p( 'Classes of circles up to permutation:' )
     for c in div_lst:
         NSTools.p( '\t\t', c )
@@ -462,22 +502,18 @@ def cleanup_tool_dct():
     Cleans up NSTools.get_tool_dct(), keeping only
     the cached content that is needed to run __main__.
     '''
-    clean_tool_dct = {}
-    for key in NSTools.get_tool_dct().keys():
-        keepkey = False
-        keepkey = keepkey or key.startswith( 'get_cls_' )
-        keepkey = keepkey or key.startswith( 'get_dynkin_type_' )
-        keepkey = keepkey or key.startswith( 'get_divs_' )
-        keepkey = keepkey or key.startswith( 'get_bases_lst__([e0-e1, e0-e2], [1 0 0 0 0 0 0 0 0]' )
-        if keepkey:
-            clean_tool_dct[key] = NSTools.get_tool_dct()[key]
-    NSTools.get_tool_dct().clear()
-    for key in clean_tool_dct.keys():
-        NSTools.get_tool_dct()[key] = clean_tool_dct[key]
-    NSTools.save_tool_dct()
-    NSTools.p( len( NSTools.get_tool_dct().keys() ) )
+    keep_lst = ['get_cls', 'get_cls_checkpoint', 'get_divs', 'get_bases_lst']
+    for ns in NSTools.get_stats():
+        if ns not in keep_lst:
+            NSTools.invalidate( ns )  # also removes legacy string keys with namespace None
+
+    # only keep the bases that are used by "usecase__get_classes_dp1()"
+    bas_key = NSTools.get_key( 'get_bases_lst', [Div.new( 'e0-e1' ), Div.new( 'e0-e2' )], sage_identity_matrix( 9 ) )
     for key in NSTools.get_tool_dct().keys():
-        NSTools.p( key )
+        if key[0] == 'get_bases_lst' and key[:3] != bas_key:
+            del NSTools.get_tool_dct()[key]
+
+    NSTools.print_stats()
 
 
 if __name__ == '__main__':
@@ -492,6 +528,12 @@ if __name__ == '__main__':
     # NSTools.filter( None )  # print all verbose output, comment to disable.
     # cleanup_tool_dct()  # uncomment to remove content from cache
     # NSTools.get_tool_dct().clear()  # uncomment to remove all cache!
+    # NSTools.export_tool_dct( 'ns_tools_cls', ['get_cls', 'get_divs'] )  # uncomment to export a slim cache
+    # NSTools.set_num_procs( None )  # uncomment to use all CPU's for parallel computations
+    NSTools.set_flush_policy( None, 300 )  # write cache to disk at most every 5 minutes and at exit
+    NSTools.set_mem_policy( 2 * 10**9,  # keep at most about 2GB of cached values in memory
+                            { 'get_bases_lst': 2 * 10**8, 'get_root_bases_orbit': 2 * 10**8 },
+                            [ 'get_divs', 'get_cls', 'get_cls_checkpoint' ] )
 
     if 'OUTPUT_PATH' not in os.environ:
         os.environ['OUTPUT_PATH'] = './'
@@ -510,6 +552,7 @@ if __name__ == '__main__':
     #                                       #
     #########################################
 
+    # usecase__get_cls_queue( max_rank, os.environ['OUTPUT_PATH'] + 'ns_queue' )  # see also usecase__get_cls()
     usecase__get_cls( max_rank )
     usecase__get_classes_dp1( max_rank )
     usecase__graphs( max_rank )
@@ -524,5 +567,6 @@ if __name__ == '__main__':
     #########################################
 
     NSTools.end_timer()
+    NSTools.print_stats()  # shows which cached values were used
     NSTools.p( 'The End' )
 
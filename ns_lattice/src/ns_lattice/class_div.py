@@ -5,35 +5,56 @@ Created on Aug 11, 2016
 
 from ns_lattice.sage_interface import sage_ZZ
 from ns_lattice.sage_interface import sage_diagonal_matrix
+from ns_lattice.sage_interface import sage_matrix
 from ns_lattice.sage_interface import sage_vector
 
 
-class Div:
+class Div( object ):
     '''Element in Neron-Severi lattice.
     
     The class represents a divisor class in the Neron-Severi lattice
     with respect to the standard basis:
         <e0,e1,e2,...>
     
+    Div objects are immutable so that they can be used 
+    as keys in dictionaries and as elements of sets.
     
     Attributes
     ----------            
-    e_lst : list<sage_ZZ>
-        List describes a divisor in terms of the standard basis. 
+    e_tup : tuple<int>
+        Tuple describes a divisor in terms of the standard basis. 
+    
+    e_lst : list<int>
+        A list copy of "e_tup".
     
     int_mat : sage_matrix<sage_ZZ>
         A matrix over ZZ of rank "len(e_lst)" represents
         the unimodular intersection product for the divisor. 
         
+    int_key : tuple
+        The key of "int_mat" in the static dictionary 
+        "Div.int_mat_dct" or None for the default matrix.
+        
+    std_int : bool
+        True if "int_mat" is the default diagonal matrix 
+        with diagonal (1,-1,...,-1). In this case the 
+        intersection product is computed without matrices.
     '''
 
+    __slots__ = ( 'e_tup', 'int_key', 'hash_val' )
+
     # static variable
     #
     short_output = True
 
-    # static list of intersection matrices
+    # static dictionary of immutable intersection matrices
     #
-    int_mat_lst = []
+    #     ( rank, entries ) ---> sage_matrix<sage_ZZ>
+    #
+    # The default diagonal matrix with diagonal (1,-1,...,-1)
+    # is stored with key ( rank, None ).
+    #
+    int_mat_dct = {}
 
     def __init__( self, e_lst = 9 * [0], int_mat = None ):
         '''        
@@ -46,22 +67,135 @@ class Div:
             diagonal matrix has signature (+-...-). 
             This matrix determines the intersection
             product of divisors.
+        
+        Raises
+        ------
+        ValueError
+            If the coefficients in "e_lst" are not integral.
         '''
-
-        self.e_lst = list( e_lst )
+        e_lst = tuple( e_lst )
+        e_tup = tuple( [ int( e ) for e in e_lst ] )
+        if e_tup != e_lst:
+            raise ValueError( 'Expect integral coefficients: ', e_lst )
 
         #
-        # equal "self.int_mat" for each instantiated Div object references
-        # to a unique matrix, so that no new matrix is instantiated for each
-        # Div object. Maybe this is already ensured by Sage library, but just
-        # to be on the safe side.
+        # Each Div object only stores a key into "Div.int_mat_dct"
+        # so that no new matrix is instantiated for each Div object.
+        # The key of the default matrix is None.
         #
-        if int_mat == None:
-            int_mat = sage_diagonal_matrix( sage_ZZ, [1] + ( self.rank() - 1 ) * [-1] )
-        if int_mat not in Div.int_mat_lst:
-            Div.int_mat_lst += [int_mat]
-        idx = Div.int_mat_lst.index( int_mat )
-        self.int_mat = Div.int_mat_lst[idx]
+        int_key = None
+        if int_mat is not None:
+            int_key = Div.get_int_key( int_mat )
+
+        object.__setattr__( self, 'e_tup', e_tup )
+        object.__setattr__( self, 'int_key', int_key )
+        object.__setattr__( self, 'hash_val', hash( e_tup ) )
+
+    @staticmethod
+    def get_int_key( int_mat ):
+        '''
+        Parameters
+        ----------
+        int_mat : sage_matrix<sage_ZZ>
+            A square matrix.
+        
+        Returns
+        -------
+        tuple
+            Returns None if "int_mat" is the default 
+            diagonal matrix with diagonal (1,-1,...,-1).
+            Otherwise returns the key ( rank, entries ) of 
+            "int_mat" in "Div.int_mat_dct". If the matrix
+            is not yet in "Div.int_mat_dct", then an immutable
+            copy is added.
+        '''
+        rank = int_mat.nrows()
+        key = ( rank, tuple( [ int( e ) for e in int_mat.list() ] ) )
+
+        std_lst = [ ( 1 if i == 0 else -1 ) if i == j else 0 for i in range( rank ) for j in range( rank ) ]
+        if key[1] == tuple( std_lst ):
+            return None
+
+        if key not in Div.int_mat_dct:
+            mat = sage_matrix( sage_ZZ, int_mat )
+            mat.set_immutable()
+            Div.int_mat_dct[key] = mat
+
+        return key
+
+    @staticmethod
+    def get_int_mat( rank, int_key = None ):
+        '''
+        Parameters
+        ----------
+        rank : int
+        
+        int_key : tuple 
+            A key as returned by "Div.get_int_key()".
+        
+        Returns
+        -------
+        sage_matrix<sage_ZZ>
+            The immutable intersection matrix with key "int_key".
+            If "int_key==None", then the default diagonal matrix 
+            of given rank with diagonal (1,-1,...,-1) is returned.            
+        '''
+        if int_key is not None:
+            return Div.int_mat_dct[int_key]
+
+        key = ( rank, None )
+        if key not in Div.int_mat_dct:
+            mat = sage_diagonal_matrix( sage_ZZ, [1] + ( rank - 1 ) * [-1] )
+            mat.set_immutable()
+            Div.int_mat_dct[key] = mat
+
+        return Div.int_mat_dct[key]
+
+    @property
+    def int_mat( self ):
+        return Div.get_int_mat( len( self.e_tup ), self.int_key )
+
+    @property
+    def std_int( self ):
+        return self.int_key is None
+
+    @property
+    def e_lst( self ):
+        return list( self.e_tup )
+
+    def get_cache_key( self ):
+        '''
+        Returns
+        -------
+        tuple
+            A compact key for this Div object that is used as part 
+            of keys of "NSTools.get_tool_dct()". This is "self.e_tup"
+            if the intersection matrix is the default diagonal matrix
+            and "( self.e_tup, self.int_key )" otherwise.
+        '''
+        if self.int_key is None:
+            return self.e_tup
+        return ( self.e_tup, self.int_key )
+
+    def __setattr__( self, name, value ):
+        raise AttributeError( 'Div objects are immutable: ', name )
+
+    def __reduce__( self ):
+        '''
+        Used by pickle. The intersection matrix is only stored 
+        if it is not the default diagonal matrix.
+        '''
+        if self.int_key is None:
+            return ( Div, ( self.e_tup, ) )
+        return ( Div, ( self.e_tup, self.int_mat ) )
+
+    def __setstate__( self, state ):
+        '''
+        Used by pickle for Div objects that were stored 
+        before Div objects became immutable. In this case 
+        "state" is the dictionary "{'e_lst':..., 'int_mat':...}".  
+        '''
+        Div.__init__( self, state['e_lst'], state.get( 'int_mat', None ) )
 
     @staticmethod
     def new( lbl, rank = 9 ):
@@ -80,7 +214,7 @@ class Div:
             such that "len(self.e_lst)>=rank".
         '''
 
-        c = Div( rank * [0] )  # zero divisor class
+        e_lst = rank * [0]  # zero divisor class
 
         if 'e' in lbl:
 
@@ -89,17 +223,17 @@ class Div:
 
                 # cases: 'e0...', '-e0...', '3e0...' or '-2e0...'
                 if s[0:2] == 'e0':
-                    c.e_lst = [1]
+                    e_lst = [1]
                     s = s[2:]
                 elif s[0:3] == '-e0':
-                    c.e_lst = [-1]
+                    e_lst = [-1]
                     s = s[3:]
                 else:  # '3e0...' or '-2e0...'
-                    c.e_lst = [ int( s.split( 'e0' )[0] ) ]  # [4] if lbl='4h+3e...'
+                    e_lst = [ int( s.split( 'e0' )[0] ) ]  # [4] if lbl='4h+3e...'
                     s = s.split( 'e0' )[1]  # for example '+3e2-2e5+6e7+e8'
 
             else:
-                c.e_lst = [0]
+                e_lst = [0]
                 s = lbl
 
             coef_e = ''
@@ -118,7 +252,7 @@ class Div:
                     i = int( coef_i )
                     if coef_e == '-': coef_e = '-1'
                     if coef_e in ['+', '']: coef_e = '1'
-                    c.e_lst += ( i - last_i - 1 ) * [0] + [int( coef_e )]
+                    e_lst += ( i - last_i - 1 ) * [0] + [int( coef_e )]
                     coef_e = ''
                     last_i = i
 
@@ -136,48 +270,48 @@ class Div:
 
             # '12' ---> e1-e2
             if len( lbl ) == 2:
-                c.e_lst[ int( lbl[0] ) ] = 1
-                c.e_lst[ int( lbl[1] ) ] = -1
+                e_lst[ int( lbl[0] ) ] = 1
+                e_lst[ int( lbl[1] ) ] = -1
 
             # '1123' ---> e0-e1-e2-e3
             elif len( lbl ) == 4 and lbl[0] == '1':
-                c.e_lst[0] = int( lbl[0] )
-                c.e_lst[ int( lbl[1] ) ] = -1
-                c.e_lst[ int( lbl[2] ) ] = -1
-                c.e_lst[ int( lbl[3] ) ] = -1
+                e_lst[0] = int( lbl[0] )
+                e_lst[ int( lbl[1] ) ] = -1
+                e_lst[ int( lbl[2] ) ] = -1
+                e_lst[ int( lbl[3] ) ] = -1
 
             # '212' ---> 2e0-e3-e4-...-e8
             elif len( lbl ) == 3 and lbl[0] == '2':
-                c.e_lst = 9 * [-1]
-                c.e_lst[0] = int( lbl[0] )
-                c.e_lst[ int( lbl[1] ) ] = 0
-                c.e_lst[ int( lbl[2] ) ] = 0
-                if rank != 9 and set( c.e_lst[rank:] ) != set( [0] ):
+                e_lst = 9 * [-1]
+                e_lst[0] = int( lbl[0] )
+                e_lst[ int( lbl[1] ) ] = 0
+                e_lst[ int( lbl[2] ) ] = 0
+                if rank != 9 and set( e_lst[rank:] ) != set( [0] ):
                     raise ValueError( 'Rank too low for label: ', rank, lbl )
-                c.e_lst = c.e_lst[:rank]
+                e_lst = e_lst[:rank]
 
             # '308' ---> 3e0-e1-e2-...-e7-2e8
             elif len( lbl ) == 3 and lbl[0] == '3' and lbl[1] == '0':
-                c.e_lst = 9 * [-1]
-                c.e_lst[0] = int( lbl[0] )
-                c.e_lst[ int( lbl[2] ) ] = -2
+                e_lst = 9 * [-1]
+                e_lst[0] = int( lbl[0] )
+                e_lst[ int( lbl[2] ) ] = -2
 
             else:  # unknown label
                 raise ValueError( 'Label has incorrect format: ', lbl )
 
             # for example '-12'=[0,-1,1,0,0,...]
             if neg:
-                c.e_lst = [ -e for e in c.e_lst ]
+                e_lst = [ -e for e in e_lst ]
 
         # end handling label of (-2)-class
 
         # update rank
-        c.e_lst = c.e_lst + ( rank - len( c.e_lst ) ) * [0]
+        e_lst = e_lst + ( rank - len( e_lst ) ) * [0]
 
-        return c
+        return Div( e_lst )
 
     def rank( self ):
-        return len( self.e_lst )
+        return len( self.e_tup )
 
     def is_positive( self ):
         '''
@@ -187,7 +321,7 @@ class Div:
             Return True iff the first nonzero entry of the self.e_lst 
             is positive. The zero divisor is also positive.
         '''
-        for e in self.e_lst:
+        for e in self.e_tup:
             if e != 0:
                 return e > 0
         return True
@@ -384,8 +518,8 @@ class Div:
         # from this point on we treat the general case
         #
         lbl = ''
-        for i in range( 0, len( self.e_lst ) ):
-            val = self[i]
+        for i in range( 0, len( self.e_tup ) ):
+            val = self.e_tup[i]
             if val != 0:
 
                 if val == 1:
@@ -415,9 +549,120 @@ class Div:
             applying the linear transformation corresponding
             to "M" to itself. 
         '''
-        v = sage_vector( self.e_lst ).column()
+        v = sage_vector( self.e_tup ).column()
         return Div( ( M * v ).list() )
 
+    @staticmethod
+    def get_mat( div_lst ):
+        '''
+        Parameters
+        ----------
+        div_lst : list<Div>
+            A nonempty list of "Div" objects of the same rank.
+        
+        Returns
+        -------
+        sage_matrix<sage_ZZ>
+            A matrix whose rows are the coefficients of 
+            the "Div" objects in "div_lst".
+        '''
+        return sage_matrix( sage_ZZ, [ d.e_tup for d in div_lst ] )
+
+    @staticmethod
+    def mat_mul_many( div_lst, M, fixed = False ):
+        '''
+        Applies a linear transformation to a list of "Div" objects 
+        using a single matrix multiplication.
+        
+        Parameters
+        ----------
+        div_lst : list<Div>
+            A list of "Div" objects of the same rank.
+            
+        M : sage_matrix
+            A matrix with "div_lst[0].rank()" columns.
+            
+        fixed : bool
+        
+        Returns
+        -------
+        list<Div> 
+            If "fixed==False", then the list
+                [ d.mat_mul( M ) for d in div_lst ]
+            is returned.
+            
+        list<Div>, list<bool>
+            If "fixed==True", then additionally a list 
+            of booleans is returned, such that the i-th
+            boolean is True if and only if "div_lst[i]"
+            is send to itself by "M". 
+        '''
+        if div_lst == []:
+            out_lst = []
+        else:
+            mat = Div.get_mat( div_lst ) * M.transpose()  # rows are images
+            out_lst = [ Div( row ) for row in mat.rows() ]
+
+        if not fixed:
+            return out_lst
+
+        return out_lst, [ out == d for out, d in zip( out_lst, div_lst ) ]
+
+    @staticmethod
+    def get_gram_mat( div_lst, div_lst2 = None, dtype = None, upper = False ):
+        '''
+        Computes all pairwise intersection products
+        with a single matrix product X*J*Y^T, where J is the
+        intersection matrix and the rows of X and Y are the
+        coefficients of "div_lst" and "div_lst2" respectively.
+
+        Parameters
+        ----------
+        div_lst : list<Div>
+            A list of "Div" objects of the same rank and
+            with the same intersection matrix.
+
+        div_lst2 : list<Div>
+            A list of "Div" objects of the same rank as
+            the elements in "div_lst". If None, then
+            "div_lst2" is set to "div_lst".
+
+        dtype : str
+            If not None, then a NumPy array with this
+            data type (for example 'int16' or 'int32')
+            is returned instead of a Sage matrix.
+
+        upper : bool
+            If True, then the entries below the diagonal
+            are set to zero. This is only meaningful
+            if "div_lst2==None".
+
+        Returns
+        -------
+        sage_matrix<sage_ZZ>
+            A matrix whose (i,j)-th entry equals
+                div_lst[i] * div_lst2[j]
+            The nonzero entries are obtained via the
+            method "dict()" of the matrix.
+        '''
+        if div_lst2 is None:
+            div_lst2 = div_lst
+
+        if div_lst == [] or div_lst2 == []:
+            G = sage_matrix( sage_ZZ, len( div_lst ), len( div_lst2 ) )
+        else:
+            J = Div.get_int_mat( div_lst[0].rank(), div_lst[0].int_key )
+            G = Div.get_mat( div_lst ) * J * Div.get_mat( div_lst2 ).transpose()
+
+        if upper:
+            G = sage_matrix( sage_ZZ, G.nrows(), G.ncols(),
+                             dict( [ ( ij, v ) for ij, v in G.dict().items() if ij[0] <= ij[1] ] ) )
+
+        if dtype is not None:
+            return G.numpy( dtype )
+
+        return G
+
     def int_mul( self, n ):
         '''
         Parameters
@@ -430,11 +675,13 @@ class Div:
             Returns a "Div" object that is a result of multiplying 
             with the scalar "n". 
         '''
-        return self.mat_mul( sage_diagonal_matrix( self.rank() * [n] ) )
+        return Div( [ n * e for e in self.e_tup ] )
 
     # operator overloading for ==
     def __eq__( self, other ):
-        return self.e_lst == other.e_lst
+        if type( other ) != Div:
+            return False
+        return self.hash_val == other.hash_val and self.e_tup == other.e_tup
 
     # operator overloading for !=
     def __ne__( self, other ):
@@ -467,8 +714,8 @@ class Div:
         if self.rank() != other.rank():
             return self.rank() < other.rank()
 
-        a = self.e_lst
-        b = other.e_lst
+        a = self.e_tup
+        b = other.e_tup
 
         if sum( a ) == sum( b ) == 1 and set( a ) == set( b ) == {0, 1}:
             return b < a  # e1 < e2
@@ -492,8 +739,20 @@ class Div:
             "div" wrt. to matrix "self.int_mat".
         '''
 
-        row_vec = sage_vector( sage_ZZ, self.e_lst ).row()
-        col_vec = sage_vector( sage_ZZ, div.e_lst ).column()
+        # for the default diagonal matrix we avoid constructing
+        # vectors and matrices: e0*f0 - e1*f1 - ... - er*fr
+        if self.int_key is None:
+            e_tup = self.e_tup
+            f_tup = div.e_tup
+            if len( e_tup ) != len( f_tup ):
+                raise ValueError( 'Expect Div objects of the same rank: ', e_tup, f_tup )
+            v = e_tup[0] * f_tup[0]
+            for i in range( 1, len( e_tup ) ):
+                v -= e_tup[i] * f_tup[i]
+            return v
+
+        row_vec = sage_vector( sage_ZZ, self.e_tup ).row()
+        col_vec = sage_vector( sage_ZZ, div.e_tup ).column()
         mat = self.int_mat
 
         v = row_vec * mat * col_vec
@@ -502,21 +761,22 @@ class Div:
 
     # operator overload for +
     def __add__( self, div ):
-        v = sage_vector( sage_ZZ, self.e_lst ) + sage_vector( sage_ZZ, div.e_lst )
-        return Div( list( v ) )
+        if self.rank() != div.rank():
+            raise ValueError( 'Expect Div objects of the same rank: ', self.e_tup, div.e_tup )
+        return Div( [ e + f for e, f in zip( self.e_tup, div.e_tup ) ] )
 
     # operator overload for -
     def __sub__( self, div ):
-        v = sage_vector( sage_ZZ, self.e_lst ) - sage_vector( sage_ZZ, div.e_lst )
-        return Div( list( v ) )
+        if self.rank() != div.rank():
+            raise ValueError( 'Expect Div objects of the same rank: ', self.e_tup, div.e_tup )
+        return Div( [ e - f for e, f in zip( self.e_tup, div.e_tup ) ] )
 
     # operator overloading for []
+    # Div objects are immutable and thus "__setitem__()" is not defined.
     def __getitem__( self, index ):
-        return self.e_lst[index]
-
-    # operator overloading for []
-    def __setitem__( self, index, item ):
-        self.e_lst[index] = item
+        if type( index ) == slice:
+            return list( self.e_tup[index] )
+        return self.e_tup[index]
 
     # overloading for str(.): human readable string representation of object
     def __str__( self ):
@@ -530,5 +790,6 @@ class Div:
         return self.__str__()
 
     # so that lists of this object can be used with set()
+    # The hash value is computed once in the constructor.
     def __hash__( self ):
-        return hash( self.__str__() + '__' + str( self.rank() ) )
+        return self.hash_val
@@ -9,21 +9,20 @@ of weak Del Pezzo surfaces of degree between 1 and 7.
 from ns_lattice.sage_interface import sage_identity_matrix
 from ns_lattice.sage_interface import sage_ZZ
 from ns_lattice.sage_interface import sage_QQ
-from ns_lattice.sage_interface import sage_Subsets
-from ns_lattice.sage_interface import sage_VectorSpace
-from ns_lattice.sage_interface import sage_vector
 from ns_lattice.sage_interface import sage_Graph
 
-from ns_lattice.div_in_lattice import get_divs
 from ns_lattice.div_in_lattice import get_indecomp_divs
-from ns_lattice.div_in_lattice import get_ak
+
+from ns_lattice.div_tables import get_roots
+from ns_lattice.div_tables import get_lines
+from ns_lattice.div_tables import get_conics
 
 from ns_lattice.dp_root_bases import get_graph
 from ns_lattice.dp_root_bases import get_ext_graph
+from ns_lattice.dp_root_bases import get_graph_certificate
 from ns_lattice.dp_root_bases import get_dynkin_type
 from ns_lattice.dp_root_bases import convert_type
 from ns_lattice.dp_root_bases import get_root_bases_orbit
-from ns_lattice.dp_root_bases import is_root_basis
 
 from ns_lattice.dp_involutions import basis_to_involution
 from ns_lattice.dp_involutions import is_integral_involution
@@ -32,8 +31,53 @@ from ns_lattice.class_ns_tools import NSTools
 
 from ns_lattice.class_div import Div
 
+from ns_lattice.class_dp_lattice_set import DPLatticeSet
+
+from ns_lattice.class_root_basis import RootBasisValidator
+
 from ns_lattice.class_eta import ETA
 
+from ns_lattice.class_work_queue import TODO
+from ns_lattice.class_work_queue import CLAIMED
+
+import multiprocessing
+
+
+class LazyAttribute( object ):
+    '''
+    A descriptor for an attribute of a DPLattice object that is computed 
+    when it is accessed and its current value is None. The value is stored
+    in the dictionary of the DPLattice object under the name of the attribute,
+    so that DPLattice objects are pickled as before. Assigning a value, 
+    such as None, to the attribute works as for a usual attribute. 
+    '''
+
+    def __init__( self, name, compute ):
+        '''
+        Parameters
+        ----------
+        name : str
+            Name of the attribute.
+        
+        compute : function
+            A function that takes a DPLattice object as 
+            argument and returns the value of the attribute.
+        '''
+        self.name = name
+        self.compute = compute
+
+    def __get__( self, obj, cls ):
+        if obj is None:
+            return self
+        val = obj.__dict__.get( self.name, None )
+        if val is None:
+            val = self.compute( obj )
+            obj.__dict__[self.name] = val
+        return val
+
+    def __set__( self, obj, val ):
+        obj.__dict__[self.name] = val
+
 
 class DPLattice:
     '''
@@ -61,6 +105,10 @@ class DPLattice:
     The intersection product is in this case -h*e1=e2^2=...=er^2=-1 with
     remaining intersections zero.         
     
+    Except for "M", "Md_lst", "d_lst", "SG" and "SG_data", the 
+    attributes are computed when they are accessed for the first 
+    time (see "LazyAttribute"). Thus only the attributes that are 
+    needed for example by ".__eq__()" and ".__lt__()" are computed.
 
     Attributes
     ----------
@@ -125,6 +173,10 @@ class DPLattice:
     G : sage_GRAPH
         The Cremona invariant for the current lattice.
         
+    G_cert : tuple
+        A hashable certificate of the isomorphism class of "G"
+        (see "get_graph_certificate()").
+        
     SG : sage_GRAPH
         Simple family graph (see self.get_SG()).
     
@@ -166,6 +218,7 @@ class DPLattice:
         self.or_lst = None
         self.sr_lst = None
         self.G = None
+        self.G_cert = None
 
         self.SG = None
         self.SG_data = None
@@ -174,10 +227,13 @@ class DPLattice:
         '''
         Sets attributes of this object, depending
         on the input level.
-        For constructing a classification we instantiate
-        many DPLattice objects. This method allows us 
-        to minimize the number of attributes that computed
-        (thus we use lazy evaluation).
+        
+        The attributes are computed lazily when they are accessed
+        (see "LazyAttribute"), so that this method is not needed
+        anymore. It is kept for compatibility and computes the
+        attributes in the following order: 
+            m1_lst, fam_lst, real_d_lst, real_m1_lst, real_fam_lst, 
+            or_lst, sr_lst, type, Mtype, G and G_cert.
         
         Parameter
         ---------
@@ -186,68 +242,145 @@ class DPLattice:
             should be initialized.
         
         level : int
-            A non-negative number.
+            A non-negative number. The attributes up to
+            position "level" in the above list are computed,
+            where G and G_cert have position 9.
         '''
+        attr_lst = ['m1_lst', 'fam_lst', 'real_d_lst', 'real_m1_lst', 'real_fam_lst',
+                    'or_lst', 'sr_lst', 'type', 'Mtype', 'G', 'G_cert']
+        for attr in attr_lst[:level + 1] + ( attr_lst[10:] if level >= 9 else [] ):
+            getattr( self, attr )
+
+    def __get_m1_lst( self ):
+        return get_indecomp_divs( get_lines( self.get_rank() ), self.d_lst )
+
+    def __get_fam_lst( self ):
+        return get_indecomp_divs( get_conics( self.get_rank() ), self.d_lst )
+
+    def __get_real_d_lst( self ):
+        fixed_lst = Div.mat_mul_many( self.d_lst, self.M, True )[1]
+        return [ d for d, fixed in zip( self.d_lst, fixed_lst ) if fixed ]
+
+    def __get_real_m1_lst( self ):
+        fixed_lst = Div.mat_mul_many( self.m1_lst, self.M, True )[1]
+        return [ m1 for m1, fixed in zip( self.m1_lst, fixed_lst ) if fixed ]
+
+    def __get_real_fam_lst( self ):
+        fixed_lst = Div.mat_mul_many( self.fam_lst, self.M, True )[1]
+        return [ f for f, fixed in zip( self.fam_lst, fixed_lst ) if fixed ]
+
+    def __get_or_lst( self ):
+        # a root is orthogonal to d_lst if its row in the Gram matrix is zero
+        r_lst = get_roots( self.get_rank() )
+        if self.d_lst == []:
+            return r_lst
+        nz_set = set( [ i for ( i, j ) in Div.get_gram_mat( r_lst, self.d_lst ).dict() ] )
+        return [ r for i, r in enumerate( r_lst ) if i not in nz_set ]
+
+    def __get_sr_lst( self ):
+        # The span of d_lst over QQ is the orthogonal complement
+        # of the right kernel of the matrix with rows d_lst, with respect 
+        # to the standard inner product. A root lies in this span 
+        # if its row in "R*K^T" is zero, where R has the roots as rows 
+        # and the rows of K form a basis for the right kernel.
+        r_lst = get_roots( self.get_rank() )
+        if self.d_lst == []:
+            return []
+        K = Div.get_mat( self.d_lst ).right_kernel_matrix()
+        if K.nrows() == 0:
+            return r_lst
+        nz_set = set( [ i for ( i, j ) in ( Div.get_mat( r_lst ) * K.transpose() ).dict() ] )
+        return [ r for i, r in enumerate( r_lst ) if i not in nz_set ]
+
+    def __get_type( self ):
+        return get_dynkin_type( self.d_lst )
+
+    def __get_Mtype( self ):
+        return get_dynkin_type( self.Md_lst )
+
+    def __get_G( self ):
+        return get_ext_graph( self.d_lst + self.m1_lst, self.M )
+
+    def __get_G_cert( self ):
+        return get_graph_certificate( self.G )
+
+    m1_lst = LazyAttribute( 'm1_lst', __get_m1_lst )
+    fam_lst = LazyAttribute( 'fam_lst', __get_fam_lst )
+    real_d_lst = LazyAttribute( 'real_d_lst', __get_real_d_lst )
+    real_m1_lst = LazyAttribute( 'real_m1_lst', __get_real_m1_lst )
+    real_fam_lst = LazyAttribute( 'real_fam_lst', __get_real_fam_lst )
+    or_lst = LazyAttribute( 'or_lst', __get_or_lst )
+    sr_lst = LazyAttribute( 'sr_lst', __get_sr_lst )
+    type = LazyAttribute( 'type', __get_type )
+    Mtype = LazyAttribute( 'Mtype', __get_Mtype )
+    G = LazyAttribute( 'G', __get_G )
+    G_cert = LazyAttribute( 'G_cert', __get_G_cert )
+
+    def __setstate__( self, state ):
+        '''
+        Used by pickle. Attributes that did not exist when 
+        the DPLattice object was stored are initialized to None.
+        '''
+        self.__init__( state['d_lst'], state['Md_lst'], state['M'] )
+        self.__dict__.update( state )
 
-        # M, Md_lst and d_lst are set.
-
-        if self.m1_lst == None:
-            all_m1_lst = get_divs( get_ak( self.get_rank() ), 1, -1, True )
-            self.m1_lst = get_indecomp_divs( all_m1_lst, self.d_lst )
-
-        if level < 1: return
-
-        if self.fam_lst == None:
-            all_fam_lst = get_divs( get_ak( self.get_rank() ), 2, 0, True )
-            self.fam_lst = get_indecomp_divs( all_fam_lst, self.d_lst )
-
-        if level < 2: return
-
-        if self.real_d_lst == None:
-            self.real_d_lst = [ d for d in self.d_lst if d.mat_mul( self.M ) == d ]
-
-        if level < 3: return
-
-        if self.real_m1_lst == None:
-            self.real_m1_lst = [ m1 for m1 in self.m1_lst if m1.mat_mul( self.M ) == m1 ]
-
-        if level < 4: return
-
-        if self.real_fam_lst == None:
-            self.real_fam_lst = [ f for f in self.fam_lst if f.mat_mul( self.M ) == f ]
-
-        if level < 5: return
-
-        if self.or_lst == None:
-            self.or_lst = []
-            for m2 in get_divs( get_ak( self.get_rank() ), 0, -2, True ):
-                if [m2 * d for d in self.d_lst] == len( self.d_lst ) * [0]:
-                    self.or_lst += [m2]
-
-        if level < 6: return
-
-        if self.sr_lst == None:
-            V = sage_VectorSpace( sage_QQ, self.get_rank() )
-            W = V.subspace( [d.e_lst for d in self.d_lst] )
-            self.sr_lst = []
-            for m2 in get_divs( get_ak( self.get_rank() ), 0, -2, True ):
-                if sage_vector( m2.e_lst ) in W:
-                    self.sr_lst += [ m2 ]
-
-        if level < 7: return
-
-        if self.type == None:
-            self.type = get_dynkin_type( self.d_lst )
-
-        if level < 8: return
-
-        if self.Mtype == None:
-            self.Mtype = get_dynkin_type( self.Md_lst )
-
-        if level < 9: return
+    def get_fingerprint( self ):
+        '''
+        Parameters
+        ----------
+        self : DPLattice
+        
+        Returns
+        -------
+        tuple
+            A hashable invariant of this DPLattice object such that
+            equivalent objects (see ".__eq__()") have the same fingerprint.
+            It consists of the rank, ".get_numbers()", the cardinalities 
+            of "self.or_lst" and "self.sr_lst", "self.type" and the 
+            degree sequence and sorted edge labels of the graph "self.G".
+            This is part of ".get_certificate()".
+        '''
+        return ( self.get_rank(),
+                 self.get_numbers(),
+                 len( self.or_lst ),
+                 len( self.sr_lst ),
+                 self.type,
+                 tuple( self.G.degree_sequence() ),
+                 tuple( sorted( [ int( label ) for label in self.G.edge_labels() ] ) ) )
+
+    def get_certificate( self ):
+        '''
+        Parameters
+        ----------
+        self : DPLattice
+        
+        Returns
+        -------
+        tuple
+            A hashable certificate such that two DPLattice objects 
+            are equivalent (see ".__eq__()") if and only if their 
+            certificates are equal. It consists of the fingerprint 
+            (see ".get_fingerprint()") and the certificate "self.G_cert" 
+            of the Cremona invariant.
+        '''
+        return self.get_fingerprint() + ( self.G_cert, )
 
-        if self.G == None:
-            self.G = get_ext_graph( self.d_lst + self.m1_lst, self.M )
+    def get_cache_key( self ):
+        '''
+        Parameters
+        ----------
+        self : DPLattice
+            We expect self.M, self.Md_lst and self.d_lst to be initialized.
+        
+        Returns
+        -------
+        tuple
+            A compact key for this DPLattice object that is used
+            as part of keys of "NSTools.get_tool_dct()". The key 
+            only depends on "self.d_lst", "self.Md_lst" and "self.M"
+            since the remaining attributes are determined by these.
+        '''
+        return NSTools.get_key_arg( ( self.d_lst, self.Md_lst, self.M ) )
 
     def get_rank( self ):
         '''
@@ -303,7 +436,6 @@ class DPLattice:
             if it is effective and cannot be written as 
             the sum of two effective classes.
         '''
-        self.set_attributes( 6 )
         return ( len( self.d_lst ),
                  len( self.m1_lst ),
                  len( self.fam_lst ),
@@ -326,7 +458,6 @@ class DPLattice:
             is isomorphic to this one, must be birational to P1xP1
             (ie. fiber product of the projective line with itself).             
         '''
-        self.set_attributes( 6 )
         for f1 in self.real_fam_lst:
             for f2 in self.real_fam_lst:
                 if f1 * f2 == 1:
@@ -351,9 +482,7 @@ class DPLattice:
             disjoint complex conjugate exceptional curves
             or real exceptional curves can be contracted.          
         '''
-        self.set_attributes( 0 )
-        for u in self.m1_lst:
-            v = u.mat_mul( self.M )
+        for u, v in zip( self.m1_lst, Div.mat_mul_many( self.m1_lst, self.M ) ):
             if v * u == 0 or v == u:
                 return False
         return True
@@ -366,7 +495,6 @@ class DPLattice:
         if self.get_degree() not in [6, 4, 2]:
             return self.Mtype
 
-        self.set_attributes( 8 )
         if ( self.get_degree(), self.Mtype ) not in [ ( 6, 'A1' ), ( 4, '2A1' ), ( 2, '3A1' ) ]:
             return self.Mtype
 
@@ -405,13 +533,8 @@ class DPLattice:
         type_lst = []
         for comp in comp_lst:
             c_lst = [ self.d_lst[i] for i in comp ]
-            mc_lst = []
-            elementwise = True
-            for c in c_lst:
-                mc = c.mat_mul( self.M )
-                mc_lst += [mc]
-                if c != mc:
-                    elementwise = False
+            mc_lst, fixed_lst = Div.mat_mul_many( c_lst, self.M, True )
+            elementwise = False not in fixed_lst
             mc_lst.sort()
             dtype = get_dynkin_type( c_lst )
 
@@ -454,8 +577,6 @@ class DPLattice:
             lattice with respect to a new basis.
                 
         '''
-        self.set_attributes( 6 )
-
         d_lst_B = [ d.get_basis_change( B ) for d in self.d_lst ]
         Md_lst_B = [ Md.get_basis_change( B ) for Md in self.Md_lst ]
         M_B = ~( B.T ) * self.M * ( B.T )  # ~B is inverse of B, new involution after coordinate change
@@ -512,14 +633,11 @@ class DPLattice:
             NSTools.p( 'Initializing simple family graph of current DPLattice object...', self.get_rank(), self.get_marked_Mtype(), self.get_real_type() )
 
         f = self.real_fam_lst
-        f_range = range( len( f ) )
+        gram_dct = Div.get_gram_mat( f, upper = True ).dict()
 
         self.SG = sage_Graph( loops=True )
-        self.SG.add_vertices( f_range )
-        for i in f_range:
-            for j in f_range:
-                if f[i] * f[j] > 1:
-                    self.SG.add_edge( i, j, f[i] * f[j] )
+        self.SG.add_vertices( range( len( f ) ) )
+        self.SG.add_edges( [ ( i, j, v ) for ( i, j ), v in gram_dct.items() if v > 1 ] )
 
         self.SG_data = [ self.SG.num_verts(),  # number of vertices
                          self.SG.num_edges(),  # number of edges
@@ -560,7 +678,7 @@ class DPLattice:
             of a weak Del Pezzo surface.
         '''
         # check whether classification of root bases is in cache
-        key = 'get_bas_lst__' + str( rank )
+        key = NSTools.get_key( 'get_bas_lst', rank )
         if key in NSTools.get_tool_dct():
             return NSTools.get_tool_dct()[key]
 
@@ -571,7 +689,7 @@ class DPLattice:
         C = [ 1127, 1347, 1567, 234, 278, 308 ]
         D = [ 1123, 1345, 1156, 1258, 1367, 1247, 1468, 1178 ]
 
-        dpl_lst = []
+        dpl_set = DPLatticeSet()
         for ( lst1, lst2 ) in [ ( A, [] ), ( A, B ), ( A, C ), ( [], D ) ]:
 
             # restrict to divisors in list, that are of rank at most "max_rank"
@@ -582,29 +700,37 @@ class DPLattice:
             Md_lst = []
             M = sage_identity_matrix( sage_QQ, rank )
 
-            # loop through the lists
-            sub1 = sage_Subsets( range( len( lst1 ) ) )
-            sub2 = sage_Subsets( range( len( lst2 ) ) )
-            eta = ETA( len( sub1 ) * len( sub2 ), 20 )
-            for idx2_lst in sub2:
-                for idx1_lst in sub1:
-
-                    eta.update( 'get_bas_lst rank =', rank )
-
-                    d_lst = [ lst1[idx1] for idx1 in idx1_lst ]
-                    d_lst += [ lst2[idx2] for idx2 in idx2_lst ]
-
-                    if not is_root_basis( d_lst ):
-                        continue
-
-                    dpl = DPLattice( d_lst, Md_lst, M )
-
-                    if dpl not in dpl_lst:
-                        dpl.set_attributes()
-                        dpl_lst += [dpl]
+            # Collect the subsets of lst1+lst2 that form a root basis, by 
+            # a depth first search that does not extend a subset that 
+            # is not a root basis, since its supersets are no root bases either.
+            r_lst = lst1 + lst2
+            idx_lst_lst = []
+            val = RootBasisValidator()
+            def extend( idx_lst ):
+                idx_lst_lst.append( idx_lst )
+                start = idx_lst[-1] + 1 if idx_lst != [] else 0
+                for idx in range( start, len( r_lst ) ):
+                    if val.push( r_lst[idx] ):
+                        extend( idx_lst + [idx] )
+                        val.pop()
+            extend( [] )
+
+            # We consider the subsets in the same order as sage_Subsets()
+            # for lst2 and lst1, so that the same representatives are found.
+            def get_order( idx_lst ):
+                idx1_lst = [ idx for idx in idx_lst if idx < len( lst1 ) ]
+                idx2_lst = [ idx for idx in idx_lst if idx >= len( lst1 ) ]
+                return ( len( idx2_lst ), idx2_lst, len( idx1_lst ), idx1_lst )
+            idx_lst_lst.sort( key = get_order )
+
+            eta = ETA( len( idx_lst_lst ), 20 )
+            for idx_lst in idx_lst_lst:
+                eta.update( 'get_bas_lst rank =', rank )
+                dpl = DPLattice( [ r_lst[idx] for idx in idx_lst ], Md_lst, M )
+                dpl_set.add( dpl )
 
         # cache output
-        dpl_lst.sort()
+        dpl_lst = sorted( dpl_set.dpl_lst )
         NSTools.get_tool_dct()[key] = dpl_lst
         NSTools.save_tool_dct()
 
@@ -641,7 +767,7 @@ class DPLattice:
             subsystem defines a unimodular involution.  
         '''
         # check cache
-        key = 'get_inv_lst__' + str( rank )
+        key = NSTools.get_key( 'get_inv_lst', rank )
         if False and key in NSTools.get_tool_dct():
             return NSTools.get_tool_dct()[key]
 
@@ -650,7 +776,7 @@ class DPLattice:
         NSTools.p( 'rank =', rank )
 
         amb_lst = []
-        inv_lst = []
+        inv_set = DPLatticeSet()
         eta = ETA( len( bas_lst ), 1 )
         for bas in bas_lst:
             eta.update( bas.type )
@@ -659,27 +785,26 @@ class DPLattice:
             if not is_integral_involution( M ):
                 continue
             inv = DPLattice( [], bas.d_lst, M )
-            inv.set_attributes()
 
             NSTools.p( 'Found type of involution: ', bas.type )
 
             # real structures with different Dynkin types may be equivalent
-            if inv not in inv_lst:
-                inv_lst += [ inv ]
+            inv_prv = inv_set.find( inv )
+            if inv_prv is None:
+                inv_set.append( inv )
             else:
-                inv_prv = [inv2 for inv2 in inv_lst if inv == inv2][0]
-                inv_lst = [inv2 for inv2 in inv_lst if not inv2 == inv]
                 amb_lst += [inv, inv_prv]
+                inv_set.remove( inv_prv )
                 if inv > inv_prv:
-                    inv_lst += [inv]
+                    inv_set.append( inv )
                 else:
-                    inv_lst += [inv_prv]
+                    inv_set.append( inv_prv )
                 NSTools.p( '\tAmbitious type:', inv.Mtype, '==', inv_prv.Mtype,
                            ' inv>inv_prv: ', inv > inv_prv,
                            ' ambitious types =', [ amb.Mtype for amb in amb_lst if amb == inv ] )
 
         # store in cache
-        inv_lst.sort()
+        inv_lst = sorted( inv_set.dpl_lst )
         NSTools.get_tool_dct()[key] = inv_lst
         NSTools.save_tool_dct()
 
@@ -709,7 +834,7 @@ class DPLattice:
                 diagonal matrix with diagonal: (1,-1,...,-1). 
         '''
         # check cache
-        key = 'get_cls_slow__' + str( rank )
+        key = NSTools.get_key( 'get_cls_slow', rank )
         if key in NSTools.get_tool_dct():
             return NSTools.get_tool_dct()[key]
 
@@ -718,7 +843,7 @@ class DPLattice:
 
         # we fix an involution up to equivalence and go through
         # all possible root bases for singularities.
-        dpl_lst = []
+        dpl_set = DPLatticeSet()
         eta = ETA( len( bas_lst ) * len( inv_lst ), 20 )
         for inv in inv_lst:
             for bas in bas_lst:
@@ -729,7 +854,7 @@ class DPLattice:
                 for d_lst in orbit_lst:
 
                     # check whether involution inv.M preserves d_lst
-                    dm_lst = [ d.mat_mul( inv.M ) for d in d_lst ]
+                    dm_lst = Div.mat_mul_many( d_lst, inv.M )
                     dm_lst.sort()
                     if dm_lst != d_lst:
                         continue
@@ -737,12 +862,10 @@ class DPLattice:
                     # add to classification if not equivalent to objects
                     # in list, see "DPLattice.__eq__()".
                     dpl = DPLattice( d_lst, inv.Md_lst, inv.M )
-                    if dpl not in dpl_lst:
-                        dpl.set_attributes()
-                        dpl_lst += [dpl]
+                    dpl_set.add( dpl )
 
         # store in cache
-        dpl_lst.sort()
+        dpl_lst = sorted( dpl_set.dpl_lst )
         NSTools.get_tool_dct()[key] = dpl_lst
         NSTools.save_tool_dct()
 
@@ -794,8 +917,9 @@ class DPLattice:
 
         # computes the roots in the eigenspace of eigenvalue 1
         # of the involution defined by inv
-        r_lst = get_divs( get_ak( inv.get_rank() ), 0, -2, True )
-        s_lst = [ r for r in r_lst if r.mat_mul( inv.M ) == r ]
+        r_lst = get_roots( inv.get_rank() )
+        fixed_lst = Div.mat_mul_many( r_lst, inv.M, True )[1]
+        s_lst = [ r for r, fixed in zip( r_lst, fixed_lst ) if fixed ]
 
         if len( s_lst ) == 30:  # D6 since #roots=60=2*30
             if bas.type in ['2A1', 'A3', '4A1', '2A1+A3', 'A5']:
@@ -828,7 +952,7 @@ class DPLattice:
         -------
         list<Div>, list<Div>
             Let R be defined by the list
-                get_divs( get_ak( inv.get_rank() ), 0, -2, True )
+                get_roots( inv.get_rank() )
             whose elements are Div objects.
             If r is a Div object, then M(r) is shorthand notation for 
                 r.mat_mul(inv.M).
@@ -838,15 +962,19 @@ class DPLattice:
                 Q union Q' := { r in R | M(r) not in {r,-r} and r*M(r)>0 }
             where Q = M(Q').                        
         '''
-        r_lst = get_divs( get_ak( inv.get_rank() ), 0, -2, True )
-        s_lst = [ r for r in r_lst if r.mat_mul( inv.M ) == r ]
-        tq1_lst = [ r for r in r_lst if r.mat_mul( inv.M ) not in [r, r.int_mul( -1 )] ]
-        tq_lst = [ q for q in tq1_lst if q * q.mat_mul( inv.M ) >= 0 ]
+        r_lst = get_roots( inv.get_rank() )
+        mr_lst = Div.mat_mul_many( r_lst, inv.M )
+        mr_dct = dict( zip( r_lst, mr_lst ) )  # r ---> M(r)
+        s_lst = [ r for r, mr in zip( r_lst, mr_lst ) if mr == r ]
+        tq1_lst = [ r for r, mr in zip( r_lst, mr_lst ) if mr not in [r, r.int_mul( -1 )] ]
+        tq_lst = [ q for q in tq1_lst if q * mr_dct[q] >= 0 ]
 
         q_lst = []
+        q_set = set( [] )
         for q in sorted( tq_lst ):
-            if q not in q_lst and q.mat_mul( inv.M ) not in q_lst:
+            if q not in q_set and mr_dct[q] not in q_set:
                 q_lst += [q]
+                q_set.add( q )
 
         # q_lst += [ q.int_mul( -1 ) for q in q_lst ]
 
@@ -855,7 +983,7 @@ class DPLattice:
         NSTools.p( 'tq1_lst    =', len( tq1_lst ), tq1_lst )
         NSTools.p( 'tq_lst     =', len( tq_lst ), tq_lst )
         NSTools.p( 'q_lst      =', len( q_lst ), q_lst )
-        NSTools.p( '       M -->', len( q_lst ), [q.mat_mul( inv.M ) for q in q_lst] )
+        NSTools.p( '       M -->', len( q_lst ), [mr_dct[q] for q in q_lst] )
         NSTools.p( 'inv.Md_lst =', inv.Mtype, inv.Md_lst, ', rank =', inv.get_rank() )
 
         return s_lst, q_lst
@@ -990,7 +1118,6 @@ class DPLattice:
             if set( Md_lst ) == set( inv.Md_lst ):
                 NSTools.p( 'importing: ', ( inv.get_rank(), cls.get_marked_Mtype(), cls.get_real_type() ), Md_lst, '==', inv.Md_lst )
                 out = DPLattice( d_lst, inv.Md_lst, inv.M )
-                out.set_attributes()
                 out_lst += [ out ]
 
         # always ensure that at least inv object is contained
@@ -1003,6 +1130,235 @@ class DPLattice:
 
         return out_lst
 
+    @staticmethod
+    def get_inv_units( inv, bas_lst, cls_lst, num_units = 1 ):
+        '''
+        This method is used by get_cls() and splits the work
+        for a single involution into self-contained work units.
+        
+        Parameters
+        ----------
+        inv : DPLattice
+            An element of "DPLattice.get_inv_lst( rank )"
+            such that "inv.Mtype!='A0'".
+            
+        bas_lst : list<DPLattice>
+            The output of "DPLattice.get_bas_lst( rank )".
+            
+        cls_lst : list<DPLattice>
+            The output of "DPLattice.get_cls( rank - 1 )".
+        
+        num_units : int
+            Maximal number of work units.
+        
+        Returns
+        -------
+        list<tuple>
+            A list of tuples ( inv, bas1_lst, bas2_lst, bas3_lst ), where 
+            "bas1_lst" and "bas3_lst" are the same for each tuple and 
+            the "bas2_lst" are disjoint slices of the list of candidate 
+            bases in the roots "s_lst" (see ".get_part_roots()").
+            The union of the outputs of ".get_unit_cls()" for these
+            tuples is, up to equivalence, the classification for
+            the involution "inv".
+        '''
+        rank = inv.get_rank()
+
+        # partition the roots into two sets
+        s_lst, q_lst = DPLattice.get_part_roots( inv )
+
+        # import classification for rank-1
+        bas1_lst = DPLattice.import_cls( cls_lst, inv )
+        NSTools.p( 'looping through inv_lst continued after recursive call:', ( rank, inv.get_marked_Mtype(), inv.Md_lst ) )
+
+        # correct partition of roots (bas1_lst always contains inv)
+        if len( bas1_lst ) > 1:
+            e = Div.new( 'e' + str( rank - 1 ), inv.get_rank() )
+            s_lst = [ s for s in s_lst if s * e != 0 ]
+            q_lst = [ q for q in q_lst if q * e != 0 ]
+        NSTools.p( 'bas1_lst =', len( bas1_lst ), [( bas1.Mtype, bas1.type ) for bas1 in bas1_lst] )
+        NSTools.p( 's_lst    =', len( s_lst ), s_lst )
+        NSTools.p( 'q_lst    =', len( q_lst ), q_lst )
+
+        # collect all possible root bases in s_lst and q_lst
+        bas2_lst = []
+        bas3_lst = []
+        visited_type_lst = []
+        eta = ETA( len( bas_lst ), 1 )
+        for bas in bas_lst:
+
+            # display progress info
+            eta.update( 'get_cls seeking bases in s_lst and q_lst: ', ( rank, inv.get_marked_Mtype(), bas.get_real_type() ) )
+
+            # each type in bas_lst is treated only once
+            if bas.type in visited_type_lst:
+                continue
+            visited_type_lst += [bas.type]
+
+            # collect bases of type bas.type in s_lst
+            if DPLattice.get_num_types( inv, bas, bas_lst ) != 0:
+                bas2_lst += DPLattice.seek_bases( inv, bas.d_lst, s_lst )
+
+            # collect bases of type bas.type in q_lst
+            if 2 * len( bas.d_lst ) > rank - 1:
+                continue  # the rank of a root subsystem is bounded by rank-1
+            tmp_lst = DPLattice.seek_bases( inv, bas.d_lst, q_lst )
+            for tmp in tmp_lst:
+                val = RootBasisValidator()
+                val.push_lst( tmp.d_lst )
+                tmp.d_lst += Div.mat_mul_many( tmp.d_lst, inv.M )
+                if val.push_lst( tmp.d_lst[len( val ):] ):  # the roots and their involutions might have intersection product 1
+                    tmp.d_lst.sort()
+                    bas3_lst += [tmp]
+
+        # debug info
+        NSTools.p( 'Setting Dynkin types of', len( bas2_lst + bas3_lst ), 'items...please wait...' )
+        eta = ETA( len( bas2_lst + bas3_lst ), len( bas2_lst + bas3_lst ) / 10 )
+        for bas in bas2_lst + bas3_lst:
+            bas.type = get_dynkin_type( bas.d_lst )
+            bas.Mtype = get_dynkin_type( bas.Md_lst )
+            eta.update( bas.get_rank(), bas.get_marked_Mtype(), bas.type )
+        bas1_lst.sort()
+        bas2_lst.sort()
+        bas3_lst.sort()
+        t_lst1 = [bas.type for bas in bas1_lst]
+        t_lst2 = [bas.type for bas in bas2_lst]
+        t_lst3 = [bas.type for bas in bas3_lst]
+        lst1 = sorted( list( set( [( t, t_lst1.count( t ) ) for t in t_lst1] ) ) )
+        lst2 = sorted( list( set( [( t, t_lst2.count( t ) ) for t in t_lst2] ) ) )
+        lst3 = sorted( list( set( [( t, t_lst3.count( t ) ) for t in t_lst3] ) ) )
+        NSTools.p( 'inv      =', inv.get_marked_Mtype(), ', rank =', rank )
+        NSTools.p( 'bas1_lst =', len( bas1_lst ), lst1 )
+        NSTools.p( 'bas2_lst =', len( bas2_lst ), lst2 )
+        NSTools.p( 'bas3_lst =', len( bas3_lst ), lst3 )
+
+        # split bas2_lst into slices
+        num_units = max( 1, min( num_units, len( bas2_lst ) ) )
+        return [ ( inv, bas1_lst, bas2_lst[i::num_units], bas3_lst ) for i in range( num_units ) ]
+
+    @staticmethod
+    def get_unit_cls( unit ):
+        '''
+        Parameters
+        ----------
+        unit : tuple
+            A work unit ( inv, bas1_lst, bas2_lst, bas3_lst ) 
+            in the output of ".get_inv_units()". 
+        
+        Returns
+        -------
+        list<DPLattice>
+            A list of pairwise non-equivalent DPLattice objects, 
+            whose root bases are the root bases in the union of 
+            a basis in each of "bas1_lst", "bas2_lst" and "bas3_lst".
+            The certificates of the DPLattice objects (see
+            ".get_certificate()") are computed, so that the
+            attributes that define the certificate are pickled 
+            together with the DPLattice objects.
+        '''
+        inv, bas1_lst, bas2_lst, bas3_lst = unit
+        rank = inv.get_rank()
+
+        # compute the intersection products of all roots in the bases at once
+        r_lst = []
+        idx_dct = {}  # root ---> index in r_lst
+        for bas in bas1_lst + bas2_lst + bas3_lst:
+            for d in bas.d_lst:
+                if d not in idx_dct:
+                    idx_dct[d] = len( r_lst )
+                    r_lst += [d]
+        G_dct = Div.get_gram_mat( r_lst ).dict() if r_lst != [] else {}
+        idx1_lst = [ [ idx_dct[d] for d in bas.d_lst ] for bas in bas1_lst ]
+        idx2_lst = [ [ idx_dct[d] for d in bas.d_lst ] for bas in bas2_lst ]
+        idx3_lst = [ [ idx_dct[d] for d in bas.d_lst ] for bas in bas3_lst ]
+
+        # Two bases are compatible if the pairwise intersection
+        # products of their roots are either 0 or 1. A common root
+        # has intersection product -2 and is thus not compatible.
+        def is_compatible( i_lst, j_lst ):
+            for i in i_lst:
+                for j in j_lst:
+                    if G_dct.get( ( i, j ), 0 ) not in [0, 1]:
+                        return False
+            return True
+
+        # the compatible pairs in bas1_lst x bas2_lst form a root basis
+        val = RootBasisValidator()
+        pair_lst = []
+        for i1, bas1 in enumerate( bas1_lst ):
+            val.push_lst( bas1.d_lst )
+            for i2, bas2 in enumerate( bas2_lst ):
+                if len( bas1.d_lst ) + len( bas2.d_lst ) > rank - 1:
+                    continue  # the rank of a root subsystem is bounded by rank-1
+                if is_compatible( idx1_lst[i1], idx2_lst[i2] ) and val.push_lst( bas2.d_lst ):
+                    pair_lst += [( i1, i2 )]
+                    val.pop_lst( len( bas2.d_lst ) )
+            val.pop_lst( len( bas1.d_lst ) )
+        NSTools.p( 'compatible pairs in bas1_lst x bas2_lst =', len( pair_lst ), '<=', len( bas1_lst ) * len( bas2_lst ) )
+
+        # extend the compatible pairs with the compatible bases in bas3_lst
+        dpl_set = DPLatticeSet()
+        total = len( pair_lst )
+        step = total / 10 if total > 10 else total
+        eta = ETA( total, step )
+        for i1, i2 in pair_lst:
+            bas1, bas2 = bas1_lst[i1], bas2_lst[i2]
+            eta.update( 'last loop in get_cls: ( bas1.type, bas2.type )=', ( bas1.type, bas2.type ) )
+            val.push_lst( bas1.d_lst + bas2.d_lst )
+            for i3, bas3 in enumerate( bas3_lst ):
+                d_lst = bas1.d_lst + bas2.d_lst + bas3.d_lst  # notice that d_lst can be equal to []
+                if len( d_lst ) > rank - 1:
+                    continue  # the rank of a root subsystem is bounded by rank-1
+                if not is_compatible( idx1_lst[i1] + idx2_lst[i2], idx3_lst[i3] ):
+                    continue
+                if val.push_lst( bas3.d_lst ):
+                    val.pop_lst( len( bas3.d_lst ) )
+                    dpl = DPLattice( d_lst, inv.Md_lst, inv.M )
+                    if dpl_set.add( dpl ):
+                        NSTools.p( '\t appended: ', ( rank, dpl.get_marked_Mtype(), dpl.get_real_type() ), ', ( bas1.type, bas2.type, bas3.type ) =', ( bas1.type, bas2.type, bas3.type ) )
+            val.pop_lst( len( bas1.d_lst + bas2.d_lst ) )
+
+        return dpl_set.dpl_lst
+
+    @staticmethod
+    def get_inv_cls( inv, bas_lst, cls_lst ):
+        '''
+        This method is used by get_cls() and treats a single
+        involution. It does not depend on the other involutions, 
+        so that it can be called in a worker process.
+        
+        Parameters
+        ----------
+        inv : DPLattice
+            An element of "DPLattice.get_inv_lst( rank )".
+            
+        bas_lst : list<DPLattice>
+            The output of "DPLattice.get_bas_lst( rank )".
+            
+        cls_lst : list<DPLattice>
+            The output of "DPLattice.get_cls( rank - 1 )".
+        
+        Returns
+        -------
+        list<DPLattice>
+            A list of pairwise non-equivalent DPLattice objects 
+            whose involution is "inv.M". If "inv.Mtype=='A0'",
+            then "bas_lst" is returned.
+        '''
+        NSTools.p( 'looping through inv_lst:', ( inv.get_rank(), inv.get_marked_Mtype(), inv.Md_lst ) )
+
+        # recover the known classification
+        if inv.Mtype == 'A0':
+            NSTools.p( 'Since Mtype equals A0 we recover the classification from bas_lst.' )
+            return list( bas_lst )
+
+        dpl_set = DPLatticeSet()
+        for unit in DPLattice.get_inv_units( inv, bas_lst, cls_lst ):
+            for dpl in DPLattice.get_unit_cls( unit ):
+                dpl_set.add( dpl )
+
+        return dpl_set.dpl_lst
+
     @staticmethod
     def get_cls( rank=9 ):
         '''
@@ -1023,12 +1379,23 @@ class DPLattice:
                 diagonal matrix with diagonal: (1,-1,...,-1).
                 
             If rank<3 then the empty list is returned. 
+            
+        Note
+        ----
+            After each involution in "DPLattice.get_inv_lst( rank )" 
+            the intermediate result is stored as a checkpoint in
+            the cache, so that an interrupted computation resumes
+            after the last finished involution. 
+            
+            If "NSTools.get_num_procs()>1", then the involutions are
+            treated by a pool of worker processes (see ".get_inv_cls()").
+            The output is the same. 
         '''
         if rank < 3:
             return []
 
         # check cache
-        key = 'get_cls_' + str( rank )
+        key = NSTools.get_key( 'get_cls', rank )
         if key in NSTools.get_tool_dct():
             return NSTools.get_tool_dct()[key]
         NSTools.p( 'rank =', rank )
@@ -1037,107 +1404,188 @@ class DPLattice:
         bas_lst = DPLattice.get_bas_lst( rank )
         inv_lst = DPLattice.get_inv_lst( rank )
 
-        # we loop through all involutions
-        NSTools.p( 'start looping through inv_lst: ', len( inv_lst ), [inv.get_marked_Mtype() for inv in inv_lst] )
-        dpl_lst = []
-        for inv in inv_lst:
-
-            NSTools.p( 'looping through inv_lst:', ( rank, inv.get_marked_Mtype(), inv.Md_lst ) )
+        # resume from checkpoint
+        chk_key = NSTools.get_key( 'get_cls_checkpoint', rank )
+        mtype_lst = [inv.get_marked_Mtype() for inv in inv_lst]
+        num_done, dpl_lst = 0, []
+        if chk_key in NSTools.get_tool_dct():
+            chk_mtype_lst, chk_num_done, chk_dpl_lst = NSTools.get_tool_dct()[chk_key]
+            if chk_mtype_lst == mtype_lst:
+                num_done, dpl_lst = chk_num_done, list( chk_dpl_lst )
+                NSTools.p( 'resuming from checkpoint: ', ( rank, num_done, len( dpl_lst ) ) )
+        dpl_set = DPLatticeSet( dpl_lst )
+
+        # We loop through all involutions and merge the lattices in the 
+        # order of inv_lst, so that the output does not depend on whether
+        # the involutions are treated in parallel by worker processes.
+        NSTools.p( 'start looping through inv_lst: ', len( inv_lst ), mtype_lst )
+        cls_lst = DPLattice.get_cls( rank - 1 )
+        idx_lst = list( range( num_done, len( inv_lst ) ) )
+        pool = None
+        if NSTools.get_num_procs() > 1 and len( idx_lst ) > 1:
+            # the shared data is passed once to each worker and
+            # each task only consists of an index in inv_lst
+            NSTools.p( 'starting worker processes: ', NSTools.get_num_procs() )
+            pool = multiprocessing.Pool( min( NSTools.get_num_procs(), len( idx_lst ) ),
+                                         _init_inv_cls_worker, ( inv_lst, bas_lst, cls_lst ) )
+            res_iter = pool.imap( _get_inv_cls_task, idx_lst )
+        else:
+            res_iter = ( DPLattice.get_inv_cls( inv_lst[idx], bas_lst, cls_lst ) for idx in idx_lst )
+
+        try:
+            for inv_idx, inv_cls_lst in enumerate( res_iter, num_done ):
+
+                inv = inv_lst[inv_idx]
+                if inv.Mtype == 'A0':
+                    inv_cls_lst = bas_lst  # not sent back by the workers
+                for dpl in inv_cls_lst:
+                    if inv.Mtype == 'A0':
+                        dpl_set.append( dpl )
+                    elif dpl_set.add( dpl ):
+                        NSTools.p( '\t appended: ', ( rank, dpl.get_marked_Mtype(), dpl.get_real_type() ) )
+
+                if inv_idx + 1 < len( inv_lst ):
+                    NSTools.get_tool_dct()[chk_key] = ( mtype_lst, inv_idx + 1, dpl_set.dpl_lst )
+                    NSTools.save_tool_dct( flush = True )
+        finally:
+            if pool != None:
+                pool.close()
+                pool.join()
+
+        # store in cache and remove checkpoint
+        #
+        dpl_lst = sorted( dpl_set.dpl_lst )
+        NSTools.get_tool_dct()[key] = dpl_lst
+        NSTools.save_tool_dct( flush = True )
+        if chk_key in NSTools.get_tool_dct():
+            del NSTools.get_tool_dct()[chk_key]
 
-            # recover the known classification
-            if inv.Mtype == 'A0':
-                NSTools.p( 'Since Mtype equals A0 we recover the classification from bas_lst.' )
-                dpl_lst += [bas for bas in bas_lst]
-                continue
+        return dpl_lst
 
-            # partition the roots into two sets
-            s_lst, q_lst = DPLattice.get_part_roots( inv )
-
-            # import classification for rank-1
-            bas1_lst = DPLattice.import_cls( DPLattice.get_cls( rank - 1 ), inv )
-            NSTools.p( 'looping through inv_lst continued after recursive call:', ( rank, inv.get_marked_Mtype(), inv.Md_lst ) )
-
-            # correct partition of roots (bas1_lst always contains inv)
-            if len( bas1_lst ) > 1:
-                e = Div.new( 'e' + str( rank - 1 ), inv.get_rank() )
-                s_lst = [ s for s in s_lst if s * e != 0 ]
-                q_lst = [ q for q in q_lst if q * e != 0 ]
-            NSTools.p( 'bas1_lst =', len( bas1_lst ), [( bas1.Mtype, bas1.type ) for bas1 in bas1_lst] )
-            NSTools.p( 's_lst    =', len( s_lst ), s_lst )
-            NSTools.p( 'q_lst    =', len( q_lst ), q_lst )
-
-            # collect all possible root bases in s_lst and q_lst
-            bas2_lst = []
-            bas3_lst = []
-            visited_type_lst = []
-            eta = ETA( len( bas_lst ), 1 )
-            for bas in bas_lst:
+    @staticmethod
+    def put_cls_units( rank, queue, num_units = 1 ):
+        '''
+        Adds the work units for the classification 
+        of rank "rank" to a work queue. Subsequently,
+        the units can be processed by ".run_cls_worker()" 
+        and reduced by ".reduce_cls()". 
+        
+        Parameters
+        ----------
+        rank : int
+            An integer in [3,...,9].
+        
+        queue : WorkQueue
+            A work queue such as "SQLiteWorkQueue".
+        
+        num_units : int
+            Maximal number of work units for each involution.
+            
+        Returns
+        -------
+        int
+            The number of work units that were added. The units 
+            are added in a single transaction and have keys 
+            of the form ( 'get_cls', rank, inv_idx, unit_idx, unit_num ), 
+            where "unit_num" is the number of units for the 
+            involution with index "inv_idx".
+        '''
+        bas_lst = DPLattice.get_bas_lst( rank )
+        cls_lst = DPLattice.get_cls( rank - 1 )
 
-                # display progress info
-                eta.update( 'get_cls seeking bases in s_lst and q_lst: ', ( rank, inv.get_marked_Mtype(), bas.get_real_type() ) )
+        item_lst = []
+        for inv_idx, inv in enumerate( DPLattice.get_inv_lst( rank ) ):
+            if inv.Mtype == 'A0':
+                continue  # see .reduce_cls()
+            unit_lst = DPLattice.get_inv_units( inv, bas_lst, cls_lst, num_units )
+            for unit_idx, unit in enumerate( unit_lst ):
+                item_lst += [( ( 'get_cls', rank, inv_idx, unit_idx, len( unit_lst ) ), unit )]
+        queue.put_lst( item_lst )
 
-                # each type in bas_lst is treated only once
-                if bas.type in visited_type_lst:
-                    continue
-                visited_type_lst += [bas.type]
+        NSTools.p( 'added work units: ', ( rank, len( item_lst ) ) )
+        return len( item_lst )
 
-                # collect bases of type bas.type in s_lst
-                if DPLattice.get_num_types( inv, bas, bas_lst ) != 0:
-                    bas2_lst += DPLattice.seek_bases( inv, bas.d_lst, s_lst )
+    @staticmethod
+    def run_cls_worker( queue, timeout = None ):
+        '''
+        Processes work units that were added by ".put_cls_units()"
+        until the queue has no unclaimed units left. Several 
+        workers can process the same queue simultaneously.
+        
+        Parameters
+        ----------
+        queue : WorkQueue
+            A work queue such as "SQLiteWorkQueue".
+        
+        timeout : float
+            See "WorkQueue.claim()".
+        
+        Returns
+        -------
+        int
+            The number of work units that were processed.
+        '''
+        num = 0
+        while True:
+            item = queue.claim( timeout )
+            if item == None:
+                return num
+            key, unit = item
+            NSTools.p( 'processing work unit: ', key )
+            queue.complete( key, DPLattice.get_unit_cls( unit ) )
+            num += 1
 
-                # collect bases of type bas.type in q_lst
-                if 2 * len( bas.d_lst ) > rank - 1:
-                    continue  # the rank of a root subsystem is bounded by rank-1
-                tmp_lst = DPLattice.seek_bases( inv, bas.d_lst, q_lst )
-                for tmp in tmp_lst:
-                    tmp.d_lst += [d.mat_mul( inv.M ) for d in tmp.d_lst ]
-                    if is_root_basis( tmp.d_lst ):  # the roots and their involutions might have intersection product 1
-                        tmp.d_lst.sort()
-                        bas3_lst += [tmp]
-
-            # debug info
-            NSTools.p( 'Setting Dynkin types of', len( bas2_lst + bas3_lst ), 'items...please wait...' )
-            eta = ETA( len( bas2_lst + bas3_lst ), len( bas2_lst + bas3_lst ) / 10 )
-            for bas in bas2_lst + bas3_lst:
-                bas.type = get_dynkin_type( bas.d_lst )
-                bas.Mtype = get_dynkin_type( bas.Md_lst )
-                eta.update( bas.get_rank(), bas.get_marked_Mtype(), bas.type )
-            bas1_lst.sort()
-            bas2_lst.sort()
-            bas3_lst.sort()
-            t_lst1 = [bas.type for bas in bas1_lst]
-            t_lst2 = [bas.type for bas in bas2_lst]
-            t_lst3 = [bas.type for bas in bas3_lst]
-            lst1 = sorted( list( set( [( t, t_lst1.count( t ) ) for t in t_lst1] ) ) )
-            lst2 = sorted( list( set( [( t, t_lst2.count( t ) ) for t in t_lst2] ) ) )
-            lst3 = sorted( list( set( [( t, t_lst3.count( t ) ) for t in t_lst3] ) ) )
-            NSTools.p( 'inv      =', inv.get_marked_Mtype(), ', rank =', rank )
-            NSTools.p( 'bas1_lst =', len( bas1_lst ), lst1 )
-            NSTools.p( 'bas2_lst =', len( bas2_lst ), lst2 )
-            NSTools.p( 'bas3_lst =', len( bas3_lst ), lst3 )
-
-            # construct a list of combinations of DPLattice objects in bas1_lst bas2_lst and
-            total = len( bas1_lst ) * len( bas2_lst ) * len( bas3_lst )
-            step = total / 10 if total > 10 else total
-            eta = ETA( total, step )
-            for bas1 in bas1_lst:
-                for bas2 in bas2_lst:
-                    for bas3 in bas3_lst:
-                        eta.update( 'last loop in get_cls: ( bas1.type, bas2.type, bas3.type )=', ( bas1.type, bas2.type, bas3.type ) )
-                        d_lst = bas1.d_lst + bas2.d_lst + bas3.d_lst  # notice that d_lst can be equal to []
-                        if len( d_lst ) > rank - 1:
-                            continue  # the rank of a root subsystem is bounded by rank-1
-                        if is_root_basis( d_lst ):
-                            dpl = DPLattice( d_lst, inv.Md_lst, inv.M )
-                            if dpl not in dpl_lst:
-                                dpl.set_attributes()
-                                dpl_lst += [dpl]
-                                NSTools.p( '\t appended: ', ( rank, dpl.get_marked_Mtype(), dpl.get_real_type() ), ', ( bas1.type, bas2.type, bas3.type ) =', ( bas1.type, bas2.type, bas3.type ) )
+    @staticmethod
+    def reduce_cls( rank, queue ):
+        '''
+        Parameters
+        ----------
+        rank : int
+            An integer in [3,...,9].
+        
+        queue : WorkQueue
+            A work queue such that all work units that were 
+            added by ".put_cls_units( rank, queue )" are processed
+            by ".run_cls_worker()".
+        
+        Returns
+        -------
+        list<DPLattice>
+            The classification of rank "rank", which is equivalent
+            to the output of ".get_cls( rank )". The output is stored
+            in the cache. A ValueError is raised if a work unit is 
+            not completed or missing.
+        '''
+        num_todo = queue.get_num( TODO ) + queue.get_num( CLAIMED )
+        if num_todo != 0:
+            raise ValueError( 'Work units are not completed: ', num_todo )
+
+        key_lst = []
+        res_dct = {}
+        for key, dpl_lst in queue.get_results():
+            if key[:2] == ( 'get_cls', rank ):
+                key_lst += [key]
+                res_dct[key] = dpl_lst
+
+        # the units of each involution are merged in order
+        dpl_set = DPLatticeSet()
+        for inv_idx, inv in enumerate( DPLattice.get_inv_lst( rank ) ):
+            if inv.Mtype == 'A0':
+                for bas in DPLattice.get_bas_lst( rank ):
+                    dpl_set.append( bas )
+                continue
 
-        # store in cache
-        #
-        dpl_lst.sort()
-        NSTools.get_tool_dct()[key] = dpl_lst
+            # check that all units of the involution are present
+            unit_key_lst = sorted( [ key for key in key_lst if key[2] == inv_idx ] )
+            unit_num = unit_key_lst[0][4] if unit_key_lst != [] else 0
+            if unit_num == 0 or [ key[3:] for key in unit_key_lst ] != [ ( i, unit_num ) for i in range( unit_num ) ]:
+                raise ValueError( 'Work units are missing for involution: ', ( rank, inv_idx ) )
+            for key in unit_key_lst:
+                for dpl in res_dct[key]:
+                    dpl_set.add( dpl )
+
+        dpl_lst = sorted( dpl_set.dpl_lst )
+        NSTools.get_tool_dct()[NSTools.get_key( 'get_cls', rank )] = dpl_lst
         NSTools.save_tool_dct()
 
         return dpl_lst
@@ -1151,49 +1599,33 @@ class DPLattice:
             return False
 
         # cardinality of classes agree?
+        # The attributes are computed lazily so that
+        # we only compute what is needed to decide.
         if len( self.d_lst ) != len( other.d_lst ):
             return False
-        self.set_attributes( 0 )
-        other.set_attributes( 0 )
         if len( self.m1_lst ) != len( other.m1_lst ):
             return False
-        self.set_attributes( 1 )
-        other.set_attributes( 1 )
         if len( self.fam_lst ) != len( other.fam_lst ):
             return False
-        self.set_attributes( 2 )
-        other.set_attributes( 2 )
         if len( self.real_d_lst ) != len( other.real_d_lst ):
             return False
-        self.set_attributes( 3 )
-        other.set_attributes( 3 )
         if len( self.real_m1_lst ) != len( other.real_m1_lst ):
             return False
-        self.set_attributes( 4 )
-        other.set_attributes( 4 )
         if len( self.real_fam_lst ) != len( other.real_fam_lst ):
             return False
-        self.set_attributes( 5 )
-        other.set_attributes( 5 )
         if len( self.or_lst ) != len( other.or_lst ):
             return False
-        self.set_attributes( 6 )
-        other.set_attributes( 6 )
         if len( self.sr_lst ) != len( other.sr_lst ):
             return False
 
         # Dynkin type effective (-2)-classes agree?
-        self.set_attributes( 7 )
-        other.set_attributes( 7 )
         if self.type != other.type:
             return False
 
         # Mtype may differ for equivalent DPLattice objects
 
         # check Cremona invariant
-        self.set_attributes( 9 )
-        other.set_attributes( 9 )
-        if not self.G.is_isomorphic( other.G, edge_labels=True ):
+        if self.G_cert != other.G_cert:
             return False
 
         return True
@@ -1213,9 +1645,6 @@ class DPLattice:
         if len( self.Md_lst ) != len( other.Md_lst ):
             return len( self.Md_lst ) < len( other.Md_lst )
 
-        self.set_attributes( 8 )
-        other.set_attributes( 8 )
-
         if self.Mtype != other.Mtype:
             return self.Mtype < other.Mtype
 
@@ -1245,8 +1674,6 @@ class DPLattice:
     # overloading of "str()": human readable string representation of object
     def __str__( self ):
 
-        self.set_attributes()
-
         s = '\n'
         s += 50 * '=' + '\n'
 
@@ -1261,25 +1688,70 @@ class DPLattice:
 
         s += 'Real involution:\n'
         b_lst = [Div( row ) for row in sage_identity_matrix( sage_ZZ, self.get_rank() ).rows() ]
-        for b in b_lst:
-            s += '\t' + str( b ) + arrow + str( b.mat_mul( self.M ) ) + '\n'
+        for b, mb in zip( b_lst, Div.mat_mul_many( b_lst, self.M ) ):
+            s += '\t' + str( b ) + arrow + str( mb ) + '\n'
 
         s += 'Indecomposable (-2)-classes:\n'
-        for d in self.d_lst:
-            s += '\t' + str( d ) + arrow + str( d.mat_mul( self.M ) ) + '\n'
+        for d, md in zip( self.d_lst, Div.mat_mul_many( self.d_lst, self.M ) ):
+            s += '\t' + str( d ) + arrow + str( md ) + '\n'
         s += '\t#real = ' + str( len( self.real_d_lst ) ) + '\n'
 
         s += 'Indecomposable (-1)-classes:\n'
-        for m1 in self.m1_lst:
-            s += '\t' + str( m1 ) + arrow + str( m1.mat_mul( self.M ) ) + '\n'
+        for m1, mm1 in zip( self.m1_lst, Div.mat_mul_many( self.m1_lst, self.M ) ):
+            s += '\t' + str( m1 ) + arrow + str( mm1 ) + '\n'
         s += '\t#real = ' + str( len( self.real_m1_lst ) ) + '\n'
 
         s += 'Classes of conical families:\n'
-        for fam in self.fam_lst:
-            s += '\t' + str( fam ) + arrow + str( fam.mat_mul( self.M ) ) + '\n'
+        for fam, mfam in zip( self.fam_lst, Div.mat_mul_many( self.fam_lst, self.M ) ):
+            s += '\t' + str( fam ) + arrow + str( mfam ) + '\n'
         s += '\t#real = ' + str( len( self.real_fam_lst ) ) + '\n'
 
         s += 50 * '=' + '\n'
 
         return s
 
+
+# The data ( inv_lst, bas_lst, cls_lst ) of "DPLattice.get_cls()"
+# in a worker process (see "_init_inv_cls_worker()").
+_inv_cls_data = None
+
+
+def _init_inv_cls_worker( inv_lst, bas_lst, cls_lst ):
+    '''
+    Initializer of the worker processes of "DPLattice.get_cls()".
+    
+    Parameters
+    ----------
+    inv_lst : list<DPLattice>
+        The output of "DPLattice.get_inv_lst( rank )".
+    
+    bas_lst : list<DPLattice>
+        The output of "DPLattice.get_bas_lst( rank )".
+        
+    cls_lst : list<DPLattice>
+        The output of "DPLattice.get_cls( rank - 1 )".
+    '''
+    global _inv_cls_data
+    _inv_cls_data = ( inv_lst, bas_lst, cls_lst )
+
+
+def _get_inv_cls_task( inv_idx ):
+    '''
+    Worker function for "DPLattice.get_cls()".
+    
+    Parameters
+    ----------
+    inv_idx : int
+        An index in the list "inv_lst" that was passed 
+        to "_init_inv_cls_worker()".
+    
+    Returns
+    -------
+    list<DPLattice>
+        The output of "DPLattice.get_inv_cls( inv, bas_lst, cls_lst )"
+        where "inv=inv_lst[inv_idx]", or the empty list if "inv.Mtype=='A0'".
+    '''
+    inv_lst, bas_lst, cls_lst = _inv_cls_data
+    if inv_lst[inv_idx].Mtype == 'A0':
+        return []  # the output is "bas_lst", which is known to the parent process
+    return DPLattice.get_inv_cls( inv_lst[inv_idx], bas_lst, cls_lst )
@@ -0,0 +1,110 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 17, 2026
+@author: Niels Lubbes
+'''
+
+
+class DPLatticeSet( object ):
+    '''
+    A container of pairwise inequivalent DPLattice objects,
+    where equivalence is defined by "DPLattice.__eq__()".
+
+    The DPLattice objects are stored in buckets indexed by
+    "DPLattice.get_certificate()". Two DPLattice objects are 
+    equivalent if and only if they have the same certificate and
+    thus a membership test is a dictionary lookup, instead of
+    a comparison with all objects as for "dpl in dpl_lst".
+
+    Attributes
+    ----------
+    dpl_lst : list<DPLattice>
+        The DPLattice objects in the order in which they were added.
+    '''
+
+    def __init__( self, dpl_lst = [] ):
+        '''
+        Parameters
+        ----------
+        dpl_lst : list<DPLattice>
+            A list of pairwise inequivalent DPLattice objects.
+        '''
+        self.dpl_lst = []
+        self.__bucket_dct = {}  # certificate ---> list<DPLattice>
+        for dpl in dpl_lst:
+            self.append( dpl )
+
+
+    def find( self, dpl ):
+        '''
+        Parameters
+        ----------
+        dpl : DPLattice
+
+        Returns
+        -------
+        DPLattice
+            A DPLattice object in this container that
+            is equivalent to "dpl" or None if no such
+            object exists.
+        '''
+        bucket = self.__bucket_dct.get( dpl.get_certificate(), [] )
+        if bucket == []:
+            return None
+        return bucket[0]
+
+
+    def append( self, dpl ):
+        '''
+        Adds "dpl" without checking whether an
+        equivalent object is already contained.
+
+        Parameters
+        ----------
+        dpl : DPLattice
+        '''
+        self.__bucket_dct.setdefault( dpl.get_certificate(), [] ).append( dpl )
+        self.dpl_lst += [dpl]
+
+
+    def add( self, dpl ):
+        '''
+        Parameters
+        ----------
+        dpl : DPLattice
+
+        Returns
+        -------
+        bool
+            Adds "dpl" and returns True if no equivalent
+            object is contained. Otherwise returns False.
+        '''
+        if self.find( dpl ) is not None:
+            return False
+        self.append( dpl )
+        return True
+
+
+    def remove( self, dpl ):
+        '''
+        Removes the object "dpl" (with respect to identity).
+
+        Parameters
+        ----------
+        dpl : DPLattice
+        '''
+        bucket = self.__bucket_dct[dpl.get_certificate()]
+        bucket[:] = [ other for other in bucket if other is not dpl ]
+        self.dpl_lst = [ other for other in self.dpl_lst if other is not dpl ]
+
+
+    def __contains__( self, dpl ):
+        return self.find( dpl ) is not None
+
+
+    def __len__( self ):
+        return len( self.dpl_lst )
+
+
+    def __iter__( self ):
+        return iter( self.dpl_lst )
@@ -3,13 +3,23 @@ Use of this source code is governed by a MIT-style license that can be found in
 Created on Feb 7, 2017
 @author: Niels Lubbes
 '''
-from ns_lattice.sage_interface import sage_load
-from ns_lattice.sage_interface import sage_save
+from ns_lattice.sage_interface import sage_ZZ
+from ns_lattice.sage_interface import sage_matrix
 
+from ns_lattice.class_div import Div
+
+from ns_lattice.class_tool_store import ToolStore
+
+import atexit
+import contextlib
+import hashlib
 import inspect
+import multiprocessing
+import signal
 import time
 import sys
 import os
+import re
 
 
 class NSTools():
@@ -18,16 +28,43 @@ class NSTools():
     <http://stackoverflow.com/questions/68645/static-class-variables-in-python>    
     '''
 
-    # Private dictionary object for caching result
-    # used by ".get_tool_dct()" and ".save_tool_dct()".
+    # Private dictionary of persistent "ToolStore" objects
+    # for caching results used by ".get_tool_dct()" and
+    # ".save_tool_dct()":
+    #
+    #     fname ---> ToolStore
+    #
     # If "enable_tool_dct" is false then caching in
     # disabled. This is useful for example in test
     # methods. However, it should be noted that it
     # could take a long time to compute the data.
     #
-    __tool_dct = None
+    __store_dct = {}
     __enable_tool_dct = True
 
+    # Private variables for the flush policy of the "ToolStore"
+    # objects, which keep assigned values in memory until they
+    # are flushed (see ".save_tool_dct()"). If "__defer_cnt>0", 
+    # then we are inside a ".deferred_save()" block.
+    #
+    __flush_num = 1
+    __flush_secs = None
+    __defer_cnt = 0
+    __exit_pid = None
+
+    # Private variable for the memory policy of the "ToolStore"
+    # objects (see ".set_mem_policy()"). It is a tuple of the 
+    # form "( max_bytes, quota_dct, pinned_lst )".
+    #
+    __mem_policy = ( None, None, None )
+
+    # private variable for the number of processes that
+    # are used by methods that support parallel computation.
+    # If "__num_procs" equals 1, then no worker processes
+    # are started.
+    #
+    __num_procs = 1
+
     # private variable for timer
     #
     __start_time = None
@@ -127,6 +164,39 @@ class NSTools():
         NSTools.__enable_tool_dct = enable_tool_dct
 
 
+    @staticmethod
+    def set_num_procs( num_procs ):
+        '''
+        Parameters
+        ----------
+        num_procs : int
+            The number of processes used by methods that support
+            parallel computation such as "get_divs()".
+            If None, then the number of CPU's is used.
+            If 1, then all computations are serial.
+        '''
+        if num_procs == None:
+            num_procs = multiprocessing.cpu_count()
+        if num_procs < 1:
+            raise ValueError( 'Expecting a positive number of processes: ', num_procs )
+
+        NSTools.filter_unset()
+        NSTools.p( 'Number of processes: ', num_procs )
+        NSTools.filter_reset()
+        NSTools.__num_procs = num_procs
+
+
+    @staticmethod
+    def get_num_procs():
+        '''
+        Returns
+        -------
+        int
+            The number of processes as set by ".set_num_procs()".
+        '''
+        return NSTools.__num_procs
+
+
     @staticmethod
     def get_tool_dct( fname = 'ns_tools' ):
         '''
@@ -137,55 +207,411 @@ class NSTools():
         
         Returns
         -------
-        dct
-            Sets static private variable "__tool_dct" 
-            in memory from file "<local path>/<fname>.sobj"
-            if called for the first time.
-              
-            Returns ".__tool_dct" if ".__enable_tool_dct==True" 
-            and "{}" otherwise.
+        ToolStore
+            Returns a dictionary-like "ToolStore" object that 
+            is backed by the database "<local path>/<fname>.db" 
+            if ".__enable_tool_dct==True" and "{}" otherwise. 
+            The database is opened if called for the first time
+            with "fname", but values are only loaded from the 
+            database when they are accessed. If the database
+            does not exist, then the content of a legacy file 
+            "<local path>/<fname>.sobj" is migrated, where the 
+            keys are translated by ".convert_legacy_key()".
         '''
         if not NSTools.__enable_tool_dct:
             return {}
 
         path = os.path.dirname( os.path.abspath( __file__ ) ) + '/'
         file_name = path + fname
-        if NSTools.__tool_dct == None:
+        if fname not in NSTools.__store_dct:
 
             try:
 
-                NSTools.p( 'Loading from:', file_name )
-                NSTools.__tool_dct = sage_load( file_name )
+                NSTools.p( 'Opening:', file_name )
+                NSTools.__store_dct[fname] = ToolStore( file_name, True, NSTools.convert_legacy_key )
+
+                if NSTools.__store_dct[fname].corrupt_name != None:
+                    NSTools.filter_unset()
+                    NSTools.p( 'Corrupted cache was moved to:', NSTools.__store_dct[fname].corrupt_name )
+                    NSTools.filter_reset()
 
             except Exception as e:
 
                 NSTools.filter_unset()
-                NSTools.p( 'Cannot load ".__tool_dct": ', e )
+                NSTools.p( 'Cannot open ".__store_dct[fname]": ', e )
                 NSTools.filter_reset()
-                NSTools.__tool_dct = {}
+                NSTools.__store_dct[fname] = ToolStore( None, True )
+
+            NSTools.__store_dct[fname].set_mem_policy( *NSTools.__mem_policy )
+            NSTools.__register_exit_flush()
+
+        return NSTools.__store_dct[fname]
+
+
+    @staticmethod
+    def get_key( name, *arg_lst ):
+        '''
+        Parameters
+        ----------
+        name : str
+            Name of the function whose output is cached.
+
+        *arg_lst
+            Variable length argument list of the function.
+
+        Returns
+        -------
+        tuple
+            A key for ".get_tool_dct()" of the form
+                ( name, arg1, arg2, ... ),
+            where each argument is replaced by its
+            compact encoding (see ".get_key_arg()").
+            For example:
+                NSTools.get_key( 'get_cls', 9 ) == ( 'get_cls', 9 )
+        '''
+        return ( name, ) + tuple( [ NSTools.get_key_arg( arg ) for arg in arg_lst ] )
 
-        return NSTools.__tool_dct
+
+    @staticmethod
+    def get_key_arg( arg ):
+        '''
+        Parameters
+        ----------
+        arg : object
+            Either None, a bool, an integer, a string, a Div,
+            a DPLattice, a sage matrix or a list or tuple of such
+            objects.
+
+        Returns
+        -------
+        object
+            A hashable encoding of "arg" that only consists of nested
+            tuples of integers, strings, bools and None, so that it can
+            be stored by "ToolStore". Objects with a method
+            ".get_cache_key()" such as Div and DPLattice are encoded
+            by this method. A matrix is encoded by its dimensions
+            together with a digest of its entries.
+        '''
+        if arg is None or isinstance( arg, ( bool, str ) ):
+            return arg
+        if hasattr( arg, 'get_cache_key' ):
+            return arg.get_cache_key()
+        if isinstance( arg, ( list, tuple ) ):
+            return tuple( [ NSTools.get_key_arg( a ) for a in arg ] )
+        if hasattr( arg, 'nrows' ):
+            e_lst = [ int( e ) for e in arg.list() ]
+            digest = hashlib.sha1( str( e_lst ).encode( 'utf-8' ) ).hexdigest()
+            return ( arg.nrows(), arg.ncols(), digest )
+        return int( arg )
+
+
+    @staticmethod
+    def convert_legacy_key( key, val ):
+        '''
+        Translates a key of a legacy ".sobj" cache, which was a string
+        such as 'get_cls_9', into a key as returned by ".get_key()".
+        
+        Parameters
+        ----------
+        key : object
+            A key of a legacy cache.
+            
+        val : object
+            The value of "key" in the legacy cache.
+        
+        Returns
+        -------
+        tuple
+            A key as returned by ".get_key()" or None if "key" cannot 
+            be translated. Keys that are not strings are returned as is.
+            For example:
+                'get_cls_9'                    ---> ( 'get_cls', 9 )
+                'get_divs_(e0-e1, 1, -1, True)' ---> ( 'get_divs', (1,-1,0,...), 1, -1, True )
+            The rank of the divisor class of a "get_divs" key is 
+            obtained from the divisor classes in "val".
+        '''
+        if not isinstance( key, str ):
+            return key
+
+        m = re.match( r'^(get_bas_lst|get_inv_lst|get_cls_slow)__(\d+)$', key )
+        if m == None:
+            m = re.match( r'^(get_cls|get_dynkin_type)_(\d+)$', key )
+        if m != None:
+            return NSTools.get_key( m.group( 1 ), int( m.group( 2 ) ) )
+
+        m = re.match( r'^get_divs_\((.+), (-?\d+), (-?\d+), (True|False)\)$', key )
+        if m != None:
+            if not isinstance( val, list ) or val == []:
+                return None  # the rank is unknown
+            d = Div.new( m.group( 1 ), val[0].rank() )
+            return NSTools.get_key( 'get_divs', d, int( m.group( 2 ) ), int( m.group( 3 ) ), m.group( 4 ) == 'True' )
+
+        m = re.match( r'^get_bases_lst__\(\[([^\]]*)\], ((?:\[[-\d ]+\]\n)*\[[-\d ]+\]), \[([^\]]*)\], \[([^\]]*)\], (True|False)\)__\d+$', key )
+        if m != None:
+            M = sage_matrix( sage_ZZ, [ [ int( e ) for e in row.strip( '[]' ).split() ] for row in m.group( 2 ).split( '\n' ) ] )
+            a_lst, d_lst, m1_lst = [ [ Div.new( lbl, M.ncols() ) for lbl in m.group( i ).split( ', ' ) if lbl != '' ] for i in [1, 3, 4] ]
+            return NSTools.get_key( 'get_bases_lst', a_lst, M, d_lst, m1_lst, m.group( 5 ) == 'True' )
+
+        return None
 
 
     @staticmethod
-    def save_tool_dct( fname = 'ns_tools' ):
+    def save_tool_dct( fname = 'ns_tools', key = None, flush = False ):
         '''
-        Saves ".__tool_dct" to  "fname" if ".enable_tool_dct==True" 
-        otherwise do nothing.
+        Writes the values that were assigned to ".get_tool_dct( fname )" 
+        to disk according to the flush policy if ".enable_tool_dct==True" 
+        otherwise do nothing. See ".set_flush_policy()".  
         
         Parameters
         ----------
         fname : str
             Name of file without extension.
+            
+        key : object
+            If not None, then the value of "key" is marked to 
+            be stored again. This is needed if this value was 
+            modified in place.
+            
+        flush : bool
+            If True, then all values are written to disk regardless 
+            of the flush policy and of ".deferred_save()". 
+            This is used for checkpoints.
         '''
         if not NSTools.__enable_tool_dct:
             return
 
+        store = NSTools.get_tool_dct( fname )
+        if key != None:
+            store.sync( key )
+
+        if flush:
+            store.flush()
+            return
+
+        if NSTools.__defer_cnt > 0:
+            return
+
+        num = NSTools.__flush_num
+        secs = NSTools.__flush_secs
+        if ( num != None and store.get_num_dirty() >= num ) or \
+           ( secs != None and time.time() - store.flush_time >= secs ):
+            NSTools.p( 'Flushing:', fname, store.get_num_dirty() )
+            store.flush()
+
+
+    @staticmethod
+    def get_stats( fname = 'ns_tools' ):
+        '''
+        Parameters
+        ----------
+        fname : str
+            Name of file without extension.
+
+        Returns
+        -------
+        dict
+            A dictionary with for each namespace of ".get_tool_dct( fname )"
+            the number of hits and misses, the number of keys and the size
+            in bytes on disk and in memory (see "ToolStore.get_stats()").
+            The namespace of a key is the function name "name" in
+            ".get_key( name, ... )".
+            Returns "{}" if caching is disabled.
+        '''
+        if not NSTools.__enable_tool_dct:
+            return {}
+        return NSTools.get_tool_dct( fname ).get_stats()
+
+
+    @staticmethod
+    def print_stats( fname = 'ns_tools' ):
+        '''
+        Prints the output of ".get_stats( fname )" as a table.
+
+        Parameters
+        ----------
+        fname : str
+            Name of file without extension.
+        '''
+        row_format = '{:<24}{:>10}{:>10}{:>10}{:>14}{:>14}'
+        s = row_format.format( 'namespace', 'hits', 'misses', '#keys', 'bytes', 'memory' ) + '\n'
+        stat_dct = NSTools.get_stats( fname )
+        for ns in sorted( stat_dct, key = str ):
+            stat = stat_dct[ns]
+            s += row_format.format( str( ns ), stat['hits'], stat['misses'], stat['num'], stat['bytes'], stat['mem'] ) + '\n'
+
+        NSTools.filter_unset()
+        NSTools.p( 'Cache statistics for ' + fname + ':\n' + s )
+        NSTools.filter_reset()
+
+
+    @staticmethod
+    def invalidate( ns, fname = 'ns_tools' ):
+        '''
+        Removes all cached values of a namespace.
+        For example, "NSTools.invalidate( 'get_webs' )".
+
+        Parameters
+        ----------
+        ns : str
+            A namespace, namely the function name "name" in
+            ".get_key( name, ... )".
+
+        fname : str
+            Name of file without extension.
+
+        Returns
+        -------
+        int
+            The number of removed keys.
+        '''
+        if not NSTools.__enable_tool_dct:
+            return 0
+        return NSTools.get_tool_dct( fname ).invalidate( ns )
+
+
+    @staticmethod
+    def export_tool_dct( export_fname, ns_lst, fname = 'ns_tools' ):
+        '''
+        Exports the cached values of the given namespaces to a new
+        database "<local path>/<export_fname>.db". For example, the
+        following creates a cache that only contains the classifications:
+
+            NSTools.export_tool_dct( 'ns_tools_cls', [ 'get_cls', 'get_divs' ] )
+
+        The new database can be used by renaming it to "ns_tools.db".
+
+        Parameters
+        ----------
+        export_fname : str
+            Name of the new file without extension.
+
+        ns_lst : list<str>
+            A list of namespaces.
+
+        fname : str
+            Name of file without extension.
+
+        Returns
+        -------
+        int
+            The number of exported keys.
+        '''
+        if not NSTools.__enable_tool_dct:
+            return 0
         path = os.path.dirname( os.path.abspath( __file__ ) ) + '/'
-        file_name = path + fname
+        return NSTools.get_tool_dct( fname ).export( path + export_fname, ns_lst )
+
+
+    @staticmethod
+    def flush_tool_dct():
+        '''
+        Writes all values that were assigned to the dictionaries 
+        returned by ".get_tool_dct()" to disk. This method is
+        called at exit of the Python interpreter and 
+        when the process is terminated by SIGTERM.
+        '''
+        for fname in NSTools.__store_dct:
+            NSTools.__store_dct[fname].flush()
+
+
+    @staticmethod
+    def set_flush_policy( num_inserts = 1, num_secs = None ):
+        '''
+        Values that are assigned to the dictionaries returned by 
+        ".get_tool_dct()" are kept in memory until they are flushed 
+        to disk by ".save_tool_dct()". The default policy flushes 
+        at each call of ".save_tool_dct()".
+        
+        Parameters
+        ----------
+        num_inserts : int
+            If not None, then ".save_tool_dct()" flushes if 
+            at least "num_inserts" values are not yet written.
+            
+        num_secs : float
+            If not None, then ".save_tool_dct()" flushes if at 
+            least "num_secs" seconds passed since the previous flush.
+        '''
+        NSTools.__flush_num = num_inserts
+        NSTools.__flush_secs = num_secs
+
+
+    @staticmethod
+    def set_mem_policy( max_bytes = None, quota_dct = None, pinned_lst = None ):
+        '''
+        Bounds the memory used by the values that are kept in memory by 
+        the dictionaries returned by ".get_tool_dct()". Least recently used
+        values are evicted and reloaded from disk when accessed again.
+        The namespace of a key is the function name "name" in 
+        ".get_key( name, ... )". By default the memory is unbounded.
+        For example:
+        
+            NSTools.set_mem_policy( 2 * 10**9, { 'get_bases_lst': 10**8 }, [ 'get_divs', 'get_cls' ] )
+        
+        Parameters
+        ----------
+        max_bytes : int
+            Maximal total size in bytes of the values in memory
+            for each file name. If None, then the size is unbounded.
+            
+        quota_dct : dict
+            A dictionary "namespace ---> int" with the maximal size 
+            in bytes of the values in memory for the given namespaces.
+
+        pinned_lst : list<str>
+            A list of namespaces whose values are never evicted.
+            This includes namespaces whose values are modified in place
+            and stored with ".save_tool_dct( key = ... )".
+        '''
+        NSTools.__mem_policy = ( max_bytes, quota_dct, pinned_lst )
+        for fname in NSTools.__store_dct:
+            NSTools.__store_dct[fname].set_mem_policy( *NSTools.__mem_policy )
+
+
+    @staticmethod
+    @contextlib.contextmanager
+    def deferred_save():
+        '''
+        Context manager such that ".save_tool_dct()" does not write to 
+        disk inside the block. All values are flushed at the end of the
+        outermost block. For example:
+        
+            with NSTools.deferred_save():
+                DPLattice.get_cls( 9 )
+        '''
+        NSTools.__defer_cnt += 1
+        try:
+            yield
+        finally:
+            NSTools.__defer_cnt -= 1
+            if NSTools.__defer_cnt == 0:
+                NSTools.flush_tool_dct()
+
+
+    @staticmethod
+    def __register_exit_flush():
+        '''
+        Registers ".flush_tool_dct()" at exit of the Python interpreter
+        and as handler of SIGTERM if no other handler was installed.
+        Forked child processes inherit the handler, but do not flush.
+        '''
+        if NSTools.__exit_pid != None:
+            return
+        NSTools.__exit_pid = os.getpid()
+
+        atexit.register( NSTools.flush_tool_dct )
+
+        def handler( signum, frame ):
+            if os.getpid() == NSTools.__exit_pid:
+                NSTools.flush_tool_dct()
+            signal.signal( signum, signal.SIG_DFL )
+            os.kill( os.getpid(), signum )
 
-        NSTools.p( 'Saving to:', file_name )
-        sage_save( NSTools.__tool_dct, file_name )
+        try:
+            if signal.getsignal( signal.SIGTERM ) == signal.SIG_DFL:
+                signal.signal( signal.SIGTERM, handler )
+        except ValueError:
+            pass  # not called from the main thread
 
 
     @staticmethod
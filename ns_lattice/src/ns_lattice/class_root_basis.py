@@ -0,0 +1,123 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 17, 2026
+@author: Niels Lubbes
+'''
+import math
+
+
+class RootBasisValidator( object ):
+    '''
+    A root basis that can be extended and shrunk one root at a time,
+    for backtracking searches over root bases.
+
+    The validator keeps the current list of roots together with an
+    integral row echelon form of their coefficient vectors. Adding
+    a root requires its intersection products with the current roots
+    and its reduction against the echelon form, instead of a recomputation
+    of all intersection products and of the rank as in "is_root_basis()".
+
+    Attributes
+    ----------
+    d_lst : list<Div>
+        The current roots, such that "is_root_basis( d_lst )==True".
+    '''
+
+    def __init__( self ):
+        self.d_lst = []
+        self.__ech_lst = []  # list of pairs ( pivot, row ) in echelon form
+
+
+    def push( self, d ):
+        '''
+        Parameters
+        ----------
+        d : Div
+            A "Div" object. We assume that d*k==0, where k is
+            the anticanonical class.
+
+        Returns
+        -------
+        bool
+            If d*d==-2 and "self.d_lst+[d]" is a root basis, then
+            "d" is appended to "self.d_lst" and True is returned.
+            Otherwise the validator is unchanged and False
+            is returned.
+        '''
+        # check self intersection and pairwise intersection products
+        if d * d != -2:
+            return False
+        for b in self.d_lst:
+            if b * d not in [0, 1]:
+                return False
+
+        # reduce d against the rows in echelon form, where the
+        # i-th row has zeros at the pivots of the previous rows
+        v = list( d.e_tup )
+        for pivot, row in self.__ech_lst:
+            if v[pivot] != 0:
+                a, b = row[pivot], v[pivot]
+                v = [ a * vi - b * ri for vi, ri in zip( v, row ) ]
+
+        # check linear independence
+        nz_lst = [ i for i in range( len( v ) ) if v[i] != 0 ]
+        if nz_lst == []:
+            return False
+
+        # keep the entries small
+        g = 0
+        for i in nz_lst:
+            g = math.gcd( g, int( v[i] ) )
+        v = [ vi // g for vi in v ]
+
+        self.__ech_lst += [( nz_lst[0], v )]
+        self.d_lst += [d]
+        return True
+
+
+    def pop( self ):
+        '''
+        Returns
+        -------
+        Div
+            Removes the last root from "self.d_lst" and returns it.
+        '''
+        self.__ech_lst.pop()
+        return self.d_lst.pop()
+
+
+    def push_lst( self, d_lst ):
+        '''
+        Parameters
+        ----------
+        d_lst : list<Div>
+            A list of roots.
+
+        Returns
+        -------
+        bool
+            If "self.d_lst+d_lst" is a root basis, then the roots
+            in "d_lst" are appended to "self.d_lst" and True is
+            returned. Otherwise the validator is unchanged and
+            False is returned.
+        '''
+        for i, d in enumerate( d_lst ):
+            if not self.push( d ):
+                self.pop_lst( i )
+                return False
+        return True
+
+
+    def pop_lst( self, num ):
+        '''
+        Parameters
+        ----------
+        num : int
+            The number of roots that are removed from "self.d_lst".
+        '''
+        for i in range( num ):
+            self.pop()
+
+
+    def __len__( self ):
+        return len( self.d_lst )
@@ -0,0 +1,608 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 17, 2026
+@author: Niels Lubbes
+'''
+from ns_lattice.sage_interface import sage_dumps
+from ns_lattice.sage_interface import sage_loads
+from ns_lattice.sage_interface import sage_load
+
+import ast
+import collections
+import os
+import sqlite3
+import time
+
+
+class ToolStore( object ):
+    '''
+    A persistent dictionary that is used by "NSTools.get_tool_dct()".
+
+    Each key-value pair is stored as a separate row in an SQLite
+    database. Values are only unpickled when they are accessed and
+    inserting a value only pickles this value. Values that have been
+    accessed are kept in memory so that repeated access returns
+    the same object.
+
+    Keys should be objects such that "ast.literal_eval( repr( key ) )==key",
+    for example strings or tuples of strings and integers.
+
+    If "write_behind==True", then assigned values are only marked
+    as dirty and they are pickled and written to the database in
+    a single transaction when ".flush()" is called.
+
+    The values in memory form a cache tier with least recently used
+    (LRU) eviction (see ".set_mem_policy()"). The size of a value is
+    estimated by the length of its pickle. Evicted values are reloaded
+    from the database when they are accessed again. Values that are
+    not yet written are never evicted. The namespace of a key is its
+    first entry if the key is a tuple and None otherwise.
+    For each namespace the number of hits and misses of
+    "key in store" is counted (see ".get_stats()").
+
+    Attributes
+    ----------
+    file_name : str
+        Name of the database file without extension.
+        If None, then the database is kept in memory.
+
+    db_name : str
+        Name of the database file "<file_name>.db"
+        or ':memory:' if "file_name==None".
+
+    write_behind : bool
+        If True, then values are written by ".flush()".
+
+    flush_time : float
+        The time of the previous call of ".flush()" or
+        of the construction of this object.
+
+    corrupt_name : str
+        If the database file was corrupted, then it is 
+        renamed to "corrupt_name" and an empty database 
+        is created. Otherwise None.
+
+    convert_key : function
+        A function "( key, val ) ---> new_key" that translates
+        keys of a legacy ".sobj" file, or None (see ".__migrate()").
+
+    max_bytes : int
+        Maximal total size of the values in memory, 
+        or None if the size is unbounded.
+
+    quota_dct : dict
+        A dictionary "namespace ---> int" with the maximal total
+        size of the values in memory for the given namespaces.
+
+    pinned_set : set
+        A set of namespaces whose values are never evicted.
+    '''
+
+    def __init__( self, file_name = None, write_behind = False, convert_key = None ):
+        '''
+        Parameters
+        ----------
+        file_name : str
+            Name of the database file without extension.
+            If the database does not exist and a legacy
+            file "<file_name>.sobj" exists, then its dictionary
+            is migrated to the new database.
+            If None, then the database is kept in memory.
+
+        write_behind : bool
+            If True, then values are written by ".flush()".
+
+        convert_key : function
+            If not None, then the keys of a migrated legacy
+            dictionary are translated by "convert_key( key, val )".
+            Entries for which this function returns None
+            are not migrated.
+        '''
+        self.file_name = file_name
+        self.convert_key = convert_key
+        self.db_name = ':memory:' if file_name == None else file_name + '.db'
+        self.write_behind = write_behind
+        self.flush_time = time.time()
+        self.corrupt_name = None
+        self.max_bytes = None
+        self.quota_dct = {}
+        self.pinned_set = set()
+
+        self.__val_dct = collections.OrderedDict()  # values in memory in LRU order
+        self.__size_dct = {}  # key ---> size of value in memory
+        self.__ns_size_dct = {}  # namespace ---> total size of values in memory
+        self.__dirty_set = set()  # keys of values that are not yet written
+        self.__stat_dct = {}  # namespace ---> [#hits, #misses]
+        self.__con = None
+        self.__pid = None
+        self.get_con()
+
+
+    def get_con( self ):
+        '''
+        Returns
+        -------
+        sqlite3.Connection
+            A connection to the database. A new connection
+            is opened if the current process differs from the
+            process that opened the previous connection, since
+            connections should not be shared between processes.
+        '''
+        if self.__con != None and self.__pid == os.getpid():
+            return self.__con
+
+        if self.file_name != None:
+            if not os.path.exists( self.db_name ) and os.path.exists( self.file_name + '.sobj' ):
+                self.__migrate( self.file_name + '.sobj' )
+
+        try:
+            self.__con = ToolStore.__connect( self.db_name )
+        except sqlite3.DatabaseError:
+            # move the corrupted database aside and start with an empty one
+            self.corrupt_name = self.db_name + '.corrupt-' + str( int( time.time() ) )
+            os.replace( self.db_name, self.corrupt_name )
+            self.__con = ToolStore.__connect( self.db_name )
+
+        self.__pid = os.getpid()
+        return self.__con
+
+
+    @staticmethod
+    def __connect( db_name ):
+        '''
+        Parameters
+        ----------
+        db_name : str
+            Name of a database file or ':memory:'.
+
+        Returns
+        -------
+        sqlite3.Connection
+            A connection to a database that contains the table "tool".
+            Raises "sqlite3.DatabaseError" if the file is corrupted.
+        '''
+        con = sqlite3.connect( db_name )
+        try:
+            con.execute( 'CREATE TABLE IF NOT EXISTS tool ( key TEXT PRIMARY KEY, val BLOB )' )
+            con.commit()
+        except sqlite3.DatabaseError:
+            con.close()
+            raise
+        return con
+
+
+    def __migrate( self, sobj_name ):
+        '''
+        Creates the database from a dictionary stored in a legacy
+        ".sobj" file, where the keys are translated by
+        "self.convert_key". The database is first written to a
+        temporary file, which is renamed afterwards, so that an
+        interrupted migration does not leave an incomplete
+        database behind.
+
+        Parameters
+        ----------
+        sobj_name : str
+            Name of a file that was created by "sage_save()".
+        '''
+        dct = sage_load( sobj_name )
+
+        tmp_name = self.db_name + '.tmp'
+        if os.path.exists( tmp_name ):
+            os.remove( tmp_name )
+
+        row_lst = []
+        for key in dct:
+            new_key = key if self.convert_key == None else self.convert_key( key, dct[key] )
+            if new_key != None:
+                row_lst += [ ( repr( new_key ), sqlite3.Binary( sage_dumps( dct[key] ) ) ) ]
+
+        con = ToolStore.__connect( tmp_name )
+        con.executemany( 'INSERT OR REPLACE INTO tool VALUES ( ?, ? )', row_lst )
+        con.commit()
+        con.close()
+
+        os.replace( tmp_name, self.db_name )
+
+
+    def set_mem_policy( self, max_bytes = None, quota_dct = None, pinned_lst = None ):
+        '''
+        Sets the bounds for the values that are kept in memory
+        and evicts values if needed.
+
+        Parameters
+        ----------
+        max_bytes : int
+            Maximal total size of the values in memory.
+            If None, then the total size is unbounded.
+
+        quota_dct : dict
+            A dictionary "namespace ---> int" with the maximal total
+            size of the values in memory for the given namespaces.
+            For example "{ 'get_bases_lst': 10**8 }".
+
+        pinned_lst : list
+            A list of namespaces whose values are never evicted.
+            For example "[ 'get_divs', 'get_cls' ]". Values that are
+            modified in place and stored by ".sync( key )" should
+            be pinned, since otherwise modifications can be lost
+            after eviction.
+        '''
+        self.max_bytes = max_bytes
+        self.quota_dct = dict( quota_dct ) if quota_dct != None else {}
+        self.pinned_set = set( pinned_lst ) if pinned_lst != None else set()
+        self.__evict()
+
+
+    def get_mem_size( self, ns = False ):
+        '''
+        Parameters
+        ----------
+        ns : object
+            A namespace. If False, then all namespaces are considered.
+
+        Returns
+        -------
+        int
+            The total size of the values in memory of namespace "ns".
+            Values that are not yet written are not counted.
+        '''
+        if ns is False:
+            return sum( self.__ns_size_dct.values() )
+        return self.__ns_size_dct.get( ns, 0 )
+
+
+    @staticmethod
+    def get_namespace( key ):
+        '''
+        Parameters
+        ----------
+        key : object
+            A key of a ToolStore.
+
+        Returns
+        -------
+        object
+            The first entry of "key" if "key" is a non-empty tuple
+            and None otherwise. For example, the namespace of
+            "( 'get_divs', ( 3, -1, -1, -1 ), 1, -1, True )" is 'get_divs'.
+        '''
+        if isinstance( key, tuple ) and len( key ) > 0:
+            return key[0]
+        return None
+
+
+    def __remember( self, key, val, size ):
+        '''
+        Stores "val" in memory as most recently used value
+        and evicts values if needed.
+
+        Parameters
+        ----------
+        key : object
+
+        val : object
+
+        size : int
+            The size of "val" or None if "val" is not yet written.
+        '''
+        self.__forget( key )
+        self.__val_dct[key] = val
+        if size != None:
+            ns = ToolStore.get_namespace( key )
+            self.__size_dct[key] = size
+            self.__ns_size_dct[ns] = self.__ns_size_dct.get( ns, 0 ) + size
+            self.__evict( ns )
+
+
+    def __forget( self, key ):
+        '''
+        Removes the value of "key" from memory if present.
+        '''
+        self.__val_dct.pop( key, None )
+        size = self.__size_dct.pop( key, None )
+        if size != None:
+            ns = ToolStore.get_namespace( key )
+            self.__ns_size_dct[ns] -= size
+
+
+    def __evict( self, ns = False ):
+        '''
+        Evicts least recently used values until the values 
+        in memory are within the bounds of the memory policy.
+
+        Parameters
+        ----------
+        ns : object
+            If not False, then only the quota of namespace
+            "ns" and the total bound are considered.
+        '''
+        ns_lst = [ns] if ns is not False else list( self.__ns_size_dct.keys() )
+        for ns in ns_lst:
+            quota = self.quota_dct.get( ns, None )
+            if quota != None and self.get_mem_size( ns ) > quota:
+                self.__evict_lru( ns, self.get_mem_size( ns ) - quota )
+
+        if self.max_bytes != None and self.get_mem_size() > self.max_bytes:
+            self.__evict_lru( False, self.get_mem_size() - self.max_bytes )
+
+
+    def __evict_lru( self, ns, num_bytes ):
+        '''
+        Evicts at least "num_bytes" bytes of least recently used 
+        values of namespace "ns" (all namespaces if "ns==False")
+        if possible. Values that are not yet written and values
+        in pinned namespaces are not evicted.
+        '''
+        key_lst = []
+        for key in self.__val_dct:
+            if num_bytes <= 0:
+                break
+            if key not in self.__size_dct:
+                continue  # not yet written
+            key_ns = ToolStore.get_namespace( key )
+            if key_ns in self.pinned_set:
+                continue
+            if ns is not False and key_ns != ns:
+                continue
+            key_lst += [key]
+            num_bytes -= self.__size_dct[key]
+
+        for key in key_lst:
+            self.__forget( key )
+
+
+    def get_stats( self ):
+        '''
+        Returns
+        -------
+        dict
+            A dictionary with for each namespace a dictionary with keys:
+                'hits'   : number of times that "key in self" was True,
+                'misses' : number of times that "key in self" was False,
+                'num'    : number of keys,
+                'bytes'  : total size in bytes of the pickled values in
+                           the database, and
+                'mem'    : total size in bytes of the values in memory.
+            Values that are not yet written are only counted by 'num'.
+            The values are not unpickled.
+        '''
+        stat_dct = {}
+        def get_stat( ns ):
+            if ns not in stat_dct:
+                hits, misses = self.__stat_dct.get( ns, [0, 0] )
+                stat_dct[ns] = { 'hits': hits, 'misses': misses, 'num': 0,
+                                 'bytes': 0, 'mem': self.get_mem_size( ns ) }
+            return stat_dct[ns]
+
+        db_key_set = set()
+        cur = self.get_con().execute( 'SELECT key, length( val ) FROM tool' )
+        for key_repr, size in cur.fetchall():
+            key = ast.literal_eval( key_repr )
+            db_key_set.add( key )
+            stat = get_stat( ToolStore.get_namespace( key ) )
+            stat['num'] += 1
+            stat['bytes'] += size
+        for key in self.__dirty_set:
+            if key not in db_key_set:
+                get_stat( ToolStore.get_namespace( key ) )['num'] += 1
+        for ns in self.__stat_dct:
+            get_stat( ns )
+
+        return stat_dct
+
+
+    def invalidate( self, ns ):
+        '''
+        Removes all keys of namespace "ns" from memory and from the database.
+
+        Parameters
+        ----------
+        ns : object
+            A namespace (see ".get_namespace()").
+
+        Returns
+        -------
+        int
+            The number of removed keys.
+        '''
+        key_lst = [ key for key in self.keys() if ToolStore.get_namespace( key ) == ns ]
+        con = self.get_con()
+        con.executemany( 'DELETE FROM tool WHERE key=?', [ ( repr( key ), ) for key in key_lst ] )
+        con.commit()
+        for key in key_lst:
+            self.__forget( key )
+            self.__dirty_set.discard( key )
+        self.__stat_dct.pop( ns, None )
+
+        return len( key_lst )
+
+
+    def export( self, file_name, ns_lst ):
+        '''
+        Copies the keys of the given namespaces together with their values
+        to a new database. The values are not unpickled. The database is 
+        first written to a temporary file which is renamed afterwards.
+
+        Parameters
+        ----------
+        file_name : str
+            Name of the new database file without extension.
+            An existing database with this name is replaced.
+
+        ns_lst : list
+            A list of namespaces (see ".get_namespace()").
+
+        Returns
+        -------
+        int
+            The number of exported keys.
+        '''
+        self.flush()
+
+        row_lst = []
+        cur = self.get_con().execute( 'SELECT key, val FROM tool' )
+        for key_repr, val in cur.fetchall():
+            if ToolStore.get_namespace( ast.literal_eval( key_repr ) ) in ns_lst:
+                row_lst += [ ( key_repr, val ) ]
+
+        db_name = file_name + '.db'
+        tmp_name = db_name + '.tmp'
+        if os.path.exists( tmp_name ):
+            os.remove( tmp_name )
+
+        con = ToolStore.__connect( tmp_name )
+        con.executemany( 'INSERT OR REPLACE INTO tool VALUES ( ?, ? )', row_lst )
+        con.commit()
+        con.close()
+
+        os.replace( tmp_name, db_name )
+
+        return len( row_lst )
+
+
+    def sync( self, key = None ):
+        '''
+        Parameters
+        ----------
+        key : object
+            If not None, then the value of "key" in memory is stored
+            again. This is needed if this value was modified in place.
+            Otherwise all dirty values are flushed.
+        '''
+        if key != None:
+            if key in self.__val_dct:
+                self[key] = self.__val_dct[key]
+        else:
+            self.flush()
+
+
+    def flush( self ):
+        '''
+        Writes all dirty values to the database in a single transaction.
+        If the process is killed during the transaction, then the 
+        database is left unchanged by SQLite.
+        '''
+        if self.__dirty_set:
+            row_lst = [ ( repr( key ), sqlite3.Binary( sage_dumps( self.__val_dct[key] ) ) )
+                        for key in self.__dirty_set ]
+            con = self.get_con()
+            con.executemany( 'INSERT OR REPLACE INTO tool VALUES ( ?, ? )', row_lst )
+            con.commit()
+
+            # the written values can now be evicted
+            key_lst = list( self.__dirty_set )
+            self.__dirty_set = set()
+            for key, row in zip( key_lst, row_lst ):
+                self.__remember( key, self.__val_dct[key], len( row[1] ) )
+
+        self.flush_time = time.time()
+
+
+    def get_num_dirty( self ):
+        '''
+        Returns
+        -------
+        int
+            The number of values that are not yet written.
+        '''
+        return len( self.__dirty_set )
+
+
+    def __contains__( self, key ):
+        found = key in self.__val_dct
+        if not found:
+            cur = self.get_con().execute( 'SELECT 1 FROM tool WHERE key=?', ( repr( key ), ) )
+            found = cur.fetchone() != None
+
+        stat = self.__stat_dct.setdefault( ToolStore.get_namespace( key ), [0, 0] )
+        stat[0 if found else 1] += 1
+
+        return found
+
+
+    def __getitem__( self, key ):
+        if key in self.__val_dct:
+            self.__val_dct.move_to_end( key )
+            return self.__val_dct[key]
+
+        cur = self.get_con().execute( 'SELECT val FROM tool WHERE key=?', ( repr( key ), ) )
+        row = cur.fetchone()
+        if row == None:
+            raise KeyError( key )
+
+        val = sage_loads( bytes( row[0] ) )
+        self.__remember( key, val, len( row[0] ) )
+        return val
+
+
+    def __setitem__( self, key, val ):
+        if self.write_behind:
+            self.__dirty_set.add( key )
+            self.__remember( key, val, None )
+            return
+
+        blob = sqlite3.Binary( sage_dumps( val ) )
+        con = self.get_con()
+        con.execute( 'INSERT OR REPLACE INTO tool VALUES ( ?, ? )', ( repr( key ), blob ) )
+        con.commit()
+        self.__remember( key, val, len( blob ) )
+
+
+    def __delitem__( self, key ):
+        con = self.get_con()
+        cur = con.execute( 'DELETE FROM tool WHERE key=?', ( repr( key ), ) )
+        con.commit()
+        in_mem = key in self.__val_dct
+        self.__forget( key )
+        self.__dirty_set.discard( key )
+        if not in_mem and cur.rowcount == 0:
+            raise KeyError( key )
+
+
+    def __len__( self ):
+        return len( self.keys() )
+
+
+    def __iter__( self ):
+        return iter( self.keys() )
+
+
+    def keys( self ):
+        '''
+        Returns
+        -------
+        list
+            The keys in the database and the keys
+            of dirty values. This method does not 
+            unpickle any value.
+        '''
+        cur = self.get_con().execute( 'SELECT key FROM tool' )
+        key_lst = [ ast.literal_eval( row[0] ) for row in cur.fetchall() ]
+        key_set = set( key_lst )
+        return key_lst + [ key for key in self.__dirty_set if key not in key_set ]
+
+
+    def values( self ):
+        return [ self[key] for key in self.keys() ]
+
+
+    def items( self ):
+        return [ ( key, self[key] ) for key in self.keys() ]
+
+
+    def get( self, key, default = None ):
+        if key in self:
+            return self[key]
+        return default
+
+
+    def clear( self ):
+        con = self.get_con()
+        con.execute( 'DELETE FROM tool' )
+        con.commit()
+        self.__val_dct = collections.OrderedDict()
+        self.__size_dct = {}
+        self.__ns_size_dct = {}
+        self.__dirty_set = set()
+        self.__stat_dct = {}
@@ -0,0 +1,267 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 17, 2026
+@author: Niels Lubbes
+'''
+from ns_lattice.sage_interface import sage_dumps
+from ns_lattice.sage_interface import sage_loads
+
+import abc
+import ast
+import os
+import sqlite3
+import time
+
+
+# states of a work unit
+TODO = 0
+CLAIMED = 1
+DONE = 2
+
+
+class WorkQueue( abc.ABC ):
+    '''
+    A queue of work units that are processed by workers,
+    which may run in different processes or on different machines.
+
+    Each work unit has a key and is in one of the states
+    TODO, CLAIMED or DONE, which are defined in this module.
+    A worker claims a unit, processes it and stores its result.
+    The results are returned in the order in which the units
+    were added.
+
+    This class defines the interface of a queue backend.
+    See "SQLiteWorkQueue" for an implementation.
+
+    Keys should be objects such that "ast.literal_eval( repr( key ) )==key",
+    for example tuples of strings and integers.
+    '''
+
+    @abc.abstractmethod
+    def put( self, key, unit ):
+        '''
+        Adds a work unit with state TODO.
+        If a unit with the same key exists, then it is
+        replaced and its result is removed.
+
+        Parameters
+        ----------
+        key : object
+        unit : object
+            A picklable object.
+        '''
+        pass
+
+
+    @abc.abstractmethod
+    def put_lst( self, item_lst ):
+        '''
+        Adds work units as in ".put()" in a single transaction,
+        so that either all units are added or none of them.
+
+        Parameters
+        ----------
+        item_lst : list<tuple>
+            A list of pairs ( key, unit ).
+        '''
+        pass
+
+
+    @abc.abstractmethod
+    def claim( self, timeout = None ):
+        '''
+        Parameters
+        ----------
+        timeout : float
+            If not None, then units that were claimed more than
+            "timeout" seconds ago are considered abandoned
+            and can be claimed again.
+
+        Returns
+        -------
+        tuple
+            A pair ( key, unit ) of the first unit with state
+            TODO, whose state is set to CLAIMED.
+            Returns None if there is no such unit.
+        '''
+        pass
+
+
+    @abc.abstractmethod
+    def complete( self, key, result ):
+        '''
+        Stores the result of a work unit and
+        sets its state to DONE.
+
+        Parameters
+        ----------
+        key : object
+        result : object
+            A picklable object.
+        '''
+        pass
+
+
+    @abc.abstractmethod
+    def get_num( self, state = None ):
+        '''
+        Parameters
+        ----------
+        state : int
+            Either TODO, CLAIMED, DONE or None.
+
+        Returns
+        -------
+        int
+            The number of units with given state
+            or the number of all units if "state==None".
+        '''
+        pass
+
+
+    @abc.abstractmethod
+    def get_results( self ):
+        '''
+        Returns
+        -------
+        list
+            A list of pairs ( key, result ) of all units with state
+            DONE in the order in which the units were added.
+        '''
+        pass
+
+
+    @abc.abstractmethod
+    def clear( self ):
+        '''
+        Removes all units.
+        '''
+        pass
+
+
+class SQLiteWorkQueue( WorkQueue ):
+    '''
+    A work queue that is stored in an SQLite database.
+
+    The database can be shared by worker processes on the same
+    machine or on a shared file system. A unit is claimed in a single
+    transaction, so that each unit is claimed by at most one worker.
+    Values are pickled before a transaction is started and a failed
+    transaction is rolled back, so that the database is not locked
+    for the other workers.
+
+    Attributes
+    ----------
+    file_name : str
+        Name of the database file without extension.
+
+    db_name : str
+        Name of the database file "<file_name>.db".
+    '''
+
+    def __init__( self, file_name ):
+        '''
+        Parameters
+        ----------
+        file_name : str
+            Name of the database file without extension.
+        '''
+        self.file_name = file_name
+        self.db_name = file_name + '.db'
+        self.__con = None
+        self.__pid = None
+        self.get_con()
+
+
+    def get_con( self ):
+        '''
+        Returns
+        -------
+        sqlite3.Connection
+            A connection to the database. A new connection
+            is opened if the current process differs from the
+            process that opened the previous connection.
+        '''
+        if self.__con != None and self.__pid == os.getpid():
+            return self.__con
+
+        # transactions are started explicitly
+        self.__con = sqlite3.connect( self.db_name, timeout = 60, isolation_level = None )
+        self.__con.execute( 'CREATE TABLE IF NOT EXISTS unit ' +
+                            '( seq INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT UNIQUE, ' +
+                            'state INTEGER, claim_time REAL, unit BLOB, result BLOB )' )
+        self.__pid = os.getpid()
+        return self.__con
+
+
+    def put( self, key, unit ):
+        self.put_lst( [( key, unit )] )
+
+
+    def put_lst( self, item_lst ):
+        blob_lst = [ ( repr( key ), sqlite3.Binary( sage_dumps( unit ) ) ) for key, unit in item_lst ]
+        con = self.get_con()
+        con.execute( 'BEGIN IMMEDIATE' )
+        try:
+            for key, blob in blob_lst:
+                con.execute( 'DELETE FROM unit WHERE key=?', ( key, ) )
+                con.execute( 'INSERT INTO unit ( key, state, claim_time, unit, result ) VALUES ( ?, ?, NULL, ?, NULL )',
+                             ( key, TODO, blob ) )
+        except BaseException:
+            con.execute( 'ROLLBACK' )
+            raise
+        con.execute( 'COMMIT' )
+
+
+    def claim( self, timeout = None ):
+        con = self.get_con()
+        now = time.time()
+        row = None
+        con.execute( 'BEGIN IMMEDIATE' )
+        try:
+            if timeout != None:
+                con.execute( 'UPDATE unit SET state=? WHERE state=? AND claim_time<?',
+                             ( TODO, CLAIMED, now - timeout ) )
+            row = con.execute( 'SELECT seq, key, unit FROM unit WHERE state=? ORDER BY seq LIMIT 1',
+                               ( TODO, ) ).fetchone()
+            if row != None:
+                con.execute( 'UPDATE unit SET state=?, claim_time=? WHERE seq=?',
+                             ( CLAIMED, now, row[0] ) )
+        except BaseException:
+            con.execute( 'ROLLBACK' )
+            raise
+        con.execute( 'COMMIT' )
+
+        if row == None:
+            return None
+        return ast.literal_eval( row[1] ), sage_loads( bytes( row[2] ) )
+
+
+    def complete( self, key, result ):
+        blob = sqlite3.Binary( sage_dumps( result ) )
+        con = self.get_con()
+        con.execute( 'BEGIN IMMEDIATE' )
+        try:
+            con.execute( 'UPDATE unit SET state=?, result=? WHERE key=?', ( DONE, blob, repr( key ) ) )
+        except BaseException:
+            con.execute( 'ROLLBACK' )
+            raise
+        con.execute( 'COMMIT' )
+
+
+    def get_num( self, state = None ):
+        if state == None:
+            cur = self.get_con().execute( 'SELECT COUNT(*) FROM unit' )
+        else:
+            cur = self.get_con().execute( 'SELECT COUNT(*) FROM unit WHERE state=?', ( state, ) )
+        return cur.fetchone()[0]
+
+
+    def get_results( self ):
+        cur = self.get_con().execute( 'SELECT key, result FROM unit WHERE state=? ORDER BY seq',
+                                      ( DONE, ) )
+        return [ ( ast.literal_eval( row[0] ), sage_loads( bytes( row[1] ) ) ) for row in cur.fetchall() ]
+
+
+    def clear( self ):
+        self.get_con().execute( 'DELETE FROM unit' )
@@ -33,7 +33,7 @@ def cls_to_tex():
         for dpl in DPLattice.get_cls( rank ):
 
             # construct list for involution (e0,...,er)|-->(i0,...,ir)
-            i_lst = [Div( row ).mat_mul( dpl.M ) for row in sage_identity_matrix( rank ) ]
+            i_lst = Div.mat_mul_many( [Div( row ) for row in sage_identity_matrix( rank ) ], dpl.M )
 
             # add each divisor that occurs to div_lst
             for elt in i_lst + dpl.d_lst:
@@ -126,7 +126,7 @@ def cls_to_tex():
 
             col6 = '$' + str( dpl.get_numbers()[5] ) + '$'
 
-            i_lst = [ str( Div( rw ).mat_mul( dpl.M ) ) for rw in sage_identity_matrix( rank ) ]
+            i_lst = [ str( i ) for i in Div.mat_mul_many( [Div( rw ) for rw in sage_identity_matrix( rank ) ], dpl.M ) ]
             col7 = ''
             for i in i_lst:
                 col7 += sym_dct[i]
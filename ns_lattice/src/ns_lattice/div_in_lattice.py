@@ -13,6 +13,7 @@ See
 '''
 
 import time
+import multiprocessing
 
 from ns_lattice.sage_interface import sage_Combinations
 from ns_lattice.sage_interface import sage_Compositions
@@ -24,7 +25,7 @@ from ns_lattice.class_ns_tools import NSTools
 from ns_lattice.class_div import Div
 
 
-def get_divs( d, dc, cc, perm = False ):
+def get_divs( d, dc, cc, perm = False, backend = 'partitions' ):
     '''
     Computes divisors in unimodular lattice with prescribed intersection product. 
     
@@ -43,6 +44,16 @@ def get_divs( d, dc, cc, perm = False ):
         
     perm : boolean
         If True, then generators are permuted.      
+        
+    backend : str
+        Either 'partitions' or 'backtrack'. 
+        If 'partitions', then the classes are obtained by filtering
+        partitions or compositions of d1*c1+...+dr*cr.
+        If 'backtrack', then the classes are obtained by a 
+        backtracking search on c1,...,cr that prunes with 
+        the linear and quadratic constraints (see "_get_c0_divs_bt()").
+        Both backends have the same output and the backend is 
+        not part of the cache key.
     
     Returns
     -------
@@ -88,51 +99,143 @@ def get_divs( d, dc, cc, perm = False ):
         are considered equivalent, and only e0-e1-e2
         is returned, since e0-e1-e2>e0-e1-e3 
         (see "Div.__lt__()" for the ordering).             
+        
+        If "NSTools.get_num_procs()>1", then the computation is
+        distributed over a pool of worker processes 
+        (see "_get_divs_parallel()"). The output is the same. 
     '''
 
     # check if input was already computed
     #
-    key = 'get_divs_' + str( ( d, dc, cc, perm ) )
+    key = NSTools.get_key( 'get_divs', d, dc, cc, perm )
     if key in NSTools.get_tool_dct():
         return NSTools.get_tool_dct()[key]
 
     # construct div set
     #
     NSTools.p( 'Constructing div set classes for ', ( d, dc, cc, perm ) )
-    out_lst = []
+    if NSTools.get_num_procs() > 1:
+        out_lst = _get_divs_parallel( d, dc, cc, perm, backend )
+    else:
+        out_lst = list( iter_divs( d, dc, cc, perm, backend ) )
+
+    # cache output
+    NSTools.get_tool_dct()[key] = out_lst
+    NSTools.save_tool_dct()
+
+    return out_lst
+
+
+def iter_divs( d, dc, cc, perm = False, backend = 'partitions' ):
+    '''
+    Streaming variant of "get_divs()".
+
+    Parameters
+    ----------
+    d : Div
+    dc : int
+    cc : int
+    perm : boolean
+    backend : str
+        See "get_divs()".
+
+    Returns
+    -------
+    generator<Div>
+        Yields the same "Div" objects as "get_divs( d, dc, cc, perm )"
+        and in the same order. If the output of "get_divs()" was
+        already cached, then the cached list is traversed. Otherwise
+        the classes are computed lazily for each value of c0 and
+        only the classes with the current value of c0 are kept in
+        memory (the ordering of "Div.__lt__()" is lexicographic
+        in c0 first).
+    '''
+    key = NSTools.get_key( 'get_divs', d, dc, cc, perm )
+    if key in NSTools.get_tool_dct():
+        for c in NSTools.get_tool_dct()[key]:
+            yield c
+        return
 
-    # compute classes of the form ei or ei-ej for i,j>0
+    # classes of the form ei or ei-ej for i,j>0 have c0==0
     #
-    if ( dc, cc ) == ( 1, -1 ) or ( dc, cc ) == ( 0, -2 ):
+    for c in sorted( _get_special_divs( d, dc, cc, perm ) ):
+        yield c
 
-        m2_lst = []  # list of divisors of the form ei-ej for i,j>0
-        m1_lst = []  # list of divisors of the form ei for i>0
-        if perm:
+    # classes with c0>0
+    #
+    for c0 in _iter_c0( d, dc, cc ):
+        for c in sorted( _get_c0_divs( d, dc, cc, perm, c0, None, backend ) ):
+            yield c
 
-            # Example:
-            #     >>> list(Combinations( [1,2,3,4], 2 ))
-            #     [[1, 2], [1, 3], [1, 4], [2, 3], [2, 4], [3, 4]]
-            # Notice that r=d.rank()-1 if c = c0*e0 + c1*e1 +...+ cr*er.
-            #
-            for comb in sage_Combinations( range( 1, d.rank() ), 2 ):
-                m2_lst += [ Div.new( str( comb[0] ) + str( comb[1] ), d.rank() ) ]
-            m1_lst += [Div.new( 'e' + str( i ), d.rank() ) for i in range( 1, d.rank() )]
 
-        else:
+def _get_special_divs( d, dc, cc, perm ):
+    '''
+    Parameters
+    ----------
+    d : Div
+    dc : int
+    cc : int
+    perm : boolean
+        See "get_divs()".
+
+    Returns
+    -------
+    list<Div>
+        The unsorted list of classes in the output of "get_divs()"
+        that are of the form ei or ei-ej for i,j>0.
+    '''
+    out_lst = []
+    if ( dc, cc ) != ( 1, -1 ) and ( dc, cc ) != ( 0, -2 ):
+        return out_lst
 
-            # up to permutation of the generators
-            # we may assume that i==1 and j==2.
-            #
-            m2_lst += [ Div.new( '12', d.rank() ) ]
-            m1_lst += [ Div.new( 'e1', d.rank() ) ]
+    m2_lst = []  # list of divisors of the form ei-ej for i,j>0
+    m1_lst = []  # list of divisors of the form ei for i>0
+    if perm:
 
-        # add the classes that satisfy return
-        # specification to the output list
+        # Example:
+        #     >>> list(Combinations( [1,2,3,4], 2 ))
+        #     [[1, 2], [1, 3], [1, 4], [2, 3], [2, 4], [3, 4]]
+        # Notice that r=d.rank()-1 if c = c0*e0 + c1*e1 +...+ cr*er.
         #
-        for c in m1_lst + m2_lst:
-            if  ( dc, cc ) == ( d * c, c * c ):
-                out_lst += [c]
+        for comb in sage_Combinations( range( 1, d.rank() ), 2 ):
+            m2_lst += [ Div.new( str( comb[0] ) + str( comb[1] ), d.rank() ) ]
+        m1_lst += [Div.new( 'e' + str( i ), d.rank() ) for i in range( 1, d.rank() )]
 
+    else:
+
+        # up to permutation of the generators
+        # we may assume that i==1 and j==2.
+        #
+        m2_lst += [ Div.new( '12', d.rank() ) ]
+        m1_lst += [ Div.new( 'e1', d.rank() ) ]
+
+    # add the classes that satisfy return
+    # specification to the output list
+    #
+    for c in m1_lst + m2_lst:
+        if  ( dc, cc ) == ( d * c, c * c ):
+            out_lst += [c]
+
+    return out_lst
+
+
+def _iter_c0( d, dc, cc ):
+    '''
+    Parameters
+    ----------
+    d : Div
+    dc : int
+    cc : int
+        See "get_divs()".
+
+    Returns
+    -------
+    generator<int>
+        Yields in increasing order the values c0>0 for which
+        classes c=c0*e0+...+cr*er in the output of "get_divs()"
+        may exist. The generator stops as soon as the
+        Cauchy-Schwarz inequality excludes larger values of c0.
+    '''
     #
     # Note: cc = c0^2 - c1^2 -...- cr^2
     #
@@ -164,71 +267,262 @@ def get_divs( d, dc, cc, perm = False ):
 
         if prv_eq_diff < cur_eq_diff and dc_tail * dc_tail > dd_tail * cc_tail:
             NSTools.p( 'stop by Cauchy-Schwarz inequality...' )
-            break  # out of while loop
+            return
 
-        # obtain all possible [d1*c1+1,...,dr*cr+1]
-        #
-        r = d.rank() - 1
-        if perm and len( set( d[1:] ) ) != 1:
+        yield c0
+
+
+def _get_divs_parallel( d, dc, cc, perm, backend = 'partitions' ):
+    '''
+    Parameters
+    ----------
+    d : Div
+    dc : int
+    cc : int
+    perm : boolean
+    backend : str
+        See "get_divs()".
+
+    Returns
+    -------
+    list<Div>
+        The output of "get_divs( d, dc, cc, perm )" computed
+        by "NSTools.get_num_procs()" worker processes.
+        Each task consists of a value for c0 and 
+        a value for the first part of the partitions 
+        or compositions that are enumerated for this c0
+        (see "_get_c0_divs()"). The results are merged
+        in task order and sorted per c0 so that the 
+        output coincides with the output of the serial 
+        computation.
+    '''
+    r = d.rank() - 1
+    task_lst = []
+    for c0 in _iter_c0( d, dc, cc ):
+        num = d[0] * c0 - dc + r  # sum of the parts
+        if r > 1:
+            task_lst += [ ( d, dc, cc, perm, c0, p0, backend ) for p0 in range( 1, num - r + 2 ) ]
+        else:
+            task_lst += [ ( d, dc, cc, perm, c0, None, backend ) ]
+
+    NSTools.p( 'Number of tasks =', len( task_lst ), ', number of processes =', NSTools.get_num_procs() )
+
+    pool = multiprocessing.Pool( NSTools.get_num_procs() )
+    try:
+        res_lst = pool.map( _get_c0_divs_task, task_lst )
+    finally:
+        pool.close()
+        pool.join()
+
+    # merge the results of each c0 level
+    #
+    lvl_dct = {}
+    for task, c_lst in zip( task_lst, res_lst ):
+        lvl_dct.setdefault( task[4], [] ).extend( c_lst )
+
+    out_lst = sorted( _get_special_divs( d, dc, cc, perm ) )
+    for c0 in sorted( lvl_dct.keys() ):
+        out_lst += sorted( lvl_dct[c0] )
+
+    return out_lst
+
+
+def _get_c0_divs_task( task ):
+    '''
+    Worker function for "_get_divs_parallel()".
+    
+    Parameters
+    ----------
+    task : tuple
+        The arguments ( d, dc, cc, perm, c0, p0, backend ) 
+        of "_get_c0_divs()".
+    
+    Returns
+    -------
+    list<Div>
+        The output of "_get_c0_divs( *task )".
+    '''
+    return _get_c0_divs( *task )
+
+
+def _get_c0_divs( d, dc, cc, perm, c0, p0 = None, backend = 'partitions' ):
+    '''
+    Parameters
+    ----------
+    d : Div
+    dc : int
+    cc : int
+    perm : boolean
+    backend : str
+        See "get_divs()".
+
+    c0 : int
+        A positive integer.
+        
+    p0 : int
+        If not None, then only partitions or compositions 
+        [d1*c1+1,...,dr*cr+1] with d1*c1+1==p0 are considered.
+
+    Returns
+    -------
+    list<Div>
+        The unsorted list of classes c=c0*e0+...+cr*er
+        in the output of "get_divs()" with given c0.
+    '''
+    if backend == 'backtrack':
+        return _get_c0_divs_bt( d, dc, cc, perm, c0, p0 )
+    if backend != 'partitions':
+        raise ValueError( 'Unknown backend: ', backend )
+
+    out_lst = []
+    dc_tail = d[0] * c0 - dc  # = d1*c1 +...+ dr*cr
+
+    # obtain all possible [d1*c1+1,...,dr*cr+1]
+    #
+    r = d.rank() - 1
+    if perm and len( set( d[1:] ) ) != 1:
+        if p0 == None:
             p_lst_lst = sage_Compositions( dc_tail + r, length = r )
         else:
+            p_lst_lst = [ [p0] + list( q_lst ) for q_lst in sage_Compositions( dc_tail + r - p0, length = r - 1 ) ]
+    else:
+        if p0 == None:
             p_lst_lst = sage_Partitions( dc_tail + r, length = r )
+        else:
+            p_lst_lst = [ [p0] + list( q_lst ) for q_lst in sage_Partitions( dc_tail + r - p0, length = r - 1, max_part = p0 ) ]
 
-        # data for ETA computation
-        total = len( p_lst_lst )
-        counter = 0
-        ival = 5000
+    # data for ETA computation
+    total = len( p_lst_lst )
+    counter = 0
+    ival = 5000
 
-        # obtain [c1,...,cr] from [d1*c1+1,...,dr*cr+1]
-        #
-        for p_lst in p_lst_lst:
-
-            # ETA
-            if counter % ival == 0:
-                start = time.time()
-            counter += 1
-            if counter % ival == 0:
-                passed_time = time.time() - start
-                NSTools.p( 'ETA in minutes =', passed_time * ( total - counter ) / ( ival * 60 ), ' (', counter, '/', total, '), c0 =', c0, ', prv_eq_diff =', prv_eq_diff, ', cur_eq_diff =', cur_eq_diff )
-
-            # dc_tail=d1*c1 +...+ dr*cr = p1 +...+ pr  with pi>=0
-            p_lst = [ p - 1 for p in p_lst]
-
-            # obtain c_tail=[c1,...,cr] from [p1,...,pr]
-            valid_part = True
-            c_tail = []  # =[c1,...,cr]
-            for i in range( 0, len( p_lst ) ):
-                if p_lst[i] == 0 or d[i + 1] == 0:
-                    c_tail += [p_lst[i]]
+    # obtain [c1,...,cr] from [d1*c1+1,...,dr*cr+1]
+    #
+    for p_lst in p_lst_lst:
+
+        # ETA
+        if counter % ival == 0:
+            start = time.time()
+        counter += 1
+        if counter % ival == 0:
+            passed_time = time.time() - start
+            NSTools.p( 'ETA in minutes =', passed_time * ( total - counter ) / ( ival * 60 ), ' (', counter, '/', total, '), c0 =', c0 )
+
+        # dc_tail=d1*c1 +...+ dr*cr = p1 +...+ pr  with pi>=0
+        p_lst = [ p - 1 for p in p_lst]
+
+        # obtain c_tail=[c1,...,cr] from [p1,...,pr]
+        valid_part = True
+        c_tail = []  # =[c1,...,cr]
+        for i in range( 0, len( p_lst ) ):
+            if p_lst[i] == 0 or d[i + 1] == 0:
+                c_tail += [p_lst[i]]
+            else:
+                quo, rem = sage_ZZ( p_lst[i] ).quo_rem( d[i + 1] )
+                if rem != 0:
+                    valid_part = False
+                    break  # out of i-for-loop
                 else:
-                    quo, rem = sage_ZZ( p_lst[i] ).quo_rem( d[i + 1] )
-                    if rem != 0:
-                        valid_part = False
-                        break  # out of i-for-loop
-                    else:
-                        c_tail += [ quo ]
-            if not valid_part:
-                continue
-
-            # add to out list if valid
-            #
-            c = Div( [c0] + c_tail )
-            if c.rank() == d.rank() and ( dc, cc ) == ( d * c, c * c ):
-                if perm and len( set( d[1:] ) ) == 1:
-                    # since d1==...==dr we do not have to
-                    # check each permutation.
+                    c_tail += [ quo ]
+        if not valid_part:
+            continue
+
+        # add to out list if valid
+        #
+        c = Div( [c0] + c_tail )
+        if c.rank() == d.rank() and ( dc, cc ) == ( d * c, c * c ):
+            if perm and len( set( d[1:] ) ) == 1:
+                # since d1==...==dr we do not have to
+                # check each permutation.
+                for pc_tail in sage_Permutations( c_tail ):
+                    out_lst += [Div( [c0] + list( pc_tail ) )]
+            else:
+                out_lst += [c]
+
+    return out_lst
+
+
+def _get_c0_divs_bt( d, dc, cc, perm, c0, p0 = None ):
+    '''
+    Backtracking variant of "_get_c0_divs()" with the same output.
+    
+    Parameters
+    ----------
+    d : Div
+    dc : int
+    cc : int
+    perm : boolean
+    c0 : int
+    p0 : int
+        See "_get_c0_divs()".
+        
+    Returns
+    -------
+    list<Div>
+        The unsorted list of classes c=c0*e0+...+cr*er
+        in the output of "get_divs()" with given c0.
+        
+    Note
+    ----
+    We search for [c1,...,cr] such that 
+    
+        pi = di*ci >= 0                (pi==0 if di==0),
+        p1 +...+ pr = dc_tail = d0*c0 - dc, 
+        c1^2 +...+ cr^2 = cc_tail = c0^2 - cc,
+        
+    and such that p1>=...>=pr if "_get_c0_divs()" uses partitions.
+    After choosing c1,...,ci we continue only if the remaining 
+    linear sum "rem_p" and quadratic sum "rem_s" satisfy
+    
+        rem_p^2 <= (d(i+1)^2 +...+ dr^2) * rem_s   (Cauchy-Schwarz)
+        rem_s   <= rem_p^2                         (|cj|<=|dj*cj|).
+    '''
+    r = d.rank() - 1
+    d_tail = [ int( di ) for di in d[1:] ]
+    dc_tail = int( d[0] * c0 - dc )
+    cc_tail = int( c0 ** 2 - cc )
+    if dc_tail < 0 or cc_tail < 0:
+        return []
+
+    # partitions are non-increasing, compositions are not
+    uni = len( set( d_tail ) ) == 1
+    is_part = not ( perm and not uni )
+
+    # w_lst[i] = d(i+1)^2 +...+ dr^2
+    w_lst = [ sum( [ di * di for di in d_tail[i:] ] ) for i in range( r + 1 ) ]
+
+    out_lst = []
+    c_tail = []
+
+    def extend( i, rem_p, rem_s, max_p ):
+        if i == r:
+            if rem_p == 0 and rem_s == 0:
+                if perm and uni:
                     for pc_tail in sage_Permutations( c_tail ):
-                        out_lst += [Div( [c0] + list( pc_tail ) )]
+                        out_lst.append( Div( [c0] + list( pc_tail ) ) )
                 else:
-                    out_lst += [c]
+                    out_lst.append( Div( [c0] + c_tail ) )
+            return
+
+        if rem_p * rem_p > w_lst[i] * rem_s or rem_s > rem_p * rem_p:
+            return
 
-    # sort list of "Div" objects
-    out_lst.sort()
+        di = d_tail[i]
+        if di == 0:
+            k_lst = [0]
+        else:
+            max_k = min( rem_p, max_p ) // abs( di )
+            k_lst = [ k for k in range( max_k + 1 ) if k * k <= rem_s ]
+        if i == 0 and p0 != None:
+            k_lst = [ k for k in k_lst if abs( di ) * k == p0 - 1 ]
 
+        for k in k_lst:
+            pi = abs( di ) * k
+            c_tail.append( k if di > 0 else -k )
+            extend( i + 1, rem_p - pi, rem_s - k * k, pi if is_part else max_p )
+            c_tail.pop()
 
-    # cache output
-    NSTools.get_tool_dct()[key] = out_lst
-    NSTools.save_tool_dct()
+    extend( 0, dc_tail, cc_tail, dc_tail )
 
     return out_lst
 
@@ -238,7 +532,8 @@ def get_indecomp_divs( c_lst, d_lst ):
     Parameters
     ----------
     c_lst : list<Div>        
-        Typically output of "get_divs(...)"
+        Typically output of "get_divs(...)" or 
+        a generator such as "iter_divs(...)".
     d_lst : list<Div>
         Typically a list of (-2)-classes.
 
@@ -0,0 +1,330 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 17, 2026
+@author: Niels Lubbes
+
+Precomputed tables of divisor classes in the Neron-Severi 
+lattice of weak del Pezzo surfaces with 3<=rank<=9:
+
+    roots  : get_divs( get_ak( rank ), 0, -2, True )
+    lines  : get_divs( get_ak( rank ), 1, -1, True )
+    conics : get_divs( get_ak( rank ), 2, 0, True )
+
+Each table is a zlib compressed and base64 encoded array 
+of signed bytes (int8) with "rank" coefficients per class.
+The tables were generated with "encode_divs()" and are 
+compared against "get_divs()" in "test_div_tables.py".
+Increase "TABLE_VERSION" whenever the tables or their 
+encoding change and regenerate the tables, such that 
+"_table_version" equals "TABLE_VERSION".
+'''
+import array
+import base64
+import zlib
+
+from ns_lattice.class_div import Div
+
+
+# Version of the tables and of their encoding
+# as implemented by "encode_divs()" and "decode_divs()".
+TABLE_VERSION = 1
+
+# Private version of the tables in "_table_dct",
+# which is checked by "get_table_divs()".
+_table_version = 1
+
+# Private dictionary of encoded tables
+#
+#     ( rank, kind ) ---> ( number of classes, encoded classes )
+#
+_table_dct = {
+    ( 3, 'roots' ): ( 1,
+        'eNpjYPwPAAEEAQE=' ),
+    ( 3, 'lines' ): ( 3,
+        'eNpjYGRgYGBk/P8fAAMVAgI=' ),
+    ( 3, 'conics' ): ( 2,
+        'eNpj/M/AyPAfAAYJAgE=' ),
+    ( 4, 'roots' ): ( 4,
+        'eNpjYPzPwMAAJBgZ/jP+//8fACISBf8=' ),
+    ( 4, 'lines' ): ( 6,
+        'eNpjYGQAAgjB+P8/A+N/hv+MDP//AwAkQgYB' ),
+    ( 4, 'conics' ): ( 3,
+        'eNpj/M/AwMjwH4gZ/gMAEhIDAQ==' ),
+    ( 5, 'roots' ): ( 10,
+        'eNpVyMEJAEAQwsDYf9HZ3PMEZZBJeTs+DpyGmtBuPUUFEfk=' ),
+    ( 5, 'lines' ): ( 10,
+        'eNpViLENAAAMgvT/oymOdSBgmu2xIAkeqha0wT60hwv/' ),
+    ( 5, 'conics' ): ( 5,
+        'eNpj/M/AwMDI8B9EAEkgwfCf6T8QAABGIwf/' ),
+    ( 6, 'roots' ): ( 20,
+        'eNptizESADAIwuD/j05Jx14dQIKmxLnWvKH5o0komCfYIxZJbIeR3H3uu+rRAfysJ+0=' ),
+    ( 6, 'lines' ): ( 16,
+        'eNpti7kRADAIw0z231mxqHHhRxyZrO4YMAgyR3tH+7pIEiS6B7/hoT7fxhj5' ),
+    ( 6, 'conics' ): ( 10,
+        'eNodxsEBAAAIgkBr/50J43E6xCa8HXVqWCz1f1BhCwcM8Rj3' ),
+    ( 7, 'roots' ): ( 36,
+        'eNqFjkESACEIw8r+/8/RxqvOcqBSYocMsY5OLuPk7e7+t2wPAy52RxYB3ZoFu0LzTH00TxGV'
+        'bFhDkHQqJFnxv9egqRjjQfBhLbcJUNU=' ),
+    ( 7, 'lines' ): ( 27,
+        'eNqFjMERADAIwtD9d6YQB6gPcwFPjW6+HBtaJkZj1diBtGG0IaDsn5R0Ml3BDd0hN+uOgLAL'
+        's4NuL9sPh8s75g==' ),
+    ( 7, 'conics' ): ( 27,
+        'eNolzFEWACEIQlFy9r9lGXj60S3w9KzOkw8MtUSQxxmpJJyeRX2PKOnYzIbpAhuEuQ0V4b3a'
+        'Dlngm28N3gNDLRG8PwAiZcs=' ),
+    ( 8, 'roots' ): ( 63,
+        'eNqVkEEOwDAIw+j+/2cPYo7TtPXiEtKAWofy7OXUs3DqvdH4ZBj8MQbFAT0NfIlmG6Pn1bRR'
+        '3zrGGSF9EP/Ex4V+6wTE7/gEZVPUpYFZduh6mNd0PcxLvXSQeerSgeZtv29+DfZlBvs7cJFT'
+        'sqxLffuDZsAluAElRaef' ),
+    ( 8, 'lines' ): ( 56,
+        'eNqVjkECgDAMwnD+/8vDQvoBd0kL2VSP9vwbHpvBMg3B7A1mX1IkT5AcIuTFCO0naF8itl9G'
+        'xJPxQi7gwVzgT+3jHKmc4hSlXKrNESKejFdGN94QnZ73o9GHaM0zHurmu/eFQzzkw+819F0y'
+        'DDuEGcoZoO8HJZ/DkQ==' ),
+    ( 8, 'conics' ): ( 126,
+        'eNotj0GCAzEIw2gy+/8f4wUpvQhsj0N/KX6/yqPDkGG5A5xBVk7mN8Ny/bOAhXHKAP4E8GEx'
+        '4T99lYOt/nYSp/JooX28v8/GvqHPxj516HOxj/3RA4515pfWmXd/9LBjHF164FHO7XDnTT8y'
+        'LHeAM8h0ma+YXxKLeTkxe+eFq21Oro2/B1xl/PIe73KdHeSWh9443PLg+Q5hdITRZTTWT+vD'
+        '8o9x5wTIpc1BA+TUCZpPm4cEzQ89s79u7hpyxzeA0Vh9jdVhDH4ruz/6AfnRyC9jAXn3R4s+'
+        '4urSwi8W2rd3cl7bx84X9i19yD516YP2PX+mzzp9ycOfdv81v8i4R/35iyHoP9H/afOzJw==' ),
+    ( 9, 'roots' ): ( 120,
+        'eNqdkUGSAzEIA7Hz/y+PFqTmmNokc6ELJCx76qj4lk69bZ36f9b1c9HU79Wuv9tSS0fC0FVs'
+        'ElZmM8qSkYjRdqKecwFsdvlIS4WLThbZRaxs9D3ECGC1r2JILLHZt+GwbE5ngVOzmRHA8dm8'
+        'msE8o9AAyZGXHODlRIwGXk7EcGeBiMTICCArMdBMkxhogIQmxoob+fVCHEh6/j4w6a/8VQV6'
+        'eFMDvuBNHaiobmHDVcIVcB5cA3EL14pLiAM2IR7AFA1RrY3GgNYj6y8Sj7aTYy+TBtK/HgF6'
+        'FqCG0IDJMBRoAvT8Ae/VqwA=' ),
+    ( 9, 'lines' ): ( 240,
+        'eNqlkVGW5DAMAjVOsve/8IiVoHyC6Z/UEyBjd/3U/f2JfiRIJURGM8loJhfQVvJoJQDT7rbJ'
+        'nh3ZE8BtzwW7Y55RzAZiMQOOpf7ESJVILZAnFXCe1IXJH+1v0LCm42+gFKiYTuGOedwxB0qB'
+        'yizm61nxxIvHUBx2YokUKI4/UTy5QA9qlKhhcHdRY4DuogaeQCqLGpE8o0akO4mLGgvc8NCC'
+        'zYa0YDOSg4fD2ZxJDjmcyeabWj4sTopJihz2JXUlVzuELF3I2z2tvOGjvhBaMBmWAkOAuoiX'
+        'iC8kJOKBDYl4cegUePCSCthLqmi4ZR8sMQO22OP7PCj2FBfkpgxmkq+e4vKPoKd4hYlnNFJG'
+        'IwFCW48aT6B4Mpdfk81qzAFMNiPFnZSaVCDupBaK/4C/oJq4mnjAMeILxIir3+7cdCD3eucb'
+        'ENpK1lYKCPe7CpMLxJxak1MGscgpJhfY+DqEBLD6FauzeabZvCAOy+ZMLnBqNiMBHJ/N17P4'
+        'qi/Q4xU9XtGDGvuGebmmhidZQI0FKlIjEkBXauDZITXwAClNjWsefGmBOZD2L/sC2/5r/6TA'
+        'iF++AV/wy3dBcX0iRkpNKuA+pBaSblLXrMYccAjzAqF4qGpvPAa8luz/sFi6kxz7oQzQ/t9v'
+        'A/17ARoILZgMS4EhoH//A2dns5w=' ),
+    ( 9, 'conics' ): ( 2160,
+        'eNo1mFt2IzsOBOu6JZXs2f9uC+AQGUH/KJt4MJkEUDz937r4++9aB4g2AA0IChgE2EhwrZ+1'
+        '/wYNiPPP/AIubD+XTvEZp/gALsLic0yJ/4mLprNCxp9rHWBqMu9lMgdcbEZmTdmVzJrOCpDM'
+        'ARL6IbFRAZcUf8hnFECuPwRhEkj655K0nKNhlFty3kDllpwxARRsyTkrB3hUORsVoBhLzkYB'
+        'VEHOmATKIeeTeeMfKZuZFeJ+ZGpmTcn0Ix0zA5Dsx8T4ANTux+iAaPevF/f+b/UBQQGDABsJ'
+        'Vm+A7zIqIL7LKMH2XTgPtX+46CwYF3yiyz8s+ABYiEnA7waX7P8t0F7xGDs8S2OC4zYJFrb4'
+        'rNYHcHnmkN9OOK/WGYATzpribdRqowDxNmrApYhqeC01HIDeSw0Bo/dSQ50ByLzUEJ9UgBri'
+        'A1DUpYazgpZLDceEYEsNEx6dlhrGJFCepYb4AJRnqaHOq3UGoMpSw3PA/a9/auABAdHAA+oj'
+        '4OgeEJPAg3rAmDiNByQ8h/CAmARy94D6AOQOn/nHP5nC51ry0SSQF3wwsTl8DM+e8NEkcIck'
+        'tHNJnISaiE7C40O5/dOygT2znUHb+QCbZ2hkaWgALttpopYrB9hXUWycohjAsCh2TAlL5qXp'
+        'rJAomQF2I4W04ykkAKkppAGXHQuNpQ/APaChKXtAQ9NZYVdoBNjntvnVtjkgPGzzAfKwzY/z'
+        '3lXyS+cACUlen+EheX0CLOeWPCaAldWSz8oBjptXN32+Ae392r+A1YL5aU2A1X1W4j0rBxBG'
+        '1BRwogJW91lJIqIAZIxpYEwCUg9IajPvUibzACi3mVk5gF3NrEnA9mY+PhviA4AHPgcMj0vp'
+        'rqV0A9BgKR2mNLHSYTorOdZSugGcbymdUQEeYimdUQC4L6XDJIDyUrpkZsq8ZCHnAW4uZ00A'
+        'd5AzKweQmMxTVC99yRygS3xSd69a/L1WHSDaPoyd1/4FXNbonKL0YezMFoBl2ISvNhxwWdmv'
+        'CdJZML76CJabvS6rP9ddbppdI0vAkkdkceUACYXqMgqwpBiqgIuyDVWdYR+q+lDRoYrJg4Wq'
+        'UZzwtfoAj/oKCxMCsrkJNanC67KZX0s5Xks5XpftHVlGF2p1R1KrA5ZKUausHKBk1KomgdpR'
+        'q/FpxjKCLzO7gpoIvsyMqZnYCG6UK83oRvABl0MKwXEWcEmt4DF5PQgujVgRXBoAiLaCmxBw'
+        'Of4Q3ISueKkIjkmAzCoG8Jpfy2t+IZh8lj4AVJEPKxdj73U5c1/LUnhdDt/XsiZey5p4XY7j'
+        '17I4XsvieC2L43U5qSmSXSVO7Kud2Bv4kWkndlYOsICc2JgEVpITW585vRNbHwEl5cQeZwa2'
+        'NAY4sKXBygFWm7W6pKHpAMrOWjVzgGO1rVUzA6xIa5UogCOzrdUBjMO2VuPMjVmr8eH01uqY'
+        'rGxrFRq5XmsVGgBHVFurJAQ4mdpaJaEr9oO1GpPAkdDWqooJ6BBrVT5LH4Ad3NaqfAJs3LZW'
+        '5WM47WStykcTfWWt4gOwCSyk7fWyQi0kAJ32stY84NIZYMu9LBYPqI/A3nt57R4wK9y2B4zJ'
+        'tnx5tx4QE/358pY8oD6r9QGoHOSnY19yxxlgx75k0Xbuqnfnb12AzffNLyBf9je/A/K7Ab86'
+        'Tym/y4/4u+uAjQSdz/r45KzjI9iWxkQdv2eBFT/Q72XqvXu54h5DrDSx2RBzZWz6dOkDWBIK'
+        'n9k+fABjaPloEpRf4fDBtMoVzxM+mjhY+JyEOdg7O5gQsDz8O9EmPD6o8F51gHJsZ+TYzgeo'
+        'y9CILkMDsFRqotqVA5Qsio1kUQywEDGKHVPUTObWdFbQN5kBCk2R7PpF8G1H8IDcRCs4JkH5'
+        'FUbwmFa54oUhOCZuDsFNmJtDcBMClreL4CY8Plwzggd43wiO8wFePIJLA7AsBQQ3SmBNvFFF'
+        'qhPwRgypBizr5s1BpaoPBfRedYCV9IaOVDVRUm/2JDzX+l51gEX2xmXAxVR4X46J97L+ZosI'
+        'M1sILMTxSSFGlqEUWQKWpRlZXDnAGk3m1iSwWJM5gIlQ1moAqa1VTTk+tarprHA/1GqAJQ7n'
+        'NipgWfRwbqMAVj+cNQlsAzjHh0HbDlhA3i0O2AEM2nbA6jzfG3tnA8dq2zsx8Qmxd2bFV4G9'
+        'MyYmZds7Cc+AbHsnJoHjsO0dEgKceW3vkPD4IJW9M8DWtXfifIA9bO9AA+DUaXuHKIHtbe9I'
+        'dcz2jlQDnBZt70hVH+7Q3pGqzqzZO1LFRL+2vUO4wHlh7wygh9reiQ+jxN5hC4Ezxd5Rlslp'
+        '7yiLK1Czd5TlmELW3jGzgLnztgwtP0DK0PIbYBmq8/7X26JT56z4bnlbWeqcFQfZ2/JR5wAn'
+        '2ttrV2dMjLa3d6vOhgscdm+vQp0HqLc6u0Wu5a2E6qxPBuJbMRABgBiIoCkawCfAg8JntXwA'
+        '8IKPPgzWt1tlC4BbJXy14QDTjDMV9DZofBgPb323yQH91pJNM6kjwqCIAHBkR4QDMrKpur1E'
+        '1Q1YDnGqjpUDnOZUnSaBY52qOz6zBzRaHwHzHRoDfEuW432APBzvmMLD8Y7prMDM8T7Ar4Lj'
+        '3agAXxnleDcK4AfD8Y5J4JfD8X4y72MoXZuZFY6qdG1mTTm80rWZAXxdlE4fgJ8ZpQPkM/Op'
+        'ShusTzUPxU9XnRXeh3vlgNgwZRyPSRCngHHSZxo0PoB463PA9h7n7NnSGMBWLQ1WDsgOLQ1N'
+        'giRuacQnacwcQLSZXTkgQUTlnj5YiHIlvwMW2n2WIm5nXjvbWVALWbePoPHeKwo9NDLoh4aA'
+        '+CRsTYJa3Mok1ETqJHSFPcaEip/lzUWxmXZRDMCuKBYQwfQRsD18NAkiRskHE8zgY3gowkeT'
+        'oOEany59AMtKopD2SKSQAmBvIQmGvQdsnQEcwwN2eUB9BJzHA2IScNvlAWPiqB6Q8JzZA2IS'
+        'oHd5QH0Ayzb4cD6du3QGoALOAXZn2ykb2JRtp2TlAHqx7RRMAlqw7ZTxoeHaTjGzKzxp7BQz'
+        'Y6KZ2k4hyhU6pu2UDaz9tlPiLLDA204ZE1Xcdgo08qm2U6ABsFTbTiEhwHpsO4WErlB9bafE'
+        'JLDW2k5RMUFqre0U+bQ+ACur7RT5BFg+bafIx/AUS9sp8tGUGmk7BR+ANeIN7n99vH9vkBUe'
+        'Sx+v3RuMiUv2Bo1yhZv0Bgd4J94gzgKF9wZjQl1vUBp53HzU0hs0YWsSqJw3aEJXHNkfVfEG'
+        'MQk8OucK8MScCwB3zqUzr6+PvDiXPgL35FwnYTr0Y1ASnhUmx145wA/G7JWl2QtQvLCylybD'
+        'Zq/jw+CZhAK/Lp829Wf1AX5movzER3mAu0Z5TYLiFYbymCQU5Q2HWZTXJCheapyrTQhYftJy'
+        'rjbh8WFq5lwAP3I5l84H+LX7tGf+tGf+LL9/n/bwn9UH+CGku3cqujtAXejuAYzDsrv1ATDz'
+        'yu7OCs86uzsmtaO7CUdEuhuToFWT7tYHsPwwc4MtH4D6coMtH1Z4DHqDLR9W/K5zgy0fTQJa'
+        'p7xBEwKWjwBu0ITHh28aNxjgs4AbxPkA3wfcoDQAyxcDN2iUwKfDp734T3vxn/biP8tXxaet'
+        'gE9bAZ/lO+PTlsJn9QE+OHxvrPK9McAq8b0BSJX43tAZYLn43sAn1Hxv4APwmVm+N2aF12X5'
+        '3hiTJeV7I+HUlu+NmAS+78r3Bj4AX2rle0PnLp0BVpvvjXPA7WWntAcEUH92SntAfQC+Djxg'
+        'VngUeMCYrFE7pT0gJorVTmkPqE+XPgA/sGWnyAdgHdsp8mGFT1zZKfJhxQeinSIfTQI/MmWn'
+        'kBDgt6XsFBIeHwS2Uwb4vrRT4nyAD007BRoA53TZKUQJfIPaKSoGsMHsFDO3JoDzo+wUMwN8'
+        'uX5sFAsJQBN+rGsL6fhM730sFmm0PseUbvx4S9Jghf78qK40NrireFYOSAXd8wvoAnQJ8lP6'
+        'ALoAXYK4aAJ01VmJ16wcQGoz7wsmc0BYlJk15eVCZk1nJdDMARAial4aN4mNciXuRAHgGtMk'
+        'iEkA6QEhvZRutdIF8FZTug08XyudPgCYttJhyptI6TCdlWzeSjcAFn27gzQAPK1ufaWhT5rm'
+        'for/vLrrETzN0t3advjjik7bB6ftc4Dew/DR+QDDZtN044QnbMIFJrrHBbCohXtZmiP4U26R'
+        '1LmUxy0OYLOIMJtFBECzfUTQxKspfAL6OUBm4QNYlGT46APpO1u5BaA9xp0dDAcs++pOEM6C'
+        '+OIjaA9/L3tvNo0KEWFIRgSAckSEAyIHVbezUnUBjUBUnaYoRdVpOitoR9UFKCI6t5kBjazo'
+        'jIm3DTrH9Byg4ugcsOhvdMaHy0BntwC014POhgOWswmdcRZwJ6XOMXmp6Oymud0b5ZQloL3v'
+        'G8GUBeDF36gi1TbKleKxdHNiqeoMo7stl5tjSRWTBXQv5+kNQWgILKkbFiQEsDkJNVlt93Ic'
+        '323Z3W3Z3csBHVmm/ii/rRDlF2AhUn6CFCJRuxAd76sc7wP4yJTjHVMO4njHdFbQ3vE+wPJ1'
+        'vBsV4HejHO9GAaxsxzsmgSXueE9mHlT2Tst5gNNdzpoADnU5s3KAjWHvmBnAwC57B598qu2d'
+        'MT0H2EX2zgBmZ9k78aHB7B22ADgOy94hHOCoK3snzgLnWdk7Y7JR7R02TcfaO8oS4NQpe0dZ'
+        'ADazvSPVNsoVBknZO1LVmRaxd6Sqj8BJUPYONLJm70ADYAeXvUNCgI1b9g4JXXGU2DsxCewY'
+        'a3WVtTrAJrBWWTnAcXNb4NaqpgOYO7elquBtZlc4x22FKjhvP96Ht2Wo4JiW70NKTMFxRobb'
+        'glJwfASWj4JLI5rdVoSCm7A1CbxtBTehK77Vbi9QwTEJlBnFAI7IWy3h0/oInJW3qsCHFcSA'
+        'DybH6O3R4aOJeXp7iGyawXq7Z3wAJrZI9oR1wPbjgB3gqHXAAjJqHbAH7FH7Lf7W9/H59K3n'
+        'gEGAeg7IqynOkzHOgHEpnQMeHzDfWPQBPL5bvlnIiu+Wb8vjW/24IqEd3o8mmG2ToGLDpx59'
+        'AC37kJ9xE+d6dAY0B4tzwOOjggMGJEt5wAGPLwcOqA/g8cHAAbPig4EDxtSPK4rIATGRkgO6'
+        'aZ4ZHFAfQKv49/F58IWpfAIeXwVfCMonoL2nL5vLx/B+NHGOb3uF38dXwZcdSAhob/dLNAmP'
+        'D9f87ecA7/tboHE+wIsfGiE5NABtKUxUuXKANRHFhkoUAxCGYseUwyZzaToraJ/MACuJQton'
+        'oJAASW0hDWirDRqlD4A9pKEpwkJD01nheqERYI3auaus1S5rdQD9WtZql7WKj4A2LWs1JoFN'
+        'WdbqmOi8slYTnoYrazUmgX1W1io+APusrFX5AOiqslblw4pfYWtVPqzYe9aqfDQJ7IayVkkI'
+        'sOTLWiXh8eF+rNUBtq61GucD7GFrFRoAi66sVaIEtre1qmIACqqsVTOXJoB1VNaqmQEOha81'
+        'ouB79WtpKHiXgmMSWAgKHhO3reCE55IVHJPAK1VwEwK8NwU34fGh6r9ehYLjzEV9FVXBpRH/'
+        'r8opuFHlygHOr6+qQHW0+ioGVAM8MVRZcdh9PRZUAU69r3Sgqonx93XPhKeJvyZOOECXDfit'
+        'r7/jw6z8lujbdYBD89sOzcgyS5EloB2jkcWVA5ynyVyaBA7WZA4oU1OrAaamVjUlNbWq6ayw'
+        'GbUa4DiGcxkV0A5oOJdRACc1nDUJHNlwjo+kndgBkHZib+AD5HFi6wOQvRMbU9g7sTGdFc7j'
+        'xB7gx0DpyswBnlDpysyaAA4/M7NygJ8QpTMqwA5+lM4ogF8XpcMk8DOjdPX8Pqm56t+n+FL/'
+        '1vOcFT7Qe+UAbDFlII5JgNOAOOEzTRwfAN74HDDeOu8+wjmAMJ0FEwbYYS35LslvIMGSfFYO'
+        'gFdJHpMAOiV5faatJa+PICxK8uPMntIY4FbSYOUAdpCGJgGJpREf0pA5wGgyu3IAQYnK7f5q'
+        'SZQr/G7AsKnftgK2M0vbWfAwbMZHUHr/tlUyNOI9NATGT8LSJHiYMUmoydST0BX3+C33+G3L'
+        'LopNZBQDuGsUC3gYG/ApfQAPYwM+rDA/4INJZuFjOBTDR5Og5Ppbcv0tuf62bUAh7QwUUoDs'
+        'KSRB2HPA0hngMThgPR5QH4Hn4YCYBNz24wFj8qgckHDOzAExCcrDc0B9AG0P/5Yq/JYq/JYq'
+        '/JYq/LZ9bpv3Y5sPUBfbHBBdbPMN7HKjAhRIDcuoAfbio4Y6C1BKDfERKJkaxnQmJB3zqOGY'
+        'VFMNE46sahiTwJp91BAfgNX3qKHO9egMUGg11HkU/1UVowAo/ushjNrg73lo2AFh9je/gML2'
+        'VzrFZ5ziAyjC4nNMif+Li6azQsa/eg4wNZn3MpkDis3IrCm7klnTWQGSOUBCfyQ2KqCk+Ec+'
+        'owBy/SMIk0DSfyVpOdcj5wEo98gZUzLIGdNZgYicB3hUORsVoBiPnI0CqIKcMQmUQ84nc+4d'
+        'ymZmhbg/mZpZUzL9ScfMACT7MzE+ALX7Mzog2v3v4a8E5UppKn2Oc3434Pf5n7/P/wHF2T9S' ),
+}
+
+# Private dictionary of decoded tables, which is
+# filled lazily by "get_table_divs()".
+#
+#     ( rank, kind ) ---> list<Div>
+#
+_div_dct = {}
+
+
+def encode_divs( div_lst ):
+    '''
+    Parameters
+    ----------
+    div_lst : list<Div>
+        A list of "Div" objects whose coefficients 
+        are in the interval [-128,127].
+    
+    Returns
+    -------
+    str
+        The coefficients of the "Div" objects as
+        a zlib compressed and base64 encoded array 
+        of signed bytes.
+    '''
+    raw = bytearray( [ e % 256 for d in div_lst for e in d.e_tup ] )
+    return base64.b64encode( zlib.compress( bytes( raw ), 9 ) ).decode( 'ascii' )
+
+
+def decode_divs( enc, rank ):
+    '''
+    Parameters
+    ----------
+    enc : str
+        A string as returned by "encode_divs()".
+        
+    rank : int
+        The rank of the encoded "Div" objects.
+    
+    Returns
+    -------
+    list<Div>
+        The list of "Div" objects that was encoded.
+    '''
+    e_lst = array.array( 'b', zlib.decompress( base64.b64decode( enc ) ) ).tolist()
+    return [ Div( e_lst[i:i + rank] ) for i in range( 0, len( e_lst ), rank ) ]
+
+
+def get_table_divs( rank, kind ):
+    '''
+    Parameters
+    ----------
+    rank : int
+        An integer in [3,...,9].
+    
+    kind : str
+        Either 'roots', 'lines' or 'conics'.
+    
+    Returns
+    -------
+    list<Div>
+        A sorted list of "Div" objects as specified 
+        in the module documentation. The table is 
+        decoded at the first call for given rank 
+        and kind. A ValueError is raised if the 
+        version of the tables differs from "TABLE_VERSION".
+    '''
+    key = ( rank, kind )
+    if key not in _div_dct:
+
+        if _table_version != TABLE_VERSION:
+            raise ValueError( 'Table version differs from TABLE_VERSION: ', _table_version, TABLE_VERSION )
+
+        if key not in _table_dct:
+            raise ValueError( 'No precomputed table for (rank, kind) =', key )
+
+        num, enc = _table_dct[key]
+        div_lst = decode_divs( enc, rank )
+        if len( div_lst ) != num:
+            raise ValueError( 'Unexpected number of classes in table: ', key, len( div_lst ), num )
+        _div_dct[key] = div_lst
+
+    return list( _div_dct[key] )
+
+
+def get_roots( rank ):
+    '''
+    Parameters
+    ----------
+    rank : int
+        An integer in [3,...,9].
+    
+    Returns
+    -------
+    list<Div>
+        The positive (-2)-classes, which is 
+        the same list as the output of 
+            get_divs( get_ak( rank ), 0, -2, True )
+    '''
+    return get_table_divs( rank, 'roots' )
+
+
+def get_lines( rank ):
+    '''
+    Parameters
+    ----------
+    rank : int
+        An integer in [3,...,9].
+    
+    Returns
+    -------
+    list<Div>
+        The (-1)-classes, which is the same 
+        list as the output of
+            get_divs( get_ak( rank ), 1, -1, True )
+    '''
+    return get_table_divs( rank, 'lines' )
+
+
+def get_conics( rank ):
+    '''
+    Parameters
+    ----------
+    rank : int
+        An integer in [3,...,9].
+    
+    Returns
+    -------
+    list<Div>
+        The classes of conics, which is the same 
+        list as the output of
+            get_divs( get_ak( rank ), 2, 0, True )
+    '''
+    return get_table_divs( rank, 'conics' )
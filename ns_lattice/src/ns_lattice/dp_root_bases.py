@@ -9,8 +9,6 @@ of type either A1, A1+A2, A4, D5, E6, E7 or E8.
 '''
 import time
 
-from ns_lattice.sage_interface import sage_VectorSpace
-from ns_lattice.sage_interface import sage_QQ
 from ns_lattice.sage_interface import sage_Graph
 from ns_lattice.sage_interface import sage_Partitions
 from ns_lattice.sage_interface import sage_RootSystem
@@ -18,10 +16,13 @@ from ns_lattice.sage_interface import sage_Combinations
 from ns_lattice.sage_interface import sage_Permutations
 
 from ns_lattice.class_ns_tools import NSTools
+from ns_lattice.class_div import Div
 
 from ns_lattice.div_in_lattice import get_divs
 from ns_lattice.div_in_lattice import get_ak
 
+from ns_lattice.div_tables import get_roots
+
 
 def is_root_basis( d_lst ):
     '''
@@ -45,19 +46,16 @@ def is_root_basis( d_lst ):
         return True
 
     # check pairwise inner product
-    for i in range( len( d_lst ) ):
-        for j in range( len( d_lst ) ):
-            if d_lst[i] * d_lst[j] not in [0, 1, -2]:
-                return False
+    G = Div.get_gram_mat( d_lst, upper = True )
+    if not set( G.dict().values() ).issubset( [1, -2] ):
+        return False
 
     # check linear independence
     # Linear independent vectors with pairwise positive intersection product
     # must form a root basis. Thus vectors of positive roots in the corresponding
     # root system are all positive
     #
-    V = sage_VectorSpace( sage_QQ, d_lst[0].rank() )
-    W = V.subspace( [d.e_lst for d in d_lst] )
-    return W.rank() == len( d_lst )
+    return Div.get_mat( d_lst ).rank() == len( d_lst )
 
 
 def get_graph( d_lst ):
@@ -81,10 +79,8 @@ def get_graph( d_lst ):
     G = sage_Graph( loops=True )
     G.add_vertices( range( len( d_lst ) ) );
 
-    for i in range( len( d_lst ) ):
-        for j in range( len( d_lst ) ):
-            if d_lst[i] * d_lst[j] > 0 and i != j:
-                G.add_edge( i, j, d_lst[i] * d_lst[j] )
+    gram_dct = Div.get_gram_mat( d_lst, upper = True ).dict()
+    G.add_edges( [ ( i, j, v ) for ( i, j ), v in gram_dct.items() if v > 0 and i != j ] )
 
     return G
 
@@ -116,20 +112,177 @@ def get_ext_graph( d_lst, M ):
     G = sage_Graph( loops=True )
     G.add_vertices( range( len( d_lst ) ) )
 
-    for i in range( len( d_lst ) ):
-        for j in range( len( d_lst ) ):
-            if d_lst[i] * d_lst[j] != 0:
-                G.add_edge( i, j, d_lst[i] * d_lst[j] )
+    gram_dct = Div.get_gram_mat( d_lst, upper = True ).dict()
+    G.add_edges( [ ( i, j, v ) for ( i, j ), v in gram_dct.items() ] )
 
-    for i in range( len( d_lst ) ):
-        j = d_lst.index( d_lst[i].mat_mul( M ) )
-        G.add_edge( i, j, 1000 )
+    idx_dct = dict( [ ( d_lst[i], i ) for i in reversed( range( len( d_lst ) ) ) ] )
+    for i, md in enumerate( Div.mat_mul_many( d_lst, M ) ):
+        G.add_edge( i, idx_dct[md], 1000 )
 
     return G
 
 
+def get_graph_certificate( G ):
+    '''
+    Parameters
+    ----------
+    G : sage_Graph
+        A graph with integral edge labels such as 
+        the output of "get_ext_graph()".
+    
+    Returns
+    -------
+    tuple
+        A hashable certificate for the isomorphism class 
+        of "G" such that two graphs have the same certificate
+        if and only if they are isomorphic via an isomorphism
+        that preserves the edge labels. The certificate is 
+        obtained from the canonical labeling of "G" and is of
+        the form ( #vertices, ( (i,j,label), ... ) ).
+    '''
+    C = G.canonical_label( edge_labels = True, algorithm = 'sage' )
+    e_lst = []
+    for i, j, label in C.edges( labels = True ):
+        i, j = int( i ), int( j )
+        e_lst += [ ( min( i, j ), max( i, j ), int( label ) ) ]
+
+    return ( C.num_verts(), tuple( sorted( e_lst ) ) )
+
+
+def _get_type_string( t_lst ):
+    '''
+    Parameters
+    ----------
+    t_lst : list<tuple>
+        A sorted list of pairs ( letter, rank ) 
+        of irreducible Dynkin types.
+    
+    Returns
+    -------
+    string
+        The string for the Dynkin type.
+        Example: [(A,1),(A,1),(A,1),(A,3)] ---> '3A1+A3'
+    '''
+    tmp_lst = [t for t in t_lst]
+    ts = ''
+    while len( tmp_lst ) > 0:
+        t = tmp_lst[0]
+        c = tmp_lst.count( t )
+        while t in tmp_lst:
+            tmp_lst.remove( t )
+        if ts != '':
+            ts += '+'
+        if c > 1:
+            ts += str( c )
+
+        ts += t[0] + str( t[1] )
+
+    return ts
+
+
 def get_dynkin_type( d_lst ):
     '''
+    Parameters
+    ----------
+    d_lst : list<Div>
+        A list of lists of "Div" objects "d" of 
+        the same rank, such that 
+            d*d=-2 and d*(-3h+e1+...+er)=0 
+        where 
+            r=rank-1 and rank in [3,...,9].  
+        We assume that "is_root_basis(d_lst)==True":
+        linear independent, self intersection number -2
+        and pairwise product either 0 or 1.            
+                     
+    Returns
+    -------
+    string
+        Returns a string denoting the Dynkin type of a 
+        root system with basis "d_lst".  
+        Returns 'A0' if "d_lst==[]".
+    
+    Note
+    ----
+        For example:
+        [<1145>, <1123>, <23>, <45>, <56>, <78>] --> '3A1+A3'
+        where <1145> is shorthand for "Div.new('1145')".
+        
+        The type of each connected component of the Dynkin
+        diagram is read off from its number of vertices
+        and the lengths of the arms at its branch vertex.
+        See "get_dynkin_type_slow()" for a reference
+        implementation.
+        
+    Raises
+    ------
+    ValueError
+        If the Dynkin type of d_lst cannot be recognized.
+    '''
+    if d_lst == []: return 'A0'
+
+    # neighbors in the Dynkin diagram
+    n = len( d_lst )
+    nbr_lst = [ [] for i in range( n ) ]
+    for i in range( n ):
+        for j in range( i + 1, n ):
+            if d_lst[i] * d_lst[j] != 0:
+                nbr_lst[i] += [j]
+                nbr_lst[j] += [i]
+
+    # determine the type of each connected component
+    t_lst = []
+    visited_lst = n * [False]
+    for i in range( n ):
+        if visited_lst[i]:
+            continue
+
+        # collect the vertices of the component
+        c_lst = [i]
+        visited_lst[i] = True
+        for v in c_lst:
+            for w in nbr_lst[v]:
+                if not visited_lst[w]:
+                    visited_lst[w] = True
+                    c_lst += [w]
+
+        # a Dynkin diagram is a tree with at most one branch vertex
+        num_edges = sum( [ len( nbr_lst[v] ) for v in c_lst ] ) // 2
+        branch_lst = [ v for v in c_lst if len( nbr_lst[v] ) > 2 ]
+        if num_edges != len( c_lst ) - 1 or len( branch_lst ) > 1:
+            raise ValueError( 'Could not recognize Dynkin type: ', d_lst )
+
+        if branch_lst == []:
+            t_lst += [( 'A', len( c_lst ) )]
+            continue
+
+        # compute the lengths of the arms at the branch vertex
+        b = branch_lst[0]
+        arm_lst = []
+        for w in nbr_lst[b]:
+            prv, cur, length = b, w, 1
+            while len( nbr_lst[cur] ) == 2:
+                prv, cur = cur, [ u for u in nbr_lst[cur] if u != prv ][0]
+                length += 1
+            arm_lst += [length]
+        arm_lst.sort()
+
+        if len( arm_lst ) == 3 and arm_lst[:2] == [1, 1]:
+            t_lst += [( 'D', len( c_lst ) )]
+        elif len( arm_lst ) == 3 and arm_lst[:2] == [1, 2] and arm_lst[2] in [2, 3, 4]:
+            t_lst += [( 'E', len( c_lst ) )]
+        else:
+            raise ValueError( 'Could not recognize Dynkin type: ', d_lst )
+
+    return _get_type_string( sorted( t_lst ) )
+
+
+def get_dynkin_type_slow( d_lst ):
+    '''
+    This function has the same output as "get_dynkin_type()" and
+    is used for testing. It constructs a list of the graphs of all
+    Dynkin types of rank at most "rank-1" and compares the graph of
+    "d_lst" with each graph in this list for isomorphism. 
+    
     Parameters
     ----------
     d_lst : list<Div>
@@ -167,10 +320,10 @@ def get_dynkin_type( d_lst ):
     #
     construct_dynkin_types = True
     max_r = d_lst[0].rank() - 1
-    key = 'get_dynkin_type_' + str( max_r )
+    key = NSTools.get_key( 'get_dynkin_type', max_r )
     for r in range( max_r, 8 + 1 ):
-        if 'get_dynkin_type_' + str( r ) in NSTools.get_tool_dct():
-            key = 'get_dynkin_type_' + str( r )
+        if NSTools.get_key( 'get_dynkin_type', r ) in NSTools.get_tool_dct():
+            key = NSTools.get_key( 'get_dynkin_type', r )
             construct_dynkin_types = False
 
     # construct list of dynkin types if values are not cached
@@ -224,20 +377,7 @@ def get_dynkin_type( d_lst ):
                                 G.add_edge( i, j )
 
                     # obtain string for type
-                    # Example: [(A,1),(A,1),(A,1),(A,3)] ---> '3A1+A3'
-                    tmp_lst = [t for t in t_lst]
-                    ts = ''
-                    while len( tmp_lst ) > 0:
-                        t = tmp_lst[0]
-                        c = tmp_lst.count( t )
-                        while t in tmp_lst:
-                            tmp_lst.remove( t )
-                        if ts != '':
-                            ts += '+'
-                        if c > 1:
-                            ts += str( c )
-
-                        ts += t[0] + str( t[1] )
+                    ts = _get_type_string( t_lst )
 
                     # add to type_lst if new
                     if ts not in ts_lst:
@@ -349,12 +489,15 @@ def get_root_bases_orbit( d_lst, positive=True ):
     rank = d_lst[0].rank()
 
     # in cache?
-    key = 'get_root_bases_orbit_' + str( d_lst ) + '_' + str( rank )
+    key = NSTools.get_key( 'get_root_bases_orbit', d_lst, rank )
     if key in NSTools.get_tool_dct():
         return NSTools.get_tool_dct()[key]
 
     # obtain list of all positive (-2)-classes
-    m2_lst = get_divs( get_ak( rank ), 0, -2, True )
+    if 3 <= rank <= 9:
+        m2_lst = get_roots( rank )
+    else:
+        m2_lst = get_divs( get_ak( rank ), 0, -2, True )  # no precomputed table
     # m2_lst += [ m2.int_mul( -1 ) for m2 in m2_lst]
     NSTools.p( 'd_lst  =', len( d_lst ), d_lst, ', m2_lst =', len( m2_lst ), m2_lst )
 
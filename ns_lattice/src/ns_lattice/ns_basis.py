@@ -13,7 +13,9 @@ from ns_lattice.class_div import Div
 
 from ns_lattice.div_in_lattice import get_indecomp_divs
 from ns_lattice.div_in_lattice import get_ak
-from ns_lattice.div_in_lattice import get_divs
+from ns_lattice.div_in_lattice import iter_divs
+
+from ns_lattice.div_tables import get_lines
 
 from ns_lattice.class_eta import ETA
 
@@ -67,7 +69,7 @@ def get_bases_lst( a_lst, M, d_lst, m1_lst, perm=False ):
         If "a_lst==[]" then "[[]]" is returned.   
                
     '''
-    key = 'get_bases_lst__' + str( ( a_lst, M, d_lst, m1_lst, perm ) ) + '__' + str( M.rank() )
+    key = NSTools.get_key( 'get_bases_lst', a_lst, M, d_lst, m1_lst, perm )
     if key in NSTools.get_tool_dct():
         return NSTools.get_tool_dct()[key]
 
@@ -78,17 +80,19 @@ def get_bases_lst( a_lst, M, d_lst, m1_lst, perm=False ):
         return [tuple( a_lst )]
 
     e_lst = []
-    for m1 in get_indecomp_divs( m1_lst, d_lst ):
+    Me_lst = []
+    im1_lst = get_indecomp_divs( m1_lst, d_lst )
+    for m1, Mm1 in zip( im1_lst, Div.mat_mul_many( im1_lst, M ) ):
         if set( [ m1 * a for a in a_lst ] ) != {0}:
             continue
-        if m1 * m1.mat_mul( M ) > 0:
+        if m1 * Mm1 > 0:
             continue
         e_lst += [m1]
+        Me_lst += [Mm1]
 
     bas_lst = []
-    for e in e_lst:
+    for e, Me in zip( e_lst, Me_lst ):
 
-        Me = e.mat_mul( M )
         new_d_lst = [ d for d in d_lst if d * e == d * Me == 0 ]
         new_m1_lst = [ m1 for m1 in m1_lst if m1 * e == m1 * Me == 0 ]
         add_lst = [e]
@@ -138,17 +142,17 @@ def get_webs( dpl ):
         For each index i, the i-th entry of each list of Div object corresponds
         to the same family of conics.          
     '''
-    key = 'get_webs__' + str( dpl ).replace( '\n', '---' )
+    key = NSTools.get_key( 'get_webs', dpl )
     if key in NSTools.get_tool_dct():
         return NSTools.get_tool_dct()[key]
 
     ak = get_ak( dpl.get_rank() )
-    all_m1_lst = get_divs( ak, 1, -1, True )
+    all_m1_lst = get_lines( dpl.get_rank() )
     akc, cc = ( 3, 1 )
     M = sage_identity_matrix( dpl.get_rank() )
 
     fam_lst_lst = []
-    for e0 in get_divs( ak, akc, cc, True ):
+    for e0 in iter_divs( ak, akc, cc, True, 'backtrack' ):
         NSTools.p( 'e0 =', e0 )
         for B_lst in get_bases_lst( [e0], M, dpl.d_lst, all_m1_lst, True ):
             B = sage_matrix( sage_ZZ, [ d.e_lst for d in B_lst ] )
@@ -194,7 +198,7 @@ def contains_perm( f_lst_lst, c_lst ):
         return [] in f_lst_lst
 
     for perm in sage_Permutations( range( c_lst[0].rank() - 1 ) ):
-        pc_lst = [ Div( [c[0]] + [ c[i + 1] for i in perm ], c.rank() ) for c in c_lst ]
+        pc_lst = [ Div( [c[0]] + [ c[i + 1] for i in perm ] ) for c in c_lst ]
         for f_lst in f_lst_lst:
             if set( f_lst ) == set( pc_lst ):
                 return True
@@ -219,13 +223,22 @@ def triples( dpl, mval ):
                 with the property that a*e==b*e==c*e==0.
             (2) 1 <= max( a*b, a*c, b*c ) <= mval.
     '''
-    key = 'triples__' + str( dpl ).replace( '\n', '---' ) + '---' + str( mval )
+    key = NSTools.get_key( 'triples', dpl, mval )
     if key in NSTools.get_tool_dct():
         return NSTools.get_tool_dct()[key]
 
     f_lst = dpl.fam_lst
     e_lst = dpl.m1_lst
 
+    # pairwise intersection products of f_lst with itself and with e_lst
+    ff_mat = Div.get_gram_mat( f_lst )
+    fe_mat = Div.get_gram_mat( f_lst, e_lst )
+
+    # The i-th bit of "orth_lst[idx]" is set iff f_lst[idx]*e_lst[i]==0.
+    orth_lst = []
+    for row in fe_mat.rows():
+        orth_lst += [ sum( [ 1 << i for i in range( len( e_lst ) ) if row[i] == 0 ] ) ]
+
     # obtain list of triples (a,b,c) in f_lst
     # that are not orthogonal to any element in e_lst
     t_lst = []
@@ -234,21 +247,18 @@ def triples( dpl, mval ):
     for idx_lst in idx_lst_lst:
         eta.update( 't_lst' )
 
-        t = [ f_lst[idx] for idx in idx_lst ]
-        if t[0] * t[1] > mval: continue
-        if t[0] * t[2] > mval: continue
-        if t[1] * t[2] > mval: continue
+        i, j, k = idx_lst
+        if ff_mat[i, j] > mval: continue
+        if ff_mat[i, k] > mval: continue
+        if ff_mat[j, k] > mval: continue
 
         # elements in f_lst correspond to divisor classes of curves on a
         # surface and thus t[i]*t[j]>=1 for all i,j \in {0,1,2} so that i!=j.
 
-        cont = False
-        for e in e_lst:
-            if [f * e for f in t] == [0, 0, 0]:
-                cont = True
-                break
-        if cont: continue
+        if orth_lst[i] & orth_lst[j] & orth_lst[k] != 0:
+            continue
 
+        t = [ f_lst[idx] for idx in idx_lst ]
         if not contains_perm( t_lst, t ):
             t_lst += [t]
 
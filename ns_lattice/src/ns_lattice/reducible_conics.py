@@ -41,12 +41,7 @@ def get_reducible_conics( dpl ):
     '''
     # check if input was already computed
     #
-    key = 'get_reducible_conics_'
-    key += str( dpl.get_rank() ) + '_'
-    key += dpl.get_marked_Mtype() + '_'
-    key += dpl.get_real_type() + '_'
-    key += str( dpl.get_numbers()[-2] ) + '_'  # len(self.real_m1_lst)
-    key += str( dpl.get_numbers()[-1] )  # len(self.real_fam_lst)
+    key = NSTools.get_key( 'get_reducible_conics', dpl )
     if key in NSTools.get_tool_dct():
         return NSTools.get_tool_dct()[key]
 
@@ -67,7 +62,7 @@ def get_reducible_conics( dpl ):
     # cache output
     #
     NSTools.get_tool_dct()[key] = f_dct
-    NSTools.save_tool_dct()  # this takes a lot of time
+    NSTools.save_tool_dct()
 
     return f_dct
 
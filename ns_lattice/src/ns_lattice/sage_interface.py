@@ -60,6 +60,16 @@ def sage_load( *args, **kwargs ):
     return load( *args, **kwargs )
 
 
+# from sage.misc.persist import dumps
+def sage_dumps( *args, **kwargs ):
+    return dumps( *args, **kwargs )
+
+
+# from sage.misc.persist import loads
+def sage_loads( *args, **kwargs ):
+    return loads( *args, **kwargs )
+
+
 # from sage.structure.sage_object import register_unpickle_override
 def sage_register_unpickle_override( *args, **kwargs ):
     register_unpickle_override( *args, **kwargs )
@@ -6,6 +6,7 @@ Created on Feb 8, 2017
 
 from ns_lattice.sage_interface import sage_ZZ
 from ns_lattice.sage_interface import sage_matrix
+from ns_lattice.sage_interface import sage_vector
 
 from ns_lattice.class_div import Div
 
@@ -87,6 +88,127 @@ class TestClassDiv:
         assert Div.new( '2e0-e2-e3-e4-e5', 6 ).get_basis_change( B ).get_label() == 'e0+2e1-e2-e3-e4-e5'
 
 
+    def test__mul( self ):
+
+        B = sage_matrix( sage_ZZ, [( 1, -1, 0, 0, 0, 0 ),
+                                   ( 1, 0, -1, 0, 0, 0 ),
+                                   ( 1, -1, -1, 0, 0, 0 ),
+                                   ( 0, 0, 0, 1, 0, 0 ),
+                                   ( 0, 0, 0, 0, 1, 0 ),
+                                   ( 0, 0, 0, 0, 0, 1 )] )
+
+        lbl_lst = ['12', '1123', 'e1', 'e0-e1', '2e0-e1-e2-e3-e4-e5', '-3e0+e1+e2+e3+e4+e5']
+        c_lst = [ Div.new( lbl, 6 ) for lbl in lbl_lst ]
+        cB_lst = [ c.get_basis_change( B ) for c in c_lst ]
+
+        assert c_lst[0].std_int
+        assert not cB_lst[0].std_int
+
+        for a_lst in [c_lst, cB_lst]:
+            for a in a_lst:
+                for b in a_lst:
+                    row_vec = sage_vector( sage_ZZ, a.e_lst ).row()
+                    col_vec = sage_vector( sage_ZZ, b.e_lst ).column()
+                    assert a * b == ( row_vec * a.int_mat * col_vec )[0][0]
+
+        for i in range( len( c_lst ) ):
+            for j in range( len( c_lst ) ):
+                assert c_lst[i] * c_lst[j] == cB_lst[i] * cB_lst[j]
+
+
+    def test__mat_mul_many( self ):
+
+        M = sage_matrix( [( 2, 1, 1, 1, 0, 0 ),
+                          ( -1, 0, -1, -1, 0, 0 ),
+                          ( -1, -1, 0, -1, 0, 0 ),
+                          ( -1, -1, -1, 0, 0, 0 ),
+                          ( 0, 0, 0, 0, 0, 1 ),
+                          ( 0, 0, 0, 0, 1, 0 )] )
+
+        c_lst = [ Div.new( lbl, 6 ) for lbl in ['e4-e5', 'e2-e4', 'e2-e3', 'e0-e1', 'e5'] ]
+        chk_lst = [ c.mat_mul( M ) for c in c_lst ]
+
+        assert Div.mat_mul_many( c_lst, M ) == chk_lst
+        assert Div.mat_mul_many( [], M ) == []
+
+        out_lst, fixed_lst = Div.mat_mul_many( c_lst, M, True )
+        assert out_lst == chk_lst
+        assert fixed_lst == [ c == mc for c, mc in zip( c_lst, chk_lst ) ]
+        assert fixed_lst == [False, False, True, True, False]
+
+
+    def test__get_gram_mat( self ):
+
+        B = sage_matrix( sage_ZZ, [( 1, -1, 0, 0, 0, 0 ),
+                                   ( 1, 0, -1, 0, 0, 0 ),
+                                   ( 1, -1, -1, 0, 0, 0 ),
+                                   ( 0, 0, 0, 1, 0, 0 ),
+                                   ( 0, 0, 0, 0, 1, 0 ),
+                                   ( 0, 0, 0, 0, 0, 1 )] )
+
+        lbl_lst = ['12', '1123', 'e1', 'e0-e1', '2e0-e1-e2-e3-e4-e5']
+        c_lst = [ Div.new( lbl, 6 ) for lbl in lbl_lst ]
+        cB_lst = [ c.get_basis_change( B ) for c in c_lst ]
+        n = len( c_lst )
+
+        for a_lst in [c_lst, cB_lst]:
+            G = Div.get_gram_mat( a_lst )
+            assert list( G ) == list( Div.get_gram_mat( a_lst, a_lst ) )
+            assert [ [ G[i, j] for j in range( n ) ] for i in range( n ) ] == [ [ a * b for b in a_lst ] for a in a_lst ]
+
+            U = Div.get_gram_mat( a_lst, upper = True )
+            assert [ U[i, j] for i in range( n ) for j in range( n ) ] == [ G[i, j] if i <= j else 0 for i in range( n ) for j in range( n ) ]
+
+        G = Div.get_gram_mat( c_lst[:2], c_lst[2:] )
+        assert G.nrows() == 2 and G.ncols() == 3
+        assert G[1, 2] == c_lst[1] * c_lst[4]
+
+        A = Div.get_gram_mat( c_lst, dtype = 'int16' )
+        assert str( A.dtype ) == 'int16'
+        assert A.tolist() == [ [ a * b for b in c_lst ] for a in c_lst ]
+
+        assert Div.get_gram_mat( [] ).nrows() == 0
+
+
+    def test__int_mat( self ):
+
+        B = sage_matrix( sage_ZZ, [( 1, -1, 0, 0 ),
+                                   ( 1, 0, -1, 0 ),
+                                   ( 0, 0, 0, 1 ),
+                                   ( 1, -1, -1, 0 )] )
+
+        c = Div.new( '12', 4 )
+        assert c.int_key == None
+        assert c.int_mat is Div.get_int_mat( 4 )
+        assert Div( c.e_lst, c.int_mat ).int_key == None
+
+        c1 = Div.new( 'e1', 4 ).get_basis_change( B )
+        c2 = Div.new( 'e2', 4 ).get_basis_change( B )
+        assert c1.int_key != None
+        assert c1.int_key == c2.int_key
+        assert c1.int_mat is c2.int_mat
+        assert str( list( c1.int_mat ) ) == '[(0, 1, 0, 0), (1, 0, 0, 0), (0, 0, -1, 0), (0, 0, 0, -1)]'
+
+
+    def test__hash( self ):
+
+        c1 = Div.new( '1123', 6 )
+        c2 = Div( [1, -1, -1, -1, 0, 0] )
+        c3 = Div.new( '1123' )
+
+        assert c1 == c2 and hash( c1 ) == hash( c2 )
+        assert c1 != c3
+        assert len( set( [c1, c2, c3] ) ) == 2
+        assert { c1: 'a' }[c2] == 'a'
+        assert c1.e_tup == ( 1, -1, -1, -1, 0, 0 )
+
+        try:
+            c1.e_tup = ( 0, 0, 0, 0, 0, 0 )
+            assert False
+        except AttributeError:
+            pass
+
+
     def test__is_positive( self ):
         assert Div.new( 'e0-e1', 6 ).is_positive()
         assert Div.new( 'e1-e2', 6 ).is_positive()
@@ -12,6 +12,7 @@ from ns_lattice.class_div import Div
 
 from ns_lattice.dp_involutions import complete_basis
 from ns_lattice.sage_interface import sage_vector
+from ns_lattice.sage_interface import sage_VectorSpace
 from ns_lattice.div_in_lattice import get_divs
 from ns_lattice.div_in_lattice import get_ak
 from ns_lattice.sage_interface import sage_ZZ
@@ -20,6 +21,13 @@ from ns_lattice.class_ns_tools import NSTools
 
 from ns_lattice.class_dp_lattice import DPLattice
 
+from ns_lattice.class_work_queue import SQLiteWorkQueue
+
+import os
+import pickle
+import shutil
+import tempfile
+
 
 class TestClassDPLattice():
 
@@ -38,6 +46,68 @@ class TestClassDPLattice():
 
         NSTools.set_enable_tool_dct( True )
 
+    def test__lazy_attributes( self ):
+        NSTools.set_enable_tool_dct( False )
+
+        M = sage_identity_matrix( sage_QQ, 4 )
+        dpl = DPLattice( [Div.new( '23', 4 )], [], M )
+        assert dpl.__dict__['m1_lst'] is None
+
+        # only the attributes that are accessed are computed
+        assert len( dpl.m1_lst ) == 4
+        assert dpl.__dict__['m1_lst'] is dpl.m1_lst
+        assert dpl.__dict__['fam_lst'] is None
+        assert dpl.__dict__['sr_lst'] is None
+        assert dpl.__dict__['G'] is None
+
+        # assigning None resets an attribute
+        dpl.m1_lst = None
+        assert dpl.__dict__['m1_lst'] is None
+        assert len( dpl.m1_lst ) == 4
+
+        # computed attributes are pickled
+        dpl2 = pickle.loads( pickle.dumps( dpl ) )
+        assert dpl2.__dict__['m1_lst'] == dpl.m1_lst
+        assert dpl2.__dict__['fam_lst'] is None
+        assert len( dpl2.real_m1_lst ) == 4
+
+        NSTools.set_enable_tool_dct( True )
+
+    def test__or_lst_sr_lst( self ):
+        NSTools.set_enable_tool_dct( False )
+
+        rank = 7
+        M = sage_identity_matrix( sage_QQ, rank )
+        r_lst = get_divs( get_ak( rank ), 0, -2, True )
+        for d_lst in [ [], ['12'], ['12', '34'], ['12', '23', '1145'], ['1123', '1456', '23'] ]:
+            d_lst = [ Div.new( d, rank ) for d in d_lst ]
+            dpl = DPLattice( d_lst, [], M )
+
+            or_lst = [ r for r in r_lst if [ r * d for d in d_lst ] == len( d_lst ) * [0] ]
+            W = sage_VectorSpace( sage_QQ, rank ).subspace( [ d.e_lst for d in d_lst ] )
+            sr_lst = [ r for r in r_lst if sage_vector( r.e_lst ) in W ]
+
+            assert dpl.or_lst == or_lst
+            assert dpl.sr_lst == sr_lst
+
+        NSTools.set_enable_tool_dct( True )
+
+    def test__get_certificate( self ):
+        NSTools.set_enable_tool_dct( False )
+
+        M = sage_identity_matrix( sage_QQ, 4 )
+        dpl23 = DPLattice( [Div.new( '23', 4 )], [], M )
+        dpl1123 = DPLattice( [Div.new( '1123', 4 )], [], M )
+        dpl12 = DPLattice( [Div.new( '12', 4 )], [], M )
+
+        assert dpl23.get_fingerprint() == dpl12.get_fingerprint()
+        assert dpl23.get_fingerprint() != dpl1123.get_fingerprint()
+        assert hash( dpl23.get_fingerprint() ) == hash( dpl12.get_fingerprint() )
+        assert dpl23.get_certificate() == dpl12.get_certificate()
+        assert dpl23.get_certificate() != dpl1123.get_certificate()
+
+        NSTools.set_enable_tool_dct( True )
+
     def test__get_marked_Mtype( self ):
         NSTools.set_enable_tool_dct( False )
 
@@ -234,6 +304,64 @@ class TestClassDPLattice():
 
         NSTools.set_enable_tool_dct( True )
 
+    def test__get_cls__parallel( self ):
+        NSTools.set_enable_tool_dct( False )
+        for rank in [4, 5]:
+            NSTools.set_num_procs( 1 )
+            chk_lst = DPLattice.get_cls( rank )
+            NSTools.set_num_procs( 3 )
+            out_lst = DPLattice.get_cls( rank )
+            NSTools.set_num_procs( 1 )
+            assert [ dpl.get_cache_key() for dpl in out_lst ] == [ dpl.get_cache_key() for dpl in chk_lst ]
+        NSTools.set_enable_tool_dct( True )
+
+
+    def test__reduce_cls( self ):
+        NSTools.set_enable_tool_dct( False )
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            queue = SQLiteWorkQueue( os.path.join( tmp_dir, 'queue' ) )
+            assert DPLattice.put_cls_units( 5, queue, 3 ) > 0
+            assert DPLattice.run_cls_worker( queue ) == queue.get_num()
+            out_lst = DPLattice.reduce_cls( 5, queue )
+            chk_lst = DPLattice.get_cls( 5 )
+            assert len( out_lst ) == len( chk_lst )
+            for dpl in out_lst:
+                assert dpl in chk_lst
+        finally:
+            shutil.rmtree( tmp_dir )
+        NSTools.set_enable_tool_dct( True )
+
+
+    def test__reduce_cls__interrupted( self ):
+        NSTools.set_enable_tool_dct( False )
+
+        # a queue that is interrupted before the last unit is added
+        class InterruptedQueue( SQLiteWorkQueue ):
+            def put_lst( self, item_lst ):
+                SQLiteWorkQueue.put_lst( self, item_lst[:-1] )
+                raise KeyboardInterrupt()
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            queue = InterruptedQueue( os.path.join( tmp_dir, 'queue' ) )
+            try:
+                DPLattice.put_cls_units( 5, queue, 3 )
+                assert False
+            except KeyboardInterrupt:
+                pass
+            assert queue.get_num() > 0
+            DPLattice.run_cls_worker( queue )
+            try:
+                DPLattice.reduce_cls( 5, queue )
+                assert False
+            except ValueError:
+                pass
+        finally:
+            shutil.rmtree( tmp_dir )
+        NSTools.set_enable_tool_dct( True )
+
+
     def test__get_real_type( self ):
         NSTools.set_enable_tool_dct( False )
 
@@ -0,0 +1,51 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 17, 2026
+@author: Niels Lubbes
+'''
+
+from ns_lattice.sage_interface import sage_QQ
+from ns_lattice.sage_interface import sage_identity_matrix
+
+from ns_lattice.class_ns_tools import NSTools
+
+from ns_lattice.class_div import Div
+
+from ns_lattice.class_dp_lattice import DPLattice
+
+from ns_lattice.class_dp_lattice_set import DPLatticeSet
+
+
+class TestClassDPLatticeSet:
+
+    def test__add( self ):
+        NSTools.set_enable_tool_dct( False )
+
+        M = sage_identity_matrix( sage_QQ, 4 )
+        dpl23 = DPLattice( [Div.new( '23', 4 )], [], M )
+        dpl1123 = DPLattice( [Div.new( '1123', 4 )], [], M )
+        dpl12 = DPLattice( [Div.new( '12', 4 )], [], M )
+
+        dpl_set = DPLatticeSet( [dpl23] )
+        assert dpl12 in dpl_set
+        assert dpl1123 not in dpl_set
+        assert dpl_set.find( dpl12 ) is dpl23
+
+        assert not dpl_set.add( dpl12 )
+        assert dpl_set.add( dpl1123 )
+        assert len( dpl_set ) == 2
+        assert list( dpl_set ) == [dpl23, dpl1123]
+
+        dpl_set.remove( dpl23 )
+        assert dpl12 not in dpl_set
+        assert dpl_set.dpl_lst == [dpl1123]
+
+        NSTools.set_enable_tool_dct( True )
+
+
+if __name__ == '__main__':
+
+    NSTools.filter( None )
+    TestClassDPLatticeSet().test__add()
+
+    pass
@@ -4,8 +4,14 @@ Created on Feb 13, 2017
 @author: Niels Lubbes
 '''
 
+from ns_lattice.sage_interface import sage_identity_matrix
+
 from ns_lattice.class_ns_tools import NSTools
 
+from ns_lattice.class_div import Div
+
+import ast
+
 
 class TestClassNSTools:
 
@@ -54,3 +60,82 @@ class TestClassNSTools:
         assert key in nt2.get_tool_dct( fname = test_fname )
 
 
+    def test__num_procs( self ):
+
+        assert NSTools.get_num_procs() == 1
+
+        NSTools.set_num_procs( 4 )
+        assert NSTools.get_num_procs() == 4
+
+        NSTools.set_num_procs( None )
+        assert NSTools.get_num_procs() >= 1
+
+        try:
+            NSTools.set_num_procs( 0 )
+            assert False
+        except ValueError:
+            pass
+
+        NSTools.set_num_procs( 1 )
+        assert NSTools.get_num_procs() == 1
+
+
+    def test__flush_policy( self ):
+
+        test_fname = 'test_tools'
+        key = 'test__flush_policy'
+        store = NSTools.get_tool_dct( fname = test_fname )
+
+        NSTools.set_flush_policy( 2, None )
+        store[key] = 1
+        NSTools.save_tool_dct( fname = test_fname )
+        assert store.get_num_dirty() == 1
+        store[key + '2'] = 2
+        NSTools.save_tool_dct( fname = test_fname )
+        assert store.get_num_dirty() == 0
+
+        NSTools.set_flush_policy( 1, None )
+        with NSTools.deferred_save():
+            store[key] = 3
+            NSTools.save_tool_dct( fname = test_fname )
+            assert store.get_num_dirty() == 1
+        assert store.get_num_dirty() == 0
+
+        del store[key]
+        del store[key + '2']
+
+
+    def test__get_key( self ):
+
+        assert NSTools.get_key( 'get_cls', 9 ) == ( 'get_cls', 9 )
+
+        d = Div.new( 'e0-e1', 3 )
+        key = NSTools.get_key( 'get_divs', d, 1, -1, True )
+        assert key == ( 'get_divs', ( 1, -1, 0 ), 1, -1, True )
+
+        M = sage_identity_matrix( 3 )
+        key = NSTools.get_key( 'get_bases_lst', [d], M, [], False )
+        assert key[1] == ( ( 1, -1, 0 ), )
+        assert key[2][:2] == ( 3, 3 )
+        assert key == NSTools.get_key( 'get_bases_lst', ( d, ), sage_identity_matrix( 3 ), [], False )
+        assert key != NSTools.get_key( 'get_bases_lst', [d], -M, [], False )
+        assert ast.literal_eval( repr( key ) ) == key
+
+
+    def test__convert_legacy_key( self ):
+
+        assert NSTools.convert_legacy_key( 'get_cls_9', [] ) == ( 'get_cls', 9 )
+        assert NSTools.convert_legacy_key( 'get_cls_slow__4', [] ) == ( 'get_cls_slow', 4 )
+        assert NSTools.convert_legacy_key( 'get_bas_lst__5', [] ) == ( 'get_bas_lst', 5 )
+        assert NSTools.convert_legacy_key( 'get_inv_lst__6', [] ) == ( 'get_inv_lst', 6 )
+        assert NSTools.convert_legacy_key( ( 'get_cls', 9 ), [] ) == ( 'get_cls', 9 )
+        assert NSTools.convert_legacy_key( 'get_webs__x', [] ) == None
+
+        d = Div.new( 'e0-e1', 3 )
+        key = 'get_divs_' + str( ( d, 1, -1, True ) )
+        assert NSTools.convert_legacy_key( key, [ Div.new( 'e2', 3 ) ] ) == NSTools.get_key( 'get_divs', d, 1, -1, True )
+        assert NSTools.convert_legacy_key( key, [] ) == None
+
+        key = 'get_bases_lst__([e0-e1], [1 0 0]\n[0 1 0]\n[0 0 1], [], [e1, e2], False)__3'
+        chk_key = NSTools.get_key( 'get_bases_lst', [d], sage_identity_matrix( 3 ), [], [Div.new( 'e1', 3 ), Div.new( 'e2', 3 )], False )
+        assert NSTools.convert_legacy_key( key, [] ) == chk_key
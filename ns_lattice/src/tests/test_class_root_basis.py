@@ -0,0 +1,60 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 17, 2026
+@author: Niels Lubbes
+'''
+from ns_lattice.class_div import Div
+
+from ns_lattice.div_tables import get_roots
+
+from ns_lattice.dp_root_bases import is_root_basis
+
+from ns_lattice.class_root_basis import RootBasisValidator
+
+
+class TestClassRootBasis:
+
+
+    def test__push( self ):
+
+        val = RootBasisValidator()
+        assert val.push( Div.new( '1123', 4 ) )
+        assert val.push( Div.new( '23', 4 ) )
+        assert not val.push( Div.new( '1123', 4 ) )
+        assert not val.push( Div.new( '-23', 4 ) )
+        assert not val.push( Div.new( 'e3', 4 ) )  # not a root
+        assert val.d_lst == [ Div.new( '1123', 4 ), Div.new( '23', 4 ) ]
+
+        assert val.pop() == Div.new( '23', 4 )
+        assert not val.push_lst( [ Div.new( '12', 4 ), Div.new( '-23', 4 ) ] )
+        assert len( val ) == 1
+
+
+    def test__push__is_root_basis( self ):
+
+        # compare with is_root_basis() for all sequences of roots
+        # of length at most 3 that start with a root basis
+        r_lst = get_roots( 5 )
+        val = RootBasisValidator()
+        for r1 in r_lst:
+            assert val.push( r1 )
+            for r2 in r_lst:
+                if not val.push( r2 ):
+                    assert not is_root_basis( [r1, r2] )
+                    continue
+                assert is_root_basis( [r1, r2] )
+                for r3 in r_lst:
+                    out = val.push( r3 )
+                    assert out == is_root_basis( [r1, r2, r3] )
+                    if out:
+                        val.pop()
+                val.pop()
+            val.pop()
+        assert len( val ) == 0
+
+
+if __name__ == '__main__':
+
+    TestClassRootBasis().test__push()
+
+    pass
@@ -0,0 +1,212 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 17, 2026
+@author: Niels Lubbes
+'''
+from ns_lattice.sage_interface import sage_save
+
+from ns_lattice.class_div import Div
+
+from ns_lattice.class_tool_store import ToolStore
+
+import os
+import shutil
+import tempfile
+
+
+class TestClassToolStore:
+
+
+    def test__store( self ):
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            file_name = os.path.join( tmp_dir, 'store' )
+
+            ts = ToolStore( file_name )
+            assert len( ts ) == 0
+            assert 'a' not in ts
+
+            ts['a'] = [ Div.new( '12', 4 ) ]
+            ts[( 'b', 3 )] = { 'c': 1 }
+            assert ts['a'] is ts['a']
+            assert sorted( [ str( key ) for key in ts.keys() ] ) == [ "('b', 3)", 'a' ]
+
+            # values are loaded lazily by a new store
+            ts2 = ToolStore( file_name )
+            assert len( ts2 ) == 2
+            assert ts2['a'] == [ Div.new( '12', 4 ) ]
+            assert ts2[( 'b', 3 )] == { 'c': 1 }
+            assert ts2.get( 'x', 5 ) == 5
+
+            # values modified in place are stored by sync()
+            ts['a'].append( Div.new( '13', 4 ) )
+            assert len( ToolStore( file_name )['a'] ) == 1
+            ts.sync( 'a' )
+            assert len( ToolStore( file_name )['a'] ) == 2
+
+            del ts['a']
+            assert 'a' not in ts and 'a' not in ToolStore( file_name )
+            try:
+                del ts['a']
+                assert False
+            except KeyError:
+                pass
+
+            ts.clear()
+            assert len( ToolStore( file_name ) ) == 0
+
+        finally:
+            shutil.rmtree( tmp_dir )
+
+
+    def test__write_behind( self ):
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            file_name = os.path.join( tmp_dir, 'store' )
+
+            ts = ToolStore( file_name, True )
+            ts['a'] = 1
+            ts['b'] = 2
+            assert ts.get_num_dirty() == 2
+            assert ts['a'] == 1 and 'b' in ts and len( ts ) == 2
+            assert len( ToolStore( file_name ) ) == 0
+
+            ts.flush()
+            assert ts.get_num_dirty() == 0
+            assert ToolStore( file_name )['b'] == 2
+
+            ts['b'] = 3
+            del ts['b']
+            assert ts.get_num_dirty() == 0
+            assert sorted( ToolStore( file_name ).keys() ) == ['a']
+
+        finally:
+            shutil.rmtree( tmp_dir )
+
+
+    def test__mem_policy( self ):
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            file_name = os.path.join( tmp_dir, 'store' )
+
+            ts = ToolStore( file_name )
+            for i in range( 10 ):
+                ts[( 'a', i )] = 1000 * [i]
+                ts[( 'b', i )] = 1000 * [i]
+            size = ts.get_mem_size( 'a' )
+            assert size > 0 and ts.get_mem_size() == 2 * size
+
+            # quota for namespace 'a' and pinned namespace 'b'
+            ts.set_mem_policy( None, { 'a': size // 2 }, [ 'b' ] )
+            assert 0 < ts.get_mem_size( 'a' ) <= size // 2
+            assert ts.get_mem_size( 'b' ) == size
+
+            # least recently used values are evicted and reloaded
+            val = ts[( 'a', 9 )]
+            assert ts[( 'a', 9 )] is val
+            assert ts[( 'a', 0 )] == 1000 * [0]
+            assert ts[( 'a', 9 )] is val
+
+            ts.set_mem_policy( size // 2 )
+            assert ts.get_mem_size() <= size // 2
+            assert len( ts ) == 20
+            assert ts[( 'b', 3 )] == 1000 * [3]
+
+            # values that are not yet written are not evicted
+            ts2 = ToolStore( file_name, True )
+            ts2.set_mem_policy( 0 )
+            ts2[( 'c', 0 )] = 5
+            assert ts2.get_num_dirty() == 1 and ts2.get_mem_size() == 0
+            ts2.flush()
+            assert ToolStore( file_name )[( 'c', 0 )] == 5
+
+        finally:
+            shutil.rmtree( tmp_dir )
+
+
+    def test__stats( self ):
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            file_name = os.path.join( tmp_dir, 'store' )
+
+            ts = ToolStore( file_name, True )
+            ts[( 'a', 1 )] = 1
+            ts[( 'a', 2 )] = 2
+            ts[( 'b', 1 )] = 3
+            ts['c'] = 4
+            assert ( 'a', 1 ) in ts and ( 'a', 3 ) not in ts and ( 'a', 4 ) not in ts
+            stat_dct = ts.get_stats()
+            assert sorted( stat_dct, key = str ) == [None, 'a', 'b']
+            assert stat_dct['a']['hits'] == 1 and stat_dct['a']['misses'] == 2
+            assert stat_dct['a']['num'] == 2 and stat_dct['a']['bytes'] == 0
+
+            ts.flush()
+            stat_dct = ts.get_stats()
+            assert stat_dct['a']['bytes'] > 0 and stat_dct['b']['num'] == 1
+
+            # export and invalidate namespaces
+            assert ts.export( file_name + '_a', ['a', None] ) == 3
+            assert sorted( ToolStore( file_name + '_a' ).keys(), key = str ) == [( 'a', 1 ), ( 'a', 2 ), 'c']
+            assert ts.invalidate( 'a' ) == 2
+            assert ( 'a', 1 ) not in ts
+            assert sorted( ToolStore( file_name ).keys(), key = str ) == [( 'b', 1 ), 'c']
+
+        finally:
+            shutil.rmtree( tmp_dir )
+
+
+    def test__corrupt( self ):
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            file_name = os.path.join( tmp_dir, 'store' )
+            with open( file_name + '.db', 'w' ) as fid:
+                fid.write( 'not a database' * 100 )
+
+            ts = ToolStore( file_name )
+            assert ts.corrupt_name != None
+            assert os.path.exists( ts.corrupt_name )
+            assert len( ts ) == 0
+
+            ts['a'] = 1
+            assert ToolStore( file_name ).corrupt_name == None
+            assert ToolStore( file_name )['a'] == 1
+
+        finally:
+            shutil.rmtree( tmp_dir )
+
+
+    def test__migrate( self ):
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            file_name = os.path.join( tmp_dir, 'legacy' )
+            sage_save( { 'get_divs_x': [ Div.new( 'e1', 3 ) ], 'y': 1 }, file_name )
+
+            ts = ToolStore( file_name )
+            assert os.path.exists( file_name + '.db' )
+            assert not os.path.exists( file_name + '.db.tmp' )
+            assert sorted( ts.keys() ) == [ 'get_divs_x', 'y' ]
+            assert ts['get_divs_x'] == [ Div.new( 'e1', 3 ) ]
+
+            # legacy keys are translated and untranslated keys are dropped
+            file_name = os.path.join( tmp_dir, 'legacy2' )
+            sage_save( { 'a_1': 1, 'b': 2 }, file_name )
+            convert_key = lambda key, val: ( 'a', 1 ) if key == 'a_1' else None
+            ts = ToolStore( file_name, False, convert_key )
+            assert ts.keys() == [ ( 'a', 1 ) ]
+            assert ts[( 'a', 1 )] == 1
+
+        finally:
+            shutil.rmtree( tmp_dir )
+
+
+if __name__ == '__main__':
+
+    TestClassToolStore().test__store()
+
+    pass
@@ -0,0 +1,107 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 17, 2026
+@author: Niels Lubbes
+'''
+from ns_lattice.class_div import Div
+
+from ns_lattice.class_work_queue import TODO
+from ns_lattice.class_work_queue import CLAIMED
+from ns_lattice.class_work_queue import DONE
+from ns_lattice.class_work_queue import WorkQueue
+from ns_lattice.class_work_queue import SQLiteWorkQueue
+
+import os
+import shutil
+import tempfile
+import time
+
+
+class TestClassWorkQueue:
+
+
+    def test__queue( self ):
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            file_name = os.path.join( tmp_dir, 'queue' )
+
+            queue = SQLiteWorkQueue( file_name )
+            queue.put( ( 'u', 2 ), [ Div.new( '12', 4 ) ] )
+            queue.put( ( 'u', 1 ), 'b' )
+            assert queue.get_num() == 2 and queue.get_num( TODO ) == 2
+
+            # units are claimed in the order in which they were added
+            queue2 = SQLiteWorkQueue( file_name )
+            assert queue2.claim() == ( ( 'u', 2 ), [ Div.new( '12', 4 ) ] )
+            assert queue.claim() == ( ( 'u', 1 ), 'b' )
+            assert queue.claim() == None
+            assert queue.get_num( CLAIMED ) == 2
+
+            queue2.complete( ( 'u', 2 ), 5 )
+            assert queue.get_results() == [ ( ( 'u', 2 ), 5 ) ]
+
+            # abandoned units are claimed again
+            time.sleep( 0.1 )
+            assert queue.claim( 0.05 ) == ( ( 'u', 1 ), 'b' )
+            queue.complete( ( 'u', 1 ), 6 )
+            assert queue.get_num( DONE ) == 2
+            assert queue.get_results() == [ ( ( 'u', 2 ), 5 ), ( ( 'u', 1 ), 6 ) ]
+
+            queue.clear()
+            assert SQLiteWorkQueue( file_name ).get_num() == 0
+
+        finally:
+            shutil.rmtree( tmp_dir )
+
+
+
+    def test__queue__error( self ):
+
+        try:
+            WorkQueue()
+            assert False
+        except TypeError:
+            pass
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            file_name = os.path.join( tmp_dir, 'queue' )
+
+            # a unit that cannot be pickled does not lock the database
+            queue = SQLiteWorkQueue( file_name )
+            try:
+                queue.put( ( 'u', 1 ), lambda x: x )
+                assert False
+            except Exception:
+                pass
+            queue2 = SQLiteWorkQueue( file_name )
+            queue2.put( ( 'u', 2 ), 'b' )
+            assert queue.get_num() == 1
+            assert queue.claim() == ( ( 'u', 2 ), 'b' )
+            try:
+                queue.complete( ( 'u', 2 ), lambda x: x )
+                assert False
+            except Exception:
+                pass
+            queue2.complete( ( 'u', 2 ), 5 )
+            assert queue.get_results() == [ ( ( 'u', 2 ), 5 ) ]
+
+            # either all units of a list are added or none of them
+            try:
+                queue.put_lst( [( ( 'u', 3 ), 'c' ), ( ( 'u', 4 ), lambda x: x )] )
+                assert False
+            except Exception:
+                pass
+            assert queue.get_num() == 1
+            queue.put_lst( [( ( 'u', 3 ), 'c' ), ( ( 'u', 4 ), 'd' )] )
+            assert queue.get_num( TODO ) == 2
+
+        finally:
+            shutil.rmtree( tmp_dir )
+
+if __name__ == '__main__':
+
+    TestClassWorkQueue().test__queue()
+
+    pass
@@ -15,7 +15,7 @@ class TestConvertToTex:
 
     def test__cls_to_tex( self ):
 
-        if 'get_cls_9' not in NSTools.get_tool_dct():
+        if NSTools.get_key( 'get_cls', 9 ) not in NSTools.get_tool_dct():
             return
         out = cls_to_tex()
         print( out )
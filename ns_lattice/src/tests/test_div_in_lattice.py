@@ -8,6 +8,7 @@ Created on Feb 8, 2017
 from ns_lattice.class_ns_tools import NSTools
 from ns_lattice.class_div import Div
 from ns_lattice.div_in_lattice import get_divs
+from ns_lattice.div_in_lattice import iter_divs
 from ns_lattice.div_in_lattice import get_indecomp_divs
 from ns_lattice.div_in_lattice import get_ak
 
@@ -74,6 +75,43 @@ class TestDivInLattice:
         NSTools.set_enable_tool_dct( True )
 
 
+    def test__iter_divs( self ):
+        NSTools.set_enable_tool_dct( False )
+        for d, dc, cc in [( get_ak( 5 ), 0, -2 ), ( get_ak( 6 ), 1, -1 ), ( get_ak( 7 ), 2, 0 ),
+                          ( Div.new( '4e0-e1-e2-e3-e4-e5-e6-e7-e8' ), 2, -2 )]:
+            for perm in [False, True]:
+                it = iter_divs( d, dc, cc, perm )
+                assert not isinstance( it, list )
+                assert list( it ) == get_divs( d, dc, cc, perm )
+        NSTools.set_enable_tool_dct( True )
+
+
+    def test__get_divs__parallel( self ):
+        NSTools.set_enable_tool_dct( False )
+        for d, dc, cc in [( get_ak( 6 ), 0, -2 ), ( get_ak( 9 ), 1, -1 ), ( get_ak( 7 ), 3, 1 ),
+                          ( Div.new( '5e0-2e1-e2-e3-e4-e5-e6' ), 1, -1 )]:
+            for perm in [False, True]:
+                NSTools.set_num_procs( 1 )
+                chk_lst = get_divs( d, dc, cc, perm )
+                NSTools.set_num_procs( 3 )
+                out_lst = get_divs( d, dc, cc, perm )
+                NSTools.set_num_procs( 1 )
+                assert out_lst == chk_lst
+        NSTools.set_enable_tool_dct( True )
+
+
+    def test__get_divs__backtrack( self ):
+        NSTools.set_enable_tool_dct( False )
+        d_lst = [ get_ak( rank ) for rank in range( 3, 10 ) ]
+        d_lst += [ Div.new( '4e0-e1-e2-e3-e4-e5-e6-e7-e8' ), Div.new( '5e0-2e1-e2-e3-e4-e5-e6' ) ]
+        for d in d_lst:
+            for dc, cc in [( 0, -2 ), ( 1, -1 ), ( 2, 0 ), ( 2, -2 ), ( 3, 1 )]:
+                for perm in [False, True]:
+                    chk_lst = get_divs( d, dc, cc, perm )
+                    assert get_divs( d, dc, cc, perm, 'backtrack' ) == chk_lst
+        NSTools.set_enable_tool_dct( True )
+
+
     def test__get_divs__roman_surface( self ):
 
         NSTools.set_enable_tool_dct( False )
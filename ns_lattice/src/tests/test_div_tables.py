@@ -0,0 +1,77 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 17, 2026
+@author: Niels Lubbes
+'''
+
+from ns_lattice.class_ns_tools import NSTools
+
+from ns_lattice.class_div import Div
+
+from ns_lattice.div_in_lattice import get_divs
+from ns_lattice.div_in_lattice import get_ak
+
+from ns_lattice import div_tables
+from ns_lattice.div_tables import TABLE_VERSION
+from ns_lattice.div_tables import encode_divs
+from ns_lattice.div_tables import decode_divs
+from ns_lattice.div_tables import get_table_divs
+from ns_lattice.div_tables import get_roots
+from ns_lattice.div_tables import get_lines
+from ns_lattice.div_tables import get_conics
+
+
+class TestDivTables:
+
+    def test__encode_divs( self ):
+        d_lst = [ Div.new( '12', 4 ), Div.new( '-3e0+e1+e2+e3', 4 ), Div( [127, -128, 0, 1] ) ]
+        assert decode_divs( encode_divs( d_lst ), 4 ) == d_lst
+        assert decode_divs( encode_divs( [] ), 4 ) == []
+
+
+    def test__get_table_divs( self ):
+        NSTools.set_enable_tool_dct( False )
+        for rank in range( 3, 10 ):
+            for kind, ( dc, cc ) in [ ( 'roots', ( 0, -2 ) ), ( 'lines', ( 1, -1 ) ), ( 'conics', ( 2, 0 ) ) ]:
+                assert get_table_divs( rank, kind ) == get_divs( get_ak( rank ), dc, cc, True, 'backtrack' )
+        NSTools.set_enable_tool_dct( True )
+
+
+    def test__get_roots_lines_conics( self ):
+        assert [ len( get_roots( rank ) ) for rank in range( 3, 10 ) ] == [1, 4, 10, 20, 36, 63, 120]
+        assert [ len( get_lines( rank ) ) for rank in range( 3, 10 ) ] == [3, 6, 10, 16, 27, 56, 240]
+        assert [ len( get_conics( rank ) ) for rank in range( 3, 10 ) ] == [2, 3, 5, 10, 27, 126, 2160]
+
+        assert [ str( d ) for d in get_lines( 4 ) ] == ['e1', 'e2', 'e3', 'e0-e1-e2', 'e0-e1-e3', 'e0-e2-e3']
+
+        # returned lists are copies
+        r_lst = get_roots( 9 )
+        r_lst.pop()
+        assert len( get_roots( 9 ) ) == 120
+
+        try:
+            get_roots( 10 )
+            assert False
+        except ValueError:
+            pass
+
+
+    def test__get_table_divs__version( self ):
+        div_tables._div_dct.clear()
+        div_tables._table_version = TABLE_VERSION + 1
+        try:
+            get_roots( 4 )
+            assert False
+        except ValueError:
+            pass
+        finally:
+            div_tables._table_version = TABLE_VERSION
+        assert len( get_roots( 4 ) ) == 4
+
+
+if __name__ == '__main__':
+
+    NSTools.filter( None )
+    TestDivTables().test__get_roots_lines_conics()
+
+    pass
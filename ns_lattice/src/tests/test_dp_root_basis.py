@@ -14,10 +14,14 @@ from ns_lattice.class_div import Div
 from ns_lattice.dp_root_bases import is_root_basis
 from ns_lattice.dp_root_bases import get_graph
 from ns_lattice.dp_root_bases import get_ext_graph
+from ns_lattice.dp_root_bases import get_graph_certificate
 from ns_lattice.dp_root_bases import get_dynkin_type
+from ns_lattice.dp_root_bases import get_dynkin_type_slow
 from ns_lattice.dp_root_bases import convert_type
 from ns_lattice.dp_root_bases import get_root_bases_orbit
 
+from ns_lattice.class_dp_lattice import DPLattice
+
 
 class TestDPRootBasis():
 
@@ -67,6 +71,21 @@ class TestDPRootBasis():
         assert not G1.is_isomorphic( G2, edge_labels=True )
         NSTools.set_enable_tool_dct( True )
 
+    def test__get_graph_certificate( self ):
+        NSTools.set_enable_tool_dct( False )
+
+        M = sage_identity_matrix( sage_QQ, 4 )
+        e_lst = [ 'e1', 'e0-e1-e2', 'e2', 'e0-e2-e3', 'e3', 'e0-e1-e3' ]
+
+        G1 = get_ext_graph( [Div.new( s, 4 ) for s in e_lst + ['23'] ], M )
+        G2 = get_ext_graph( [Div.new( s, 4 ) for s in e_lst + ['1123'] ], M )
+        G3 = get_ext_graph( [Div.new( s, 4 ) for s in reversed( e_lst + ['12'] ) ], M )
+
+        assert get_graph_certificate( G1 ) != get_graph_certificate( G2 )
+        assert get_graph_certificate( G1 ) == get_graph_certificate( G3 )
+        assert G1.is_isomorphic( G3, edge_labels=True )
+        NSTools.set_enable_tool_dct( True )
+
     def test__get_dynkin_type( self ):
         NSTools.set_enable_tool_dct( False )
         bas_lst = [12, 23, 34 ]
@@ -75,6 +94,23 @@ class TestDPRootBasis():
         assert get_dynkin_type( d_lst ) == 'A3'
         NSTools.set_enable_tool_dct( True )
 
+    def test__get_dynkin_type__slow( self ):
+        NSTools.set_enable_tool_dct( False )
+
+        bas_lst = [1145, 1123, 23, 45, 56, 78 ]
+        d_lst = [Div.new( str( bas ), 9 ) for bas in bas_lst]
+        assert get_dynkin_type( d_lst ) == '3A1+A3'
+
+        bas_lst = [12, 23, 34, 45, 1123, 67 ]
+        d_lst = [Div.new( str( bas ), 9 ) for bas in bas_lst]
+        assert get_dynkin_type( d_lst ) == 'A1+D5'
+
+        for rank in [4, 5, 6, 7]:
+            for bas in DPLattice.get_bas_lst( rank ):
+                assert get_dynkin_type( bas.d_lst ) == get_dynkin_type_slow( bas.d_lst )
+
+        NSTools.set_enable_tool_dct( True )
+
     def test__convert_type( self ):
         NSTools.set_enable_tool_dct( False )
 